@@ -0,0 +1,76 @@
+"""Compare the Monte Carlo claim estimator with the exact engine.
+
+Run from the repository root with ``python -m benchmarks.claim_probability``.
+"""
+import random
+import time
+from typing import List, Tuple
+import numpy as np
+from game import Deck
+from game import probability
+from game.card import Card
+from game.monte_carlo import estimate_claim_probabilities
+
+
+def create_tables(tables_num: int = 20, players_num: int = 8, seed: int = 0) -> List[Tuple[List[Card], int]]:
+    """Create random tables, as seen by one player.
+
+    :param tables_num: Number of tables.
+    :param players_num: Number of players at a table.
+    :param seed: Seed of the random generator.
+    :return: List of the player's hand and the number of cards in play.
+    """
+
+    rng = random.Random(seed)
+    cards = list(Deck.cards)
+    tables = []
+    for _ in range(tables_num):
+        counts = [rng.randint(1, 5) for _ in range(players_num)]
+        rng.shuffle(cards)
+        tables.append((cards[:counts[0]], sum(counts)))
+    return tables
+
+
+def clear_caches() -> None:
+    """Clear the caches of the exact engine."""
+
+    for function in (probability.table_probabilities, probability.claim_probability, probability.known_counts,
+                     probability.value_ways, probability.two_values_ways, probability.flush_ways,
+                     probability.straight_ways, probability.exact_set_ways,
+                     probability.small_straight_set_counts, probability.big_straight_set_counts):
+        function.cache_clear()
+
+
+def main(sample_budgets: Tuple[int, ...] = (1000, 10000, 100000)) -> None:
+    """Print the time of both engines and the error of the estimates.
+
+    :param sample_budgets: Numbers of samples of the estimator.
+    """
+
+    tables = create_tables()
+    # Fill the small straight table shared by both engines.
+    estimate_claim_probabilities(*tables[0], samples=1)
+
+    clear_caches()
+    start = time.perf_counter()
+    exact = [np.array(probability.claim_probabilities(hand, cards_in_play)) for hand, cards_in_play in tables]
+    seconds = time.perf_counter() - start
+    print(f" exact: {seconds / len(tables) * 1e3:7.2f} ms/table")
+
+    for samples in sample_budgets:
+        start = time.perf_counter()
+        estimates = [estimate_claim_probabilities(hand, cards_in_play, samples, seed=i)
+                     for i, (hand, cards_in_play) in enumerate(tables)]
+        seconds = time.perf_counter() - start
+
+        # All claims of a table share its samples, so the share outside the
+        # intervals varies around 5% with the seeds.
+        errors = max(np.abs(estimate - table).max() for (estimate, _, _), table in zip(estimates, exact))
+        outside = np.mean([((table < lower) | (table > upper)).mean()
+                           for (_, lower, upper), table in zip(estimates, exact)])
+        print(f"{samples:>6}: {seconds / len(tables) * 1e3:7.2f} ms/table, "
+              f"max error {errors:.4f}, {outside:.1%} outside the 95% intervals")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Measure the cost of copying game states and the speed of the ISMCTS bot.
+
+Run from the repository root with ``python -m benchmarks.ismcts``.
+"""
+import copy
+import os
+import pickle
+import timeit
+from random import Random
+from typing import Tuple
+from game import BluffGame
+from game.bots import ISMCTSPolicy
+from game.state import GameState
+
+
+def create_game(players_num: int = 8, seed: int = 0) -> BluffGame:
+    """Create a game with the cards dealt.
+
+    :param players_num: Number of players at the table.
+    :param seed: Seed of the game.
+    :return: The game.
+    """
+
+    game = BluffGame(seed)
+    for player_id in range(players_num):
+        game.add_player(player_id)
+        game.handle_action(player_id, f"name Player{player_id}")
+    for player_id in range(players_num):
+        game.handle_action(player_id, "Start")
+    return game
+
+
+def main(players_nums: Tuple[int, ...] = (2, 4, 8), seconds: float = 1.0) -> None:
+    """Print the copy time of both game states, and the rollouts per second
+    of a decision, by the number of players and of worker processes.
+
+    :param players_nums: Numbers of players at the table.
+    :param seconds: Time budget of a decision.
+    """
+
+    game = create_game()
+    status = game.get_game_status(game.players[game.seats[game.turn]])
+    state, _ = GameState.from_status(status)
+
+    repeat = 200
+    deepcopy_time = timeit.timeit(lambda: copy.deepcopy(game), number=repeat) / repeat
+    copy_time = timeit.timeit(state.copy, number=repeat * 100) / (repeat * 100)
+    print(f"BluffGame deepcopy: {deepcopy_time * 1e6:8.1f} us, {len(pickle.dumps(game)):5} bytes pickled")
+    print(f"GameState copy:     {copy_time * 1e6:8.1f} us, {len(pickle.dumps(state)):5} bytes pickled")
+
+    workers_nums = sorted({1, os.cpu_count() or 1})
+    for players_num in players_nums:
+        game = create_game(players_num)
+        status = game.get_game_status(game.players[game.seats[game.turn]])
+        for workers in workers_nums:
+            policy = ISMCTSPolicy(seconds, workers)
+            # The first decision starts the worker processes.
+            policy.choose_action(status, Random(0))
+            policy.rollouts, policy.search_seconds = 0, 0.0
+            action = policy.choose_action(status, Random(1))
+            print(f"{players_num} players, {workers} workers: "
+                  f"{policy.rollouts_per_second():8.0f} rollouts/s, {action}")
+            if policy.executor is not None:
+                policy.executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+"""Load test a running server with headless bot clients.
+
+The bots join rooms in groups, ready up, play legal moves and checks, and the
+test reports request throughput, latency percentiles, errors and disconnects.
+Run from the repository root with e.g.
+``python -m benchmarks.load_test --clients 400 --players-per-room 4``.
+"""
+from typing import Dict, List, Any, Union
+import argparse
+import asyncio
+import json
+import random
+import time
+from game.codec import decode_status
+from game.framing import FrameBuffer, encode_frame
+from game.hands import CLAIMS, legal_claims
+
+
+#: Number of the lowest claims a bot opens the turn with.
+OPENING_CLAIMS = 5
+
+
+class Scenario:
+    """Parameters of a load test.
+
+    :param clients: Number of bot clients.
+    :param players_per_room: Number of bots seated together in a room.
+    :param poll_rate: Polls per second of every bot.
+    :param think_time: Seconds a bot waits before acting on its turn.
+    :param check_probability: Probability that a bot checks instead of raising.
+    :param duration: Seconds of play, after all bots joined.
+    :param seed: Seed of the bots' decisions.
+    :param timeout: Seconds a bot waits for a reply before giving up.
+    """
+
+    def __init__(self, clients: int = 100, players_per_room: int = 4,
+                 poll_rate: float = 20, think_time: float = 0.2,
+                 check_probability: float = 0.3, duration: float = 10,
+                 seed: int = 0, timeout: float = 5) -> None:
+        self.clients = clients
+        self.players_per_room = players_per_room
+        self.poll_rate = poll_rate
+        self.think_time = think_time
+        self.check_probability = check_probability
+        self.duration = duration
+        self.seed = seed
+        self.timeout = timeout
+
+
+class Stats:
+    """Measurements gathered by all bots of a load test."""
+
+    def __init__(self) -> None:
+        #: Latencies of polls, in seconds.
+        self.poll_latencies: List[float] = []
+
+        #: Latencies of other actions, in seconds.
+        self.action_latencies: List[float] = []
+
+        #: Number of replies saying the game state did not change.
+        self.unchanged: int = 0
+
+        #: Number of bytes received from the server.
+        self.received_bytes: int = 0
+
+        #: Number of failed connections and malformed replies.
+        self.errors: int = 0
+
+        #: Number of connections closed by the server.
+        self.disconnects: int = 0
+
+        #: Number of bots which stopped waiting for a reply.
+        self.timeouts: int = 0
+
+    @staticmethod
+    def percentile(values: List[float], fraction: float) -> float:
+        """Get a percentile of the values.
+
+        :param values: The values.
+        :param fraction: The percentile, e.g. 0.99.
+        :return: The percentile, 0 if there are no values.
+        """
+
+        if not values:
+            return 0.0
+        values = sorted(values)
+        return values[min(int(len(values) * fraction), len(values) - 1)]
+
+    def report(self, seconds: float) -> Dict[str, Any]:
+        """Summarize the measurements.
+
+        :param seconds: Duration of the measurements.
+        :return: Dictionary with the summary.
+        """
+
+        requests = len(self.poll_latencies) + len(self.action_latencies)
+        summary = {
+            "requests_per_second": requests / seconds,
+            "actions_per_second": len(self.action_latencies) / seconds,
+            "kilobytes_per_second": self.received_bytes / seconds / 1024,
+            "unchanged_replies": self.unchanged,
+            "errors": self.errors,
+            "disconnects": self.disconnects,
+            "timeouts": self.timeouts,
+        }
+        for name, latencies in (("poll", self.poll_latencies), ("action", self.action_latencies)):
+            for fraction in (0.5, 0.95, 0.99):
+                key = f"{name}_p{int(fraction * 100)}_ms"
+                summary[key] = self.percentile(latencies, fraction) * 1000
+        return summary
+
+
+class Bot:
+    """A headless client playing by simple rules.
+
+    :param name: The bot's name.
+    :param scenario: Parameters of the load test.
+    :param stats: Measurements to record into.
+    :param rng: Random number generator for the bot's decisions.
+    """
+
+    def __init__(self, name: str, scenario: Scenario, stats: Stats, rng: random.Random) -> None:
+        self.name = name
+        self.scenario = scenario
+        self.stats = stats
+        self.rng = rng
+
+        #: Stream to read the server's replies from.
+        self.reader: Union[None, asyncio.StreamReader] = None
+
+        #: Stream to send actions to.
+        self.writer: Union[None, asyncio.StreamWriter] = None
+
+        #: Buffer reassembling the server's replies.
+        self.frames = FrameBuffer()
+
+        #: The last received game status.
+        self.status: Union[None, Dict[str, Any]] = None
+
+        #: Boolean value representing if the bot already said it is ready.
+        self.readied: bool = False
+
+    async def connect(self, server_ip: str, server_port: int) -> None:
+        """Connect to the server and send the bot's name.
+
+        :param server_ip: IP of the server.
+        :param server_port: Port of the server.
+        """
+
+        self.reader, self.writer = await asyncio.open_connection(server_ip, server_port)
+        await self.request("name " + self.name)
+
+    async def request(self, action: str) -> None:
+        """Send an action and wait for the reply.
+
+        :param action: The action.
+        """
+
+        start = time.perf_counter()
+        self.writer.write(encode_frame(action.encode()))
+
+        frame = self.frames.next_frame()
+        while frame is None:
+            data = await asyncio.wait_for(self.reader.read(4096), self.scenario.timeout)
+            if not data:
+                raise ConnectionError("Connection closed by the server")
+            self.stats.received_bytes += len(data)
+            self.frames.feed(data)
+            frame = self.frames.next_frame()
+
+        latency = time.perf_counter() - start
+        status = decode_status(frame)
+
+        if action.startswith("Get"):
+            self.stats.poll_latencies.append(latency)
+        else:
+            self.stats.action_latencies.append(latency)
+
+        if status is None:
+            self.stats.unchanged += 1
+        else:
+            self.status = status
+
+    def choose_action(self) -> Union[None, str]:
+        """Choose the bot's action for the last received status.
+
+        :return: The action, None if the bot should only poll.
+        """
+
+        status = self.status
+
+        if status["win"] or not status["start"] or status["checked"]:
+            if self.readied or status["lost"]:
+                return None
+            self.readied = True
+            return "Start"
+
+        self.readied = False
+        if not status["is_turn"]:
+            return None
+
+        if not status["moves"]:
+            return "move " + " ".join(self.rng.choice(CLAIMS[:OPENING_CLAIMS]))
+
+        try:
+            higher = legal_claims(status["moves"][-1][1])
+        except ValueError:
+            higher = []
+
+        if not higher or self.rng.random() < self.scenario.check_probability:
+            return "check"
+        return "move " + " ".join(higher[min(self.rng.randrange(2), len(higher) - 1)])
+
+    async def play(self, deadline: float) -> None:
+        """Play until the deadline.
+
+        :param deadline: Time (of time.perf_counter) to stop at.
+        """
+
+        poll_interval = 1 / self.scenario.poll_rate
+
+        while time.perf_counter() < deadline:
+            action = self.choose_action()
+
+            if action is None:
+                await asyncio.sleep(poll_interval)
+                await self.request(f"Get {self.status['version']}")
+            else:
+                if action.startswith(("move", "check")):
+                    await asyncio.sleep(self.scenario.think_time)
+                await self.request(action)
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def run_bot(bot: Bot, joined: asyncio.Event, deadline_holder: List[float]) -> None:
+    """Play with the bot once all bots joined, recording failures.
+
+    :param bot: The connected bot.
+    :param joined: Event set when all bots joined their rooms.
+    :param deadline_holder: List with the time to stop at.
+    """
+
+    try:
+        await joined.wait()
+        await bot.play(deadline_holder[0])
+    except (ConnectionError, asyncio.IncompleteReadError):
+        bot.stats.disconnects += 1
+    except asyncio.TimeoutError:
+        bot.stats.timeouts += 1
+    except (ValueError, IndexError, KeyError):
+        bot.stats.errors += 1
+    finally:
+        bot.close()
+
+
+async def run_scenario(scenario: Scenario, server_ip: str = "localhost",
+                       server_port: int = 5556) -> Dict[str, Any]:
+    """Run the load test.
+
+    The bots join in groups of :attr:`Scenario.players_per_room`. A group
+    readies up, and so starts its game, before the next group joins, so every
+    group gets its own room.
+
+    :param scenario: Parameters of the load test.
+    :param server_ip: IP of the server.
+    :param server_port: Port of the server.
+    :return: Summary of the measurements.
+    """
+
+    stats = Stats()
+    rng = random.Random(scenario.seed)
+    joined = asyncio.Event()
+    deadline_holder = [0.0]
+    tasks = []
+
+    for first in range(0, scenario.clients, scenario.players_per_room):
+        group = [Bot(f"bot{index}", scenario, stats, random.Random(rng.random()))
+                 for index in range(first, min(first + scenario.players_per_room, scenario.clients))]
+        try:
+            for bot in group:
+                await bot.connect(server_ip, server_port)
+            for bot in group:
+                bot.readied = True
+                await bot.request("Start")
+        except (OSError, asyncio.TimeoutError):
+            stats.errors += 1
+            for bot in group:
+                bot.close()
+            continue
+
+        tasks += [asyncio.create_task(run_bot(bot, joined, deadline_holder)) for bot in group]
+
+    stats.poll_latencies.clear()
+    stats.action_latencies.clear()
+    start = time.perf_counter()
+    deadline_holder[0] = start + scenario.duration
+    joined.set()
+
+    await asyncio.gather(*tasks)
+    return stats.report(time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run the load test with parameters from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=5556)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--players-per-room", type=int, default=4)
+    parser.add_argument("--poll-rate", type=float, default=20)
+    parser.add_argument("--think-time", type=float, default=0.2)
+    parser.add_argument("--check-probability", type=float, default=0.3)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=5)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    scenario = Scenario(args.clients, args.players_per_room, args.poll_rate,
+                        args.think_time, args.check_probability, args.duration, args.seed,
+                        args.timeout)
+    summary = asyncio.run(run_scenario(scenario, args.host, args.port))
+
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        for key, value in summary.items():
+            print(f"{key:>22}: {value:.2f}" if isinstance(value, float) else f"{key:>22}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Compare the binary status codec with pickle.
+
+Run from the repository root with ``python -m benchmarks.status_codec``.
+"""
+import pickle
+import timeit
+from game import BluffGame
+from game.codec import encode_status, decode_status, encode_shared_status, encode_player_status
+
+
+def create_game(players_num: int = 8, moves_num: int = 40) -> BluffGame:
+    """Create a game in a checked turn with a long list of moves.
+
+    :param players_num: Number of players at the table.
+    :param moves_num: Number of moves done before the check.
+    :return: The game.
+    """
+
+    game = BluffGame()
+    for player_id in range(players_num):
+        game.add_player(player_id)
+        game.players[player_id].name = f"Player{player_id}"
+        game.players[player_id].cards = player_id % 5 + 1
+    game.start()
+
+    values = [str(i) for i in range(2, 11)] + ["Jack", "Queen", "King", "Ace"]
+    for i in range(moves_num):
+        move = ["HighCard", values[i % 13]] if i % 2 else ["FullHouse", values[i % 13], "Ace"]
+        game.moves.append((f"Player{i % players_num}", move))
+    game.handle_check(game.players[0])
+
+    return game
+
+
+def create_status(players_num: int = 8, moves_num: int = 40) -> dict:
+    """Create the status sent to the first player of :func:`create_game`.
+
+    :param players_num: Number of players at the table.
+    :param moves_num: Number of moves done before the check.
+    :return: The game status.
+    """
+
+    game = create_game(players_num, moves_num)
+    return game.get_game_status(game.players[0])
+
+
+def encode_room(game: BluffGame) -> list:
+    """Encode the status for every player, sharing the common part.
+
+    :param game: The game.
+    :return: List of encoded statuses.
+    """
+
+    shared_status = encode_shared_status(game.get_shared_status())
+    return [shared_status + encode_player_status(game.get_player_status(player))
+            for player in game.players.values()]
+
+
+def main(repeat: int = 20000) -> None:
+    """Print the size and the encoding time of both formats.
+
+    :param repeat: Number of encodings to time.
+    """
+
+    status = create_status()
+    assert decode_status(encode_status(status))["moves"] == status["moves"]
+
+    for name, encode in (("pickle", pickle.dumps), ("codec", encode_status)):
+        size = len(encode(status))
+        seconds = timeit.timeit(lambda: encode(status), number=repeat)
+        print(f"{name:>6}: {size:5} bytes/status, {seconds / repeat * 1e6:6.1f} us/encode")
+
+    game = create_game()
+    players = list(game.players.values())
+    room_repeat = repeat // len(players)
+
+    def encode_every_status():
+        return [encode_status(game.get_game_status(player)) for player in players]
+
+    print(f"Statuses for a room of {len(players)} players:")
+    for name, encode in (("full", encode_every_status), ("shared", lambda: encode_room(game))):
+        seconds = timeit.timeit(encode, number=room_repeat)
+        print(f"{name:>6}: {seconds / room_repeat * 1e6:6.1f} us/room")
+
+    # A whole status encodes slower than pickle, the server only encodes the player's part per player.
+    player_status = game.get_player_status(players[0])
+    seconds = timeit.timeit(lambda: encode_player_status(player_status), number=repeat)
+    print(f"player: {seconds / repeat * 1e6:6.1f} us/player part")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+from typing import Callable, Dict, Set, Tuple, Union
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+import multiprocessing
+from random import Random
+import time
+from game import BluffGame
+from game.bots import Policy, ProbabilityPolicy
+from rooms import RoomManager
+
+
+#: Seconds a bot waits before making an action.
+THINK_TIME = 1.0
+
+#: Seconds between checks for finished decisions when nobody is notified of them.
+DECISION_POLL_INTERVAL = 0.05
+
+
+def decide(policy: Policy, status: BluffGame.Status, seed: int) -> str:
+    """Choose the action of a bot on its turn, e.g. in a worker process.
+
+    :param policy: The bot's policy.
+    :param status: The game status of the bot.
+    :param seed: Seed of the bot's choices.
+    :return: The action.
+    """
+
+    return policy.choose_action(status, Random(seed))
+
+
+class BotSeats:
+    """A class seating bots in the rooms, as ordinary players without a client.
+
+    Once all players of a room with fewer than :attr:`fill_to` players are
+    ready, bots take the empty seats. Bots act after their think time: they
+    get ready on their own, and their turns are decided in the executor, off
+    the network loop, from a copy of their game status. A decision is played
+    only if the game did not change in the meantime, otherwise the bot
+    thinks again. Bots leave when the last client leaves their room.
+
+    The server calls :meth:`update` after every change of a room, and
+    :meth:`poll` when :meth:`next_timeout` expires or :attr:`on_wake` is called.
+
+    :param rooms: The server's rooms.
+    :param create_id: Function creating unique player IDs.
+    :param fill_to: Number of players the rooms are filled to.
+    :param think_time: Seconds a bot waits before making an action.
+    :param policy: Policy of the bots.
+    :param executor: Executor deciding the bots' turns, a pool of one process if None.
+    :param seed: Seed of the bots' choices, a random one if None.
+    """
+
+    def __init__(self, rooms: RoomManager, create_id: Callable[[], int], fill_to: int = BluffGame.min_players,
+                 think_time: float = THINK_TIME, policy: Union[None, Policy] = None,
+                 executor: Union[None, Executor] = None, seed: Union[None, int] = None) -> None:
+        #: The server's rooms.
+        self.rooms: RoomManager = rooms
+
+        #: Function creating unique player IDs.
+        self.create_id: Callable[[], int] = create_id
+
+        #: Number of players the rooms are filled to.
+        self.fill_to: int = fill_to
+
+        #: Seconds a bot waits before making an action.
+        self.think_time: float = think_time
+
+        #: Policy of the bots.
+        self.policy: Policy = policy if policy is not None else ProbabilityPolicy()
+
+        #: Executor deciding the bots' turns. The pool process is spawned
+        #: rather than forked, so it does not inherit the server's sockets.
+        self.executor: Executor = executor if executor is not None else \
+            ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+
+        #: Random number generator giving the seeds of the decisions.
+        self.seeds: Random = Random(seed)
+
+        #: Dictionary with room ID as key and the IDs of its bots as value.
+        self.room_bots: Dict[int, Set[int]] = {}
+
+        #: Dictionary with room and bot IDs as key, and the time the bot acts at as value.
+        self.due: Dict[Tuple[int, int], float] = {}
+
+        #: Dictionary with room and bot IDs as key, and the game state version
+        #: with the decision being made for it as value.
+        self.decisions: Dict[Tuple[int, int], Tuple[int, Future]] = {}
+
+        #: Function called from any thread when a decision is made or an
+        #: action is scheduled, e.g. to wake up the server loop.
+        self.on_wake: Union[None, Callable[[], None]] = None
+
+    def update(self, room_id: int) -> None:
+        """Fill the room with bots if needed, and schedule the actions of its bots.
+
+        :param room_id: ID of the room which changed.
+        """
+
+        if room_id not in self.rooms.rooms:
+            return
+
+        game = self.rooms.rooms[room_id]
+        if (not game.has_started and game.all_players_num() < self.fill_to
+                and game.ready_players() == game.active_players_num()):
+            self.add_bots(room_id, self.fill_to - game.all_players_num())
+
+        now = time.monotonic()
+        for bot_id in self.room_bots.get(room_id, ()):
+            key = (room_id, bot_id)
+            if self.wanted_action(game, bot_id) is not None and key not in self.due and key not in self.decisions:
+                self.due[key] = now + self.think_time
+                self.wake()
+
+    def add_bots(self, room_id: int, bots_num: int) -> None:
+        """Seat bots in the room.
+
+        :param room_id: ID of the room.
+        :param bots_num: Number of bots.
+        """
+
+        game = self.rooms.rooms[room_id]
+        for _ in range(bots_num):
+            bot_id = self.create_id()
+            game.add_player(bot_id)
+            game.handle_action(bot_id, f"name Bot{bot_id}")
+            self.room_bots.setdefault(room_id, set()).add(bot_id)
+            print(f"~ Bot {bot_id} has joined game {room_id}")
+
+    def release_room(self, room_id: int) -> None:
+        """Remove the bots from the room if no client is left, closing the room.
+
+        :param room_id: ID of the room.
+        """
+
+        if self.rooms.members(room_id) or room_id not in self.room_bots:
+            return
+
+        for bot_id in self.room_bots.pop(room_id):
+            self.due.pop((room_id, bot_id), None)
+            self.decisions.pop((room_id, bot_id), None)
+            self.rooms.rooms[room_id].remove_player(bot_id)
+        self.rooms.close_empty_game(room_id)
+
+    @staticmethod
+    def wanted_action(game: BluffGame, bot_id: int) -> Union[None, str]:
+        """Get the kind of action the bot has to make.
+
+        :param game: The bot's game.
+        :param bot_id: The bot's ID.
+        :return: "Start" to get ready, "turn" to play its turn, None if the bot has nothing to do.
+        """
+
+        bot = game.players[bot_id]
+        if game.win or bot.lost:
+            return None
+        if not game.has_started or game.checked:
+            return None if bot.ready else "Start"
+        return "turn" if game.seats[game.turn] == bot_id else None
+
+    def poll(self) -> Set[int]:
+        """Play the finished decisions, and make the actions which are due.
+
+        :return: IDs of the rooms changed by the bots.
+        """
+
+        changed, decided = set(), set()
+        for key, (version, future) in list(self.decisions.items()):
+            if future.done():
+                del self.decisions[key]
+                decided.add(key[0])
+                if self.play_decision(key, version, future):
+                    changed.add(key[0])
+
+        now = time.monotonic()
+        for key, due in list(self.due.items()):
+            if due > now:
+                continue
+
+            del self.due[key]
+            room_id, bot_id = key
+            game = self.rooms.rooms[room_id]
+            action = self.wanted_action(game, bot_id)
+            if action == "Start":
+                game.handle_action(bot_id, action)
+                changed.add(room_id)
+            elif action == "turn":
+                status = game.get_game_status(game.players[bot_id])
+                status = {**status, "hand": list(status["hand"]), "moves": list(status["moves"])}
+                seed = self.seeds.getrandbits(32)
+                try:
+                    future = self.executor.submit(decide, self.policy, status, seed)
+                except RuntimeError as error:
+                    # E.g. a broken pool, the bot decides on the loop instead of stopping the game.
+                    print(f"~ Bot {bot_id} decides without the executor: {error!r}")
+                    future = Future()
+                    future.set_result(decide(self.policy, status, seed))
+                future.add_done_callback(lambda _: self.wake())
+                self.decisions[key] = (game.version, future)
+
+        # Bots whose decision came too late think again.
+        for room_id in changed | decided:
+            self.update(room_id)
+        return changed
+
+    def play_decision(self, key: Tuple[int, int], version: int, future: Future) -> bool:
+        """Play a finished decision if the game did not change since it was asked for.
+
+        :param key: IDs of the room and the bot.
+        :param version: The game state version the decision was made for.
+        :param future: The decision.
+        :return: True if the decision was played.
+        """
+
+        room_id, bot_id = key
+        game = self.rooms.rooms[room_id]
+        try:
+            action = future.result()
+        except Exception as error:
+            print(f"~ Bot {bot_id} failed to decide: {error!r}")
+            action = "check" if game.moves else None
+
+        if game.version != version or action is None:
+            return False
+
+        game.handle_action(bot_id, action)
+        return game.version != version
+
+    def next_timeout(self) -> Union[None, float]:
+        """Get the time until the next bot action.
+
+        :return: Seconds until the next action is due, the decision poll
+            interval if decisions are being made and nobody is notified of
+            them, None if there is nothing to wait for.
+        """
+
+        timeouts = [max(due - time.monotonic(), 0.0) for due in self.due.values()]
+        if self.decisions and self.on_wake is None:
+            timeouts.append(DECISION_POLL_INTERVAL)
+        return min(timeouts, default=None)
+
+    def wake(self) -> None:
+        """Notify the server loop that the bots have something to do."""
+        if self.on_wake is not None:
+            self.on_wake()
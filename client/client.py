@@ -1,6 +1,9 @@
 import pygame
 from client.network import Network
 import client.gui_functions as gui
+from client.dirty_regions import DirtyRegions
+from client.text_cache import TextCache
+from game.hands import legal_arguments, legal_hands
 
 
 class Client:
@@ -30,6 +33,15 @@ class Client:
         #: The font used for text rendering.
         self.font = None
 
+        #: The smaller font used for the moves.
+        self.small_font = None
+
+        #: Cache of the rendered texts.
+        self.text_cache = TextCache()
+
+        #: Regions of the window drawn in the last frame, to redraw only the changed ones.
+        self.dirty_regions = DirtyRegions(self.window.get_rect())
+
         #: The color used for text displaying.
         self.text_color = (255, 255, 255)
 
@@ -39,6 +51,31 @@ class Client:
         #: The button used to determine if player is ready.
         self.start_button = None
 
+        #: Number of moves of the turn when the options were offered, None if it is not the player's turn.
+        self.options_moves = None
+
+    def render(self, text, font=None, color=None):
+        """Render a text, or get it from the cache if it was rendered before.
+
+        :param text: The text.
+        :param font: The font, the default font if None.
+        :param color: Color of the text, the default text color if None.
+        :return: The rendered text.
+        """
+
+        return self.text_cache.render(font or self.font, text,
+                                      color or self.text_color)
+
+    def text_rect(self, text, location):
+        """Get the rectangle a text covers when it is drawn at the location.
+
+        :param text: The text, rendered in the default font.
+        :param location: Top left corner of the text.
+        :return: Rectangle of the rendered text.
+        """
+
+        return self.render(text).get_rect(topleft=location)
+
     def draw_players(self):
         """Display text: player's name, number of cards, moves for every player in current game.
         """
@@ -51,8 +88,8 @@ class Client:
             text1 = player
             text2 = f"Cards: {players_locations[player][0]}" if \
             players_locations[player][0] != 0 else "Eliminated"
-            text1 = self.font.render(text1, True, self.text_color)
-            text2 = self.font.render(text2, True, self.text_color)
+            text1 = self.render(text1)
+            text2 = self.render(text2)
 
             self.window.blit(text1, players_locations[player][1])
             self.window.blit(text2, (players_locations[player][1][0],
@@ -60,11 +97,9 @@ class Client:
 
             player_moves = [move for p, move in self.game_status["moves"] if
                             "You: " + p == player or p == player]
-            move_font_size = pygame.font.SysFont('arial', 15)
 
             for i, move in enumerate(player_moves):
-                move = move_font_size.render(" ".join(move), True,
-                                             self.text_color)
+                move = self.render(" ".join(move), self.small_font)
                 self.window.blit(move, (players_locations[player][1][0],
                                         players_locations[player][1][
                                             1] + 60 + 20 * i))
@@ -82,15 +117,15 @@ class Client:
         upper_text = f"{check_result[0]} checked {check_result[1]}'s move: {' '.join(self.game_status['moves'][-1][1])}!"
         down_text = f"{check_result[2]} gets the card!"
 
-        upper_text = self.font.render(upper_text, True, text_color)
-        down_text = self.font.render(down_text, True, text_color)
+        upper_text = self.render(upper_text, color=text_color)
+        down_text = self.render(down_text, color=text_color)
 
         self.window.blit(upper_text, (50, 60))
         self.window.blit(down_text, (335, 475))
 
         if check_result[3]:
             loser_text = f"That was the last card, {check_result[2]} is eliminated!"
-            loser_text = self.font.render(loser_text, True, text_color)
+            loser_text = self.render(loser_text, color=text_color)
             self.window.blit(loser_text, (150, 540))
 
         for image, location in cards_location.items():
@@ -123,7 +158,7 @@ class Client:
 
         text = "Your turn" if self.game_status[
             "is_turn"] else f"{self.game_status['turn']}'s turn"
-        turn = self.font.render(text, True, self.text_color)
+        turn = self.render(text)
         self.window.blit(turn, text_location)
 
     def draw_all(self):
@@ -132,7 +167,6 @@ class Client:
 
         if self.game_status == "Game did not start yet":
             self.window.blit(gui.background_image, (0, 0))
-            pygame.display.update()
             return
 
         if isinstance(self.game_status, str) and self.game_status.startswith(
@@ -144,8 +178,6 @@ class Client:
         self.draw_check_buttons()
         self.draw_turn()
 
-        pygame.display.update()
-
     def draw_ready_players(self) -> None:
         """Draw how many players are ready.
         """
@@ -153,7 +185,7 @@ class Client:
         text_location = (gui.width // 2 - 50, gui.height - 40)
 
         text = self.game_status["ready"]
-        turn = self.font.render(text, True, self.text_color)
+        turn = self.render(text)
         self.window.blit(turn, text_location)
 
     def draw_who_win(self) -> None:
@@ -163,9 +195,129 @@ class Client:
         text_location = (gui.width // 2 - 100, gui.height - 90)
 
         text = f"The game has ended, the player {self.game_status['win']} has won!"
-        win = self.font.render(text, True, self.text_color)
+        win = self.render(text)
         self.window.blit(win, text_location)
 
+    @staticmethod
+    def option_region(name, button):
+        """Get the region of an option button, with its menu when it is open.
+
+        The labels are centered in their boxes, so the ones wider or taller
+        than a box are part of the region as well.
+
+        :param name: Name of the region.
+        :param button: The option button.
+        :return: Name, key and rectangle of the region.
+        """
+
+        rect = button.rect.copy()
+        if button.draw_menu:
+            rect.height *= len(button.option_list) + 1
+            labels = list(enumerate(button.option_list, 1))
+        else:
+            labels = [(0, button.option_list[button.selected])]
+        for i, text in labels:
+            center = button.rect.move(0, i * button.rect.height).center
+            rect.union_ip(button.render(text).get_rect(center=center))
+        key = (tuple(button.option_list), button.selected, button.draw_menu,
+               button.menu_active, button.active_option)
+        return name, key, rect
+
+    def regions(self):
+        """Get the regions of the window for the current game state.
+
+        Each region has a key of everything drawn in it, so it is redrawn
+        only when the key changes, see :class:`DirtyRegions`.
+
+        :return: List of the name, key and rectangle of every region.
+        """
+
+        game_status = self.game_status
+        window = self.window.get_rect()
+        bottom_text = self.text_rect(game_status["ready"],
+                                     (gui.width // 2 - 50, gui.height - 40))
+
+        if not game_status["start"]:
+            return [("window", "not started", window),
+                    ("ready", game_status["ready"], bottom_text),
+                    self.option_region("start button", self.start_button)]
+
+        if game_status["checked"]:
+            check = (tuple(game_status["check_result"]),
+                     tuple(map(str, game_status["checked"])),
+                     tuple(game_status["moves"][-1][1]), game_status["win"])
+            regions = [("window", "checked", window),
+                       ("check", check, window),
+                       ("ready", game_status["ready"], bottom_text)]
+            if not game_status["lost"]:
+                regions.append(self.option_region("start button", self.start_button))
+            return regions
+
+        # The names and the "Cards:" lines below them, see draw_players.
+        players = pygame.Rect(0, 0, gui.width, 0)
+        for player, (cards, (x, y)) in gui.players_cards(game_status["players"]).items():
+            players.union_ip(self.text_rect(player, (x, y)))
+            players.union_ip(self.text_rect(f"Cards: {cards}" if cards != 0 else "Eliminated",
+                                            (x, y + 30)))
+        moves_y = gui.free_space + 60
+        turn = "Your turn" if game_status["is_turn"] else f"{game_status['turn']}'s turn"
+        regions = [
+            ("window", "turn", window),
+            ("players", tuple(game_status["players"]),
+             players),
+            ("moves", tuple((player, tuple(move)) for player, move in game_status["moves"]),
+             pygame.Rect(0, moves_y, gui.width, gui.height - moves_y)),
+            ("hand", tuple(map(str, game_status["hand"])),
+             pygame.Rect(0, gui.player_cards_y, gui.width, gui.card_size[1])),
+            ("turn", (game_status["is_turn"], game_status["turn"]),
+             self.text_rect(turn, (gui.width // 2, gui.height - 40)))]
+        if game_status["is_turn"]:
+            regions.append(self.option_region("options button", self.options_button))
+        return regions
+
+    def draw_scene(self):
+        """Draw the whole window for the current game state.
+        """
+
+        game_status = self.game_status
+        self.window.blit(gui.background_image, (0, 0))
+
+        if not game_status["start"]:
+            self.start_button.draw(self.window)
+            self.draw_ready_players()
+
+        elif game_status["checked"]:
+            self.draw_checked_move()
+            self.draw_ready_players()
+
+            if game_status["win"]:
+                self.draw_who_win()
+
+            if not game_status["lost"]:
+                self.start_button.draw(self.window)
+
+        else:
+            if game_status["is_turn"]:
+                self.options_button.draw(self.window)
+            self.draw_all()
+
+    def draw_frame(self) -> None:
+        """Redraw the changed regions of the window and update only them on the screen.
+
+        The scene is drawn clipped to every dirty rectangle, so the rest of
+        the window is kept. Nothing is drawn when no region changed.
+        """
+
+        dirty = self.dirty_regions.update(self.regions())
+        if not dirty:
+            return
+
+        for rect in dirty:
+            self.window.set_clip(rect)
+            self.draw_scene()
+        self.window.set_clip(None)
+        pygame.display.update(dirty)
+
     def get_click(self, mouse_pos):
         """Check if the check button was clicked.
 
@@ -205,14 +357,16 @@ class Client:
         pygame.display.set_caption(gui.title)
         pygame.font.init()
         self.font = pygame.font.SysFont('arial', 30)
+        self.small_font = pygame.font.SysFont('arial', 15)
         self.options_button = gui.OptionBox(gui.width - 220, 40,
                                             200, 40, (150, 150, 150),
                                             (100, 200, 255), self.font,
-                                            self.hands_list)
+                                            self.hands_list, text_cache=self.text_cache)
         self.start_button = gui.OptionBox(gui.width - 220, 40,
                                           200, 40, (150, 150, 150),
                                           (100, 200, 255), self.font,
-                                          ["Ready?", "Start", "Wait"])
+                                          ["Ready?", "Start", "Wait"],
+                                          text_cache=self.text_cache)
 
         client = Network(ip, port)
         client.connect()
@@ -227,6 +381,32 @@ class Client:
 
         self.options_button.update_display(option_list)
 
+    def last_move(self):
+        """Get the last move of the turn.
+
+        :return: The hand and its values or color, None if there was no move.
+        """
+
+        moves = self.game_status["moves"]
+        return moves[-1][1] if moves else None
+
+    def hand_options(self) -> list:
+        """Get the options of the hands higher than the last move.
+
+        :return: List of options for the option button.
+        """
+
+        return self.hands_list[:1] + legal_hands(self.last_move())
+
+    def argument_options(self, chosen) -> list:
+        """Get the options of the next value or color of a claim higher than the last move.
+
+        :param chosen: The hand and the values chosen so far.
+        :return: List of options for the option button.
+        """
+
+        return chosen[:1] + legal_arguments(self.last_move(), chosen) + ["Reset"]
+
     def main_loop(self, client) -> None:
         """Handle game events, and display gui.
 
@@ -238,16 +418,21 @@ class Client:
         move = "move "
         clock = pygame.time.Clock()
         client.send("name " + self.name)
+        self.game_status = client.receive_data()
+        client.send("Subscribe")
 
         while True:
             clock.tick(gui.fps)
 
-            client.send(action[0])
+            if action[0] != "Get":
+                client.send(action[0])
             if action[0].startswith("move"):
                 move = "move "
             action[0] = "Get"
 
-            self.game_status = client.receive_data()
+            pushed_status = client.receive_latest()
+            if pushed_status is not None:
+                self.game_status = pushed_status
             game_status = self.game_status
             event_list = pygame.event.get()
 
@@ -261,86 +446,66 @@ class Client:
                     clicked = self.get_click(mouse_pos)
                     action[0] = clicked if clicked else "Get"
 
-            self.window.blit(gui.background_image, (0, 0))
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.dirty_regions.invalidate()
 
             if not game_status["start"]:
-                self.start_button.selected = 0
-                self.start_button.draw(self.window)
-                self.draw_ready_players()
-
-                pygame.display.update()
-
                 clicked_option = self.start_button.update(event_list)
+                self.start_button.selected = 0
                 if clicked_option == "Start":
                     action[0] = "Start"
                 elif clicked_option == "Wait":
                     action[0] = "Wait"
 
             elif game_status["checked"]:
-                self.window.blit(gui.background_image, (0, 0))
-                self.draw_checked_move()
-
-                self.draw_ready_players()
-
-                if game_status["win"]:
-                    self.draw_who_win()
+                self.options_moves = None
 
                 if not game_status["lost"]:
-                    self.start_button.selected = 0
-                    self.start_button.draw(self.window)
-
                     clicked_option = self.start_button.update(event_list)
+                    self.start_button.selected = 0
                     if clicked_option == "Start":
                         action[0] = "Start"
                     elif clicked_option == "Wait":
                         action[0] = "Wait"
 
-                pygame.display.update()
-
             else:
 
                 if not (game_status["is_turn"]):
-                    self.options_button.option_list = self.hands_list
+                    self.options_moves = None
 
                 if game_status["is_turn"]:
 
-                    self.options_button.draw(self.window)
-                    self.options_button.selected = 0
+                    if self.options_moves != len(game_status["moves"]):
+                        # Only the claims higher than the last move are offered.
+                        self.options_moves = len(game_status["moves"])
+                        self.button_update(self.hand_options())
+                        move = "move "
+
                     clicked_option = self.options_button.update(event_list)
+                    self.options_button.selected = 0
 
                     if isinstance(clicked_option,
                                   str) and clicked_option != "Choose hand":
 
                         if clicked_option == "Reset":
-                            self.options_button.update_display(self.hands_list)
+                            self.button_update(self.hand_options())
                             move = "move "
 
                         elif clicked_option in ["HighCard", "Pair",
-                                                "ThreeOfKind", "FourOfKind"]:
-                            self.button_update(
-                                [clicked_option] + self.cards_list + ["Reset"])
+                                                "ThreeOfKind", "FourOfKind",
+                                                "TwoPairs", "FullHouse",
+                                                "Flush", "SmallPoker",
+                                                "BigPoker"]:
                             if clicked_option not in move:
                                 move += clicked_option + " "
-
-                        elif clicked_option in ["TwoPairs", "FullHouse"]:
                             self.button_update(
-                                [clicked_option] + self.cards_list + ["Reset"])
-                            if clicked_option not in move:
-                                move += clicked_option + " "
+                                self.argument_options(move.split()[1:]))
 
                         elif clicked_option in ["SmallStraight",
                                                 "BigStraight"]:
                             move += clicked_option
                             action[0] = move
 
-                        elif clicked_option in ["Flush", "SmallPoker",
-                                                "BigPoker"]:
-                            self.button_update(
-                                [clicked_option] + self.colors_list + [
-                                    "Reset"])
-                            if clicked_option not in move:
-                                move += clicked_option + " "
-
                         elif clicked_option in self.cards_list + self.colors_list:
                             move += clicked_option + " "
 
@@ -352,5 +517,9 @@ class Client:
                             elif len(move.split()) == 4:
                                 action[0] = move
 
-                self.draw_all()
+                            else:
+                                self.button_update(
+                                    self.argument_options(move.split()[1:]))
+
+            self.draw_frame()
 
@@ -0,0 +1,73 @@
+from typing import Dict, Hashable, List, Tuple
+import pygame
+
+
+Region = Tuple[str, Hashable, pygame.Rect]
+
+
+class DirtyRegions:
+    """Tracks which regions of the window changed since the last frame.
+
+    Every frame the client describes its regions by a name, a key of
+    everything drawn in the region, and the rectangle it covers. A region
+    whose key or rectangle changed is dirty: both its old and its new
+    rectangle must be redrawn. When no region is dirty, the frame is skipped.
+
+    :param screen_rect: Rectangle of the whole window.
+    """
+
+    def __init__(self, screen_rect: pygame.Rect) -> None:
+        #: Rectangle of the whole window.
+        self.screen_rect: pygame.Rect = screen_rect
+
+        #: Dictionary with the region name as key, and its key and rectangle
+        #: drawn in the last frame as value.
+        self.regions: Dict[str, Tuple[Hashable, pygame.Rect]] = {}
+
+        #: Rectangles to redraw in the next frame, the whole window at first.
+        self.dirty: List[pygame.Rect] = [screen_rect.copy()]
+
+        #: Number of frames with dirty regions.
+        self.frames_drawn: int = 0
+
+        #: Number of frames skipped, as nothing changed.
+        self.frames_skipped: int = 0
+
+    def invalidate(self) -> None:
+        """Redraw the whole window in the next frame, e.g. after it was exposed.
+        """
+
+        self.dirty = [self.screen_rect.copy()]
+
+    def update(self, regions: List[Region]) -> List[pygame.Rect]:
+        """Compare the regions with the last frame, and get the rectangles to redraw.
+
+        A region missing from the last frame, or from this one, is dirty as well.
+
+        :param regions: Name, key and rectangle of every region of the frame.
+        :return: Rectangles to redraw, clipped to the window, empty if nothing changed.
+        """
+
+        dirty, self.dirty = self.dirty, []
+        previous, self.regions = self.regions, {}
+
+        for name, key, rect in regions:
+            old = previous.pop(name, None)
+            if old is None or old[0] != key or old[1] != rect:
+                dirty.append(rect)
+                if old is not None:
+                    dirty.append(old[1])
+            self.regions[name] = key, rect
+
+        dirty.extend(rect for _, rect in previous.values())
+
+        dirty = [rect.clip(self.screen_rect) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        if any(rect == self.screen_rect for rect in dirty):
+            dirty = [self.screen_rect.copy()]
+
+        if dirty:
+            self.frames_drawn += 1
+        else:
+            self.frames_skipped += 1
+        return dirty
@@ -3,7 +3,7 @@ import pygame
 
 
 class OptionBox:
-    def __init__(self, x, y, w, h, color, highlight_color, font, option_list, selected=0):
+    def __init__(self, x, y, w, h, color, highlight_color, font, option_list, selected=0, text_cache=None):
         self.color = color
         self.highlight_color = highlight_color
         self.rect = pygame.Rect(x, y, w, h)
@@ -13,14 +13,20 @@ class OptionBox:
         self.draw_menu = False
         self.menu_active = False
         self.active_option = -1
+        self.text_cache = text_cache
+
+    def render(self, text):
+        if self.text_cache is not None:
+            return self.text_cache.render(self.font, text, (0, 0, 0))
+        return self.font.render(text, 1, (0, 0, 0))
 
     def draw(self, surf):
         pygame.draw.rect(surf, self.highlight_color if self.menu_active else self.color, self.rect)
         pygame.draw.rect(surf, (0, 0, 0), self.rect, 2)
         try:
-            msg = self.font.render(self.option_list[self.selected], 1, (0, 0, 0)) # buguje
+            msg = self.render(self.option_list[self.selected]) # buguje
         except:
-            msg = self.font.render("BUG TO REPAIR", 1, (0, 0, 0))
+            msg = self.render("BUG TO REPAIR")
 
         surf.blit(msg, msg.get_rect(center=self.rect.center))
 
@@ -29,7 +35,7 @@ class OptionBox:
                 rect = self.rect.copy()
                 rect.y += (i + 1) * self.rect.height
                 pygame.draw.rect(surf, self.highlight_color if i == self.active_option else self.color, rect)
-                msg = self.font.render(text, 1, (0, 0, 0))
+                msg = self.render(text)
                 surf.blit(msg, msg.get_rect(center=rect.center))
             outer_rect = (
             self.rect.x, self.rect.y + self.rect.height, self.rect.width, self.rect.height * len(self.option_list))
@@ -91,10 +97,7 @@ card_reverse = pygame.transform.scale(card_reverse, card_size)
 
 def create_cards_image_dict():
     card_images = {}
-    deck = Deck()
-    deck = deck.deck
-
-    for card in deck:
+    for card in Deck.cards:
         card = str(card)
         path = f"assets/{card}.png"
         card_images[card] = pygame.image.load(path)
@@ -1,6 +1,8 @@
+import select
 import socket
-import pickle
 from typing import Dict, Union
+from game.codec import decode_status
+from game.framing import FrameBuffer, encode_frame
 
 
 class Network:
@@ -20,30 +22,86 @@ class Network:
         #: The port of the server.
         self.port = port
 
-        #: The maximum message length for receiving data.
-        self.max_msg_length = 1024 * 4
+        #: The buffer reassembling messages received from the server.
+        self.frames = FrameBuffer()
+
+        #: The last game status received by :meth:`poll`.
+        self.last_status: Union[None, Dict] = None
+
+    def connect(self, room_id: Union[None, int] = None) -> None:
+        """Connect to the server.
+
+        :param room_id: ID of the room to come back to, e.g. after losing
+            the connection, None to join any room.
+        """
 
-    def connect(self) -> None:
-        """Connect to the server."""
         self.my_socket.connect((self.server_ip, self.port))
 
+        if room_id is not None:
+            self.send(f"room {room_id}")
+            self.last_status = self.receive_data()
+
     def send(self, data: str) -> None:
         """Send data to the server.
 
         :param data: The data to send.
         """
 
-        self.my_socket.send(data.encode())
+        self.my_socket.sendall(encode_frame(data.encode()))
 
-    def receive_data(self) -> Union[str, Dict]:
-        """_summary_
+    def receive_data(self) -> Union[None, Dict]:
+        """Receive the next message from the server.
 
-        :return: The received data.
+        :return: The received data, None if the game state did not change
+            since the version the client polled with.
         """
 
-        rec_data = pickle.loads(self.my_socket.recv(self.max_msg_length))
+        frame = self.frames.next_frame()
+        while frame is None:
+            if self.frames.recv_from(self.my_socket) == 0:
+                raise ConnectionError("Connection closed by the server")
+            frame = self.frames.next_frame()
+
+        rec_data = decode_status(frame)
         return rec_data
 
+    def receive_latest(self) -> Union[None, Dict]:
+        """Receive all messages pushed by the server, without blocking.
+
+        :return: The most recent message, None if nothing was received.
+        """
+
+        latest = None
+        while True:
+            frame = self.frames.next_frame()
+            if frame is not None:
+                latest = bytes(frame)
+                continue
+
+            readable, _, _ = select.select([self.my_socket], [], [], 0)
+            if not readable:
+                break
+            if self.frames.recv_from(self.my_socket) == 0:
+                raise ConnectionError("Connection closed by the server")
+
+        return None if latest is None else decode_status(latest)
+
+    def poll(self) -> Dict:
+        """Ask the server for the game status, unless it did not change.
+
+        :return: The current game status.
+        """
+
+        if self.last_status is None:
+            self.send("Get")
+        else:
+            self.send(f"Get {self.last_status['version']}")
+
+        status = self.receive_data()
+        if status is not None:
+            self.last_status = status
+        return self.last_status
+
     def close(self) -> None:
         """Close the network connection."""
         self.my_socket.close()
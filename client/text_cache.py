@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from typing import Tuple
+import pygame
+
+
+#: Default number of rendered texts kept by a cache.
+TEXT_CACHE_SIZE = 512
+
+Color = Tuple[int, int, int]
+
+
+class TextCache:
+    """Cache of rendered texts, so the same strings are not rendered every frame.
+
+    Texts are rendered with antialiasing and kept by their font, text and
+    color. When the cache is full, the least recently used text is dropped.
+
+    :param size: Number of rendered texts kept.
+    """
+
+    def __init__(self, size: int = TEXT_CACHE_SIZE) -> None:
+        #: Number of rendered texts kept.
+        self.size: int = size
+
+        #: Dictionary with font, text and color as key and the rendered text
+        #: as value, from the least recently used.
+        self.surfaces: OrderedDict = OrderedDict()
+
+        #: Number of texts found in the cache.
+        self.hits: int = 0
+
+        #: Number of texts rendered.
+        self.misses: int = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+        """Get the rendered text, rendering it if it is not in the cache.
+
+        The surface is shared, it must not be drawn on.
+
+        :param font: The font.
+        :param text: The text.
+        :param color: Color of the text.
+        :return: The rendered text.
+        """
+
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        self.misses += 1
+        if len(self.surfaces) > self.size:
+            self.surfaces.popitem(last=False)
+        return surface
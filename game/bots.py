@@ -0,0 +1,233 @@
+from typing import Dict, List, Any, Union
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor
+from random import Random
+import time
+from game.card_pool import CardPool
+from game.cfr import CHECK_ACTION, POLICY_TABLE_PATH, PolicyTable
+from game.codec import YOU_LABEL
+from game.hands import CLAIMS, claim_rank
+from game.ismcts import WIDTH, search
+from game.probability import claim_probabilities
+from game.state import CHECK, GameState
+
+
+def last_claim_rank(status: Dict[str, Any]) -> int:
+    """Get the rank of the last claim of the turn.
+
+    :param status: The game status.
+    :return: Rank of the claim in :data:`game.hands.CLAIMS`, -1 if there was no claim.
+    """
+
+    if not status["moves"]:
+        return -1
+    return claim_rank(status["moves"][-1][1])
+
+
+def cards_in_play(status: Dict[str, Any]) -> int:
+    """Count all players' cards of the turn.
+
+    :param status: The game status.
+    :return: The number of cards.
+    """
+
+    return sum(cards for _, cards in status["players"])
+
+
+def claim_action(rank: int) -> str:
+    """Get the action claiming a hand.
+
+    :param rank: Rank of the claim in :data:`game.hands.CLAIMS`.
+    :return: The action, e.g. "move Pair Jack".
+    """
+
+    return "move " + " ".join(CLAIMS[rank])
+
+
+class Policy(ABC):
+    """Base class of the bot policies, choosing a player's action on the
+    player's turn from the game status the player would receive.
+    """
+
+    @abstractmethod
+    def choose_action(self, status: Dict[str, Any], rng: Random) -> str:
+        """Choose the action of the player on turn.
+
+        :param status: The game status of the player.
+        :param rng: Random number generator of the player.
+        :return: "check", or a claim higher than the last one, see :func:`claim_action`.
+        """
+
+
+class RandomPolicy(Policy):
+    """Policy checking at random, or claiming one of the next few hands.
+
+    :param check_probability: Probability of checking when there is a claim to check.
+    :param max_raise: Number of the next hands the claim is chosen from.
+    """
+
+    def __init__(self, check_probability: float = 0.3, max_raise: int = 10) -> None:
+        #: Probability of checking when there is a claim to check.
+        self.check_probability = check_probability
+
+        #: Number of the next hands the claim is chosen from.
+        self.max_raise = max_raise
+
+    def choose_action(self, status: Dict[str, Any], rng: Random) -> str:
+        last = last_claim_rank(status)
+        if last == len(CLAIMS) - 1 or (last >= 0 and rng.random() < self.check_probability):
+            return "check"
+        return claim_action(min(last + 1 + rng.randrange(self.max_raise), len(CLAIMS) - 1))
+
+
+class HonestPolicy(Policy):
+    """Policy claiming the lowest hand higher than the last claim present in
+    the player's own cards, and checking when there is none.
+    """
+
+    def choose_action(self, status: Dict[str, Any], rng: Random) -> str:
+        last = last_claim_rank(status)
+        higher = CardPool(status["hand"]).claims_present() >> (last + 1)
+        if not higher:
+            return "check"
+        return claim_action(last + 1 + ((higher & -higher).bit_length() - 1))
+
+
+class ProbabilityPolicy(Policy):
+    """Policy checking claims unlikely to be present, and otherwise claiming
+    the most likely hand higher than the last claim, see
+    :func:`game.probability.claim_probabilities`.
+
+    :param check_threshold: The last claim is checked if it is present with a lower probability.
+    """
+
+    def __init__(self, check_threshold: float = 0.5) -> None:
+        #: The last claim is checked if it is present with a lower probability.
+        self.check_threshold = check_threshold
+
+    def choose_action(self, status: Dict[str, Any], rng: Random) -> str:
+        last = last_claim_rank(status)
+        probabilities = claim_probabilities(status["hand"], cards_in_play(status))
+        if last == len(CLAIMS) - 1 or (last >= 0 and probabilities[last] < self.check_threshold):
+            return "check"
+
+        higher: List[float] = probabilities[last + 1:]
+        return claim_action(last + 1 + higher.index(max(higher)))
+
+
+class ISMCTSPolicy(Policy):
+    """Policy searching the action with information set Monte Carlo tree
+    search, see :func:`game.ismcts.search`.
+
+    With more than one worker, every worker process searches its own tree
+    for the time budget, and the visits of the actions are added up.
+
+    :param seconds: Time budget of a decision.
+    :param workers: Number of worker processes, the search runs in the calling process if 1.
+    :param width: Breadth of the search, see :func:`game.ismcts.searched_actions`.
+    """
+
+    def __init__(self, seconds: float = 0.1, workers: int = 1, width: int = WIDTH) -> None:
+        #: Time budget of a decision.
+        self.seconds = seconds
+
+        #: Number of worker processes.
+        self.workers = workers
+
+        #: Breadth of the search.
+        self.width = width
+
+        #: Pool of the worker processes, created on the first decision.
+        self.executor: Union[None, Executor] = None
+
+        #: Number of rollouts of all decisions.
+        self.rollouts = 0
+
+        #: Seconds spent on all decisions.
+        self.search_seconds = 0.0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The pool stays with the process which created it.
+        return {**self.__dict__, "executor": None}
+
+    def choose_action(self, status: Dict[str, Any], rng: Random) -> str:
+        state, seat = GameState.from_status(status)
+        seeds = [rng.getrandbits(32) for _ in range(self.workers)]
+        start = time.perf_counter()
+
+        if self.workers > 1:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(self.workers)
+            futures = [self.executor.submit(search, state, seat, self.seconds, None, seed, self.width)
+                       for seed in seeds]
+            results = [future.result() for future in futures]
+        else:
+            results = [search(state, seat, self.seconds, None, seeds[0], self.width)]
+
+        visits: Dict[int, int] = {}
+        for actions, rollouts in results:
+            self.rollouts += rollouts
+            for action, (action_visits, _) in actions.items():
+                visits[action] = visits.get(action, 0) + action_visits
+        self.search_seconds += time.perf_counter() - start
+
+        action = max(visits, key=visits.get)
+        return "check" if action == CHECK else claim_action(action)
+
+    def rollouts_per_second(self) -> float:
+        """Get the search speed over all decisions.
+
+        :return: Number of rollouts per second.
+        """
+
+        return self.rollouts / self.search_seconds if self.search_seconds else 0.0
+
+
+class CFRPolicy(Policy):
+    """Policy looking the action up in the opening book of the turns
+    solved offline, see :mod:`game.cfr`, and deciding with another policy
+    outside of the table.
+
+    :param path: Path of the policy table, the other policy decides alone if there is no such file.
+    :param fallback: Policy deciding outside of the table, a :class:`ProbabilityPolicy` if None.
+    """
+
+    def __init__(self, path: str = POLICY_TABLE_PATH, fallback: Union[None, Policy] = None) -> None:
+        #: Path of the policy table.
+        self.path = path
+
+        #: Policy deciding outside of the table.
+        self.fallback = fallback if fallback is not None else ProbabilityPolicy()
+
+        #: The policy table, memory mapped on the first decision.
+        self.table: Union[None, PolicyTable] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Every process maps the table on its own.
+        return {**self.__dict__, "table": None}
+
+    def choose_action(self, status: Dict[str, Any], rng: Random) -> str:
+        if self.table is None:
+            try:
+                self.table = PolicyTable(self.path)
+            except FileNotFoundError:
+                return self.fallback.choose_action(status, rng)
+
+        # The table is by the seat which started the turn, it is the seat
+        # on turn before the claims of the turn.
+        seat = next(index for index, (name, _) in enumerate(status["players"]) if name.startswith(YOU_LABEL))
+        counts = [cards for _, cards in status["players"]]
+        first = (seat - len(status["moves"])) % len(counts)
+        entry = self.table.lookup(counts[first:] + counts[:first], (seat - first) % len(counts),
+                                  [card.value for card in status["hand"]], last_claim_rank(status))
+        if entry is None:
+            return self.fallback.choose_action(status, rng)
+
+        claims, probabilities = entry
+        action = rng.choices(range(len(probabilities)), weights=probabilities.tolist())[0]
+        return "check" if action == CHECK_ACTION else claim_action(claims[action - 1])
+
+
+#: Policies by their names, e.g. for command line options.
+POLICIES: Dict[str, type] = {"random": RandomPolicy, "honest": HonestPolicy, "probability": ProbabilityPolicy,
+                             "ismcts": ISMCTSPolicy, "cfr": CFRPolicy}
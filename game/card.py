@@ -1,26 +1,60 @@
-from typing import List, Union
+from typing import List, Tuple, Union
 
 
 class Card:
     """Represents a playing card.
 
+    Cards are immutable. The 54 cards of the deck are interned, use
+    :meth:`Card.of` to get them instead of creating new ones.
+
     :param value: The value of the card.
     :param color: The color of the card.
     """
 
+    __slots__ = ("value", "color")
+
     CardType = Union['Card', str, int]
     colors = {1: "clubs", 2: "diamonds", 3: "hearts", 4: "spades"}
     color_to_num = {"club": 1, "diamond": 2, "hearts": 3, "spades": 4}
     values = {**{i: i for i in range(2, 11)}, **{0: "joker", 11: "jack", 12: "queen", 13: "king", 14: "ace"}}
 
+    #: The interned cards, by the card code: 0 for the joker, (value - 2) * 4 + color for other cards.
+    interned: List['Card'] = []
+
     def __init__(self, value: int, color: int = 1) -> None:
         # The value of the card
         #: 0 (Joker), 2, 3, ... , 10, 11 (Jack), 12 (Queen), 13 (King), 14 (Ace)
-        self.value = value
+        object.__setattr__(self, "value", value)
 
         # The color of the card.
         # 1 (Clubs), 2 (Diamonds), 3 (Hearts), 4 (Spades)
-        self.color = color
+        object.__setattr__(self, "color", color)
+
+    @staticmethod
+    def of(value: int, color: int = 1) -> 'Card':
+        """Get the interned card.
+
+        :param value: The value of the card, 0 for the joker.
+        :param color: The color of the card, ignored for the joker.
+        :return: The card.
+        """
+
+        if value == 0:
+            return Card.interned[0]
+        return Card.interned[(value - 2) * 4 + color]
+
+    def __setattr__(self, name: str, value: int) -> None:
+        raise AttributeError("Cards are immutable")
+
+    def __reduce__(self) -> Tuple:
+        """Pickle interned cards as references to the interned cards.
+
+        :return: The function recreating the card with its arguments.
+        """
+
+        if self.value == 0 or 2 <= self.value <= 14 and 1 <= self.color <= 4:
+            return Card.of, (self.value, self.color)
+        return Card, (self.value, self.color)
 
     def __hash__(self) -> int:
         return hash(self.value)
@@ -91,26 +125,21 @@ class Card:
         """
 
         if self.value == 0:
-            return Card(0, 0)
-        elif type(other) == int:
-            return Card(self.value + other, self.color)
-        return Card(self.value + other.value, self.color)
+            return Card.of(0)
+
+        value = self.value + (other if type(other) == int else other.value)
+        if 2 <= value <= 14:
+            return Card.of(value, self.color)
+        return Card(value, self.color)
 
     def __iadd__(self, other: CardType) -> CardType:
-        """Adds a card or a value to this card.
+        """Adds a card or a value to this card, giving another card as cards are immutable.
 
         :param other: The other card or value to add.
-        :return: The updated card.
+        :return: The card with the sum of the values.
         """
 
-        if self.value == 0:
-            pass
-        else:
-            if type(other) == int:
-                self.value += other
-            else:
-                self.value += other.value
-            return self
+        return self + other
 
     @staticmethod
     def high_card(cards: List[CardType], card: CardType) -> bool:
@@ -165,6 +194,7 @@ class Card:
         :return: True if a small straight is present, False otherwise.
         """
 
+        cards = list(cards)
         joker_count = cards.count(0)
         order = joker_count
 
@@ -177,13 +207,13 @@ class Card:
             if cards[i].value >= 10:
                 break
             else:
-                if cards[i] + 1 == cards[i + 1]:
+                if cards[i].value + 1 == cards[i + 1].value:
                     order += 1
-                if cards[i + 1] + 1 == cards[i + 2]:
+                if cards[i + 1].value + 1 == cards[i + 2].value:
                     order += 1
-                if cards[i + 2] + 1 == cards[i + 3]:
+                if cards[i + 2].value + 1 == cards[i + 3].value:
                     order += 1
-                if cards[i + 3] + 1 == cards[i + 4]:
+                if cards[i + 3].value + 1 == cards[i + 4].value:
                     order += 1
 
                 if order >= 4:
@@ -201,6 +231,7 @@ class Card:
         :return: True if a big straight is present, False otherwise.
         """
 
+        cards = list(cards)
         joker_count = cards.count(0)
         for i in range(joker_count):
             cards.remove(0)
@@ -264,20 +295,19 @@ class Card:
             cards.remove(0)
 
         cards = sorted(list(set(cards)))
-        print(cards)
         order = joker_count
 
         for i in range(len(cards) - 4):
             if cards[i].value >= 10:
                 break
             else:
-                if cards[i] + 1 == cards[i + 1]:
+                if cards[i].value + 1 == cards[i + 1].value:
                     order += 1
-                if cards[i + 1] + 1 == cards[i + 2]:
+                if cards[i + 1].value + 1 == cards[i + 2].value:
                     order += 1
-                if cards[i + 2] + 1 == cards[i + 3]:
+                if cards[i + 2].value + 1 == cards[i + 3].value:
                     order += 1
-                if cards[i + 3] + 1 == cards[i + 4]:
+                if cards[i + 3].value + 1 == cards[i + 4].value:
                     order += 1
 
                 if order >= 4:
@@ -313,3 +343,6 @@ class Card:
             return True
 
         return False
+
+
+Card.interned = [Card(0, 0)] + [Card(value, color) for value in range(2, 15) for color in range(1, 5)]
@@ -0,0 +1,230 @@
+from typing import Dict, List, Union
+from functools import lru_cache
+from game.card import Card
+from game.hands import Hand, CLAIM_RANKS
+
+
+#: Number of the lowest card value, cards 2-Ace take bits 0-12 of the rank masks.
+LOWEST_VALUE = 2
+
+#: Rank mask of the cards from 10 to Ace.
+HIGH_RANKS = 0b11111 << (10 - LOWEST_VALUE)
+
+#: Jokers needed for a straight when the cards can never make one.
+NO_STRAIGHT = 55
+
+#: Color numbers of the colors used in claims, e.g. "Hearts".
+COLOR_NUMBERS: Dict[str, int] = {name: number for number, name in Card.colors.items()}
+
+# Ranks of the lowest claim of every hand, see :data:`game.hands.CLAIMS`.
+HIGH_CARDS = CLAIM_RANKS[("HighCard", "2")]
+PAIRS = CLAIM_RANKS[("Pair", "2")]
+TWO_PAIRS = CLAIM_RANKS[("TwoPairs", "2", "3")]
+SMALL_STRAIGHT = CLAIM_RANKS[("SmallStraight",)]
+BIG_STRAIGHT = CLAIM_RANKS[("BigStraight",)]
+THREES = CLAIM_RANKS[("ThreeOfKind", "2")]
+FLUSHES = CLAIM_RANKS[("Flush", "Clubs")]
+FULL_HOUSES = CLAIM_RANKS[("FullHouse", "2", "3")]
+FOURS = CLAIM_RANKS[("FourOfKind", "2")]
+SMALL_POKERS = CLAIM_RANKS[("SmallPoker", "Clubs")]
+BIG_POKERS = CLAIM_RANKS[("BigPoker", "Clubs")]
+
+
+@lru_cache(maxsize=None)
+def straight_jokers_needed(rank_mask: int) -> int:
+    """Get the number of jokers completing a small straight, by the rules of
+    :meth:`Card.small_straight`.
+
+    Sorted distinct values are walked in windows of five, starting below 10,
+    and every missing step inside a window takes a joker. There are 8192 rank
+    masks, so the results are cached for all of them.
+
+    :param rank_mask: Mask of the card values present, bit 0 is 2, bit 12 is Ace.
+    :return: The number of jokers, :data:`NO_STRAIGHT` if there is no window.
+    """
+
+    values = [value for value in range(LOWEST_VALUE, 15) if rank_mask >> (value - LOWEST_VALUE) & 1]
+    needed = NO_STRAIGHT
+
+    for i in range(len(values) - 4):
+        if values[i] >= 10:
+            break
+        steps = sum(values[i + k] + 1 == values[i + k + 1] for k in range(4))
+        needed = min(needed, 4 - steps)
+
+    return needed
+
+
+class CardPool:
+    """Cards in use in a turn, for checking claims with bit and count operations.
+
+    The pool is built once per deal. It answers every claim the same way the
+    :class:`Card` methods do, jokers counting as any card.
+
+    :param cards: All players' cards.
+    """
+
+    def __init__(self, cards: List[Card]) -> None:
+        #: Mask of the cards present, bit 0 and bit 53 are the jokers,
+        #: bits 1-52 the other cards, as encoded by :func:`game.codec.card_to_code`.
+        self.mask: int = 0
+
+        #: Number of cards.
+        self.size: int = len(cards)
+
+        #: Number of jokers.
+        self.jokers: int = 0
+
+        #: Number of cards of each value, by the value.
+        self.ranks: List[int] = [0] * 15
+
+        #: Number of cards of each color, by the color number.
+        self.colors: List[int] = [0] * 5
+
+        #: Mask of the values present, bit 0 is 2, bit 12 is Ace.
+        self.rank_mask: int = 0
+
+        #: Mask of the values present in each color, by the color number.
+        self.color_masks: List[int] = [0] * 5
+
+        for card in cards:
+            if card.value == 0:
+                self.mask |= 1 << (53 * self.jokers)
+                self.jokers += 1
+            else:
+                bit = 1 << (card.value - LOWEST_VALUE)
+                self.mask |= 1 << ((card.value - LOWEST_VALUE) * 4 + card.color)
+                self.ranks[card.value] += 1
+                self.colors[card.color] += 1
+                self.rank_mask |= bit
+                self.color_masks[card.color] |= bit
+
+        #: Mask of the claims present, cached by :meth:`claims_present`.
+        self.present_claims: Union[None, int] = None
+
+    def count(self, value: int) -> int:
+        """Count the cards equal to a card of the value, like ``cards.count(Card(value))``.
+
+        :param value: The card value, 0 for a joker.
+        :return: The number of cards, jokers included.
+        """
+
+        if value == 0:
+            return self.size
+        return self.ranks[value] + self.jokers
+
+    def count_value(self, value: int) -> int:
+        """Count the cards equal to the value, like ``cards.count(value)``.
+
+        :param value: The card value, 0 for a joker.
+        :return: The number of cards, jokers included.
+        """
+
+        if value == 0:
+            return self.jokers
+        return self.ranks[value] + self.jokers
+
+    def check(self, mv: Hand) -> bool:
+        """Check if the claimed hand is present in the pool.
+
+        :param mv: Representation of the move.
+        :return: True if the hand is present, False otherwise.
+        """
+
+        mv_rank = mv.hierarchy_rank()
+
+        if mv_rank == 0:  # HighCard
+            return self.count(mv.value) >= 1
+
+        elif mv_rank == 1:  # Pair
+            return self.count(mv.value) >= 2
+
+        elif mv_rank == 2:  # TwoPairs
+            return self.count(mv.value1) >= 2 and self.count(mv.value2) >= 2
+
+        elif mv_rank == 3:  # Straight
+            if mv.small:
+                return straight_jokers_needed(self.rank_mask) <= self.jokers
+            return bin(self.rank_mask & HIGH_RANKS).count("1") + self.jokers >= 5
+
+        elif mv_rank == 4:  # ThreeOfKind
+            return self.count(mv.value) >= 3
+
+        elif mv_rank == 5:  # Flush
+            return self.colors[COLOR_NUMBERS[mv.color.lower()]] + self.jokers >= 5
+
+        elif mv_rank == 6:  # FullHouse
+            return self.count_value(mv.value_of_three) >= 3 and self.count_value(mv.value_of_two) >= 2
+
+        elif mv_rank == 7:  # FourOfKind
+            return self.count(mv.value) >= 4
+
+        elif mv_rank == 8:  # Poker
+            color_mask = self.color_masks[COLOR_NUMBERS[mv.color.lower()]]
+            if mv.small:
+                return straight_jokers_needed(color_mask) <= self.jokers
+            return bin(color_mask & HIGH_RANKS).count("1") + self.jokers >= 5
+
+        raise Exception("Invalid move")
+
+    def claims_present(self) -> int:
+        """Evaluate every claim against the pool at once.
+
+        Hands with values are evaluated from masks of the values with at least
+        one to four cards, jokers included, a whole row of claims at a time.
+        It costs about as much as building the pool, while checking the
+        claims one by one costs ten times more.
+
+        :return: Mask of the claims present, bit n is the claim of rank n in
+            :data:`game.hands.CLAIMS`.
+        """
+
+        if self.present_claims is not None:
+            return self.present_claims
+
+        at_least = [0] * 5
+        for bit, count in enumerate(self.ranks[LOWEST_VALUE:]):
+            at_least[min(count + self.jokers, 4)] |= 1 << bit
+        for needed in (3, 2, 1):
+            at_least[needed] |= at_least[needed + 1]
+
+        pairs = at_least[2]
+        present = at_least[1] << HIGH_CARDS | pairs << PAIRS | at_least[3] << THREES | at_least[4] << FOURS
+
+        # Two pairs are ordered by the lower pair, each row holds the higher pairs.
+        row_start = TWO_PAIRS
+        for low in range(12):
+            if pairs >> low & 1:
+                present |= (pairs >> (low + 1)) << row_start
+            row_start += 12 - low
+
+        # Full houses are ordered by the three, each row holds the 12 other pairs.
+        for three in range(13):
+            if at_least[3] >> three & 1:
+                others = pairs & ((1 << three) - 1) | (pairs >> (three + 1)) << three
+                present |= others << (FULL_HOUSES + 12 * three)
+
+        if straight_jokers_needed(self.rank_mask) <= self.jokers:
+            present |= 1 << SMALL_STRAIGHT
+        if bin(self.rank_mask & HIGH_RANKS).count("1") + self.jokers >= 5:
+            present |= 1 << BIG_STRAIGHT
+
+        for color in range(1, 5):
+            if self.colors[color] + self.jokers >= 5:
+                present |= 1 << (FLUSHES + color - 1)
+            if straight_jokers_needed(self.color_masks[color]) <= self.jokers:
+                present |= 1 << (SMALL_POKERS + color - 1)
+            if bin(self.color_masks[color] & HIGH_RANKS).count("1") + self.jokers >= 5:
+                present |= 1 << (BIG_POKERS + color - 1)
+
+        self.present_claims = present
+        return present
+
+    def highest_claim(self) -> Union[None, int]:
+        """Get the highest claim present in the pool.
+
+        :return: Rank of the claim in :data:`game.hands.CLAIMS`, None if no claim is present.
+        """
+
+        present = self.claims_present()
+        return present.bit_length() - 1 if present else None
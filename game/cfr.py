@@ -0,0 +1,532 @@
+"""Solve the opening turns of Bluff offline with counterfactual regret minimization (CFR+).
+
+The solved policies are an opening book: a configuration is the number of
+cards of every seat in a turn, and only configurations of at most
+:data:`MAX_SOLVED_CARDS` cards in play are solved. With fewer than five
+cards no straight, flush or poker can be present, so hands are multisets of
+card values and every deal of the turn fits in one array. These are the
+first turns of games of two or three players, far from a player getting
+eliminated, so the seat which gets the card just loses one card.
+"""
+from typing import Callable, Dict, List, Any, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import combinations_with_replacement, product
+from math import comb
+import json
+import os
+import struct
+import time
+import numpy as np
+from game.card import Card
+from game.card_pool import CardPool
+from game.game import BluffGame
+from game.hands import CLAIMS
+
+
+#: Most cards in play in a solved configuration. With fewer than five cards
+#: no straight, flush or poker can be present, so the colors do not matter
+#: and the hands are multisets of card values.
+MAX_SOLVED_CARDS = 4
+
+#: Most cards in play in the configurations solved by default. Iterations of
+#: configurations with :data:`MAX_SOLVED_CARDS` cards take seconds, those with
+#: fewer a fraction of a second.
+OPENING_CARDS = 3
+
+#: Cards needed by the hands which can be present with :data:`MAX_SOLVED_CARDS` cards.
+HAND_CARDS: Dict[str, int] = {"HighCard": 1, "Pair": 2, "ThreeOfKind": 3, "TwoPairs": 4, "FourOfKind": 4}
+
+#: Card values of the hands, 0 is the joker.
+HAND_VALUES: Tuple[int, ...] = (0,) + tuple(range(2, 15))
+
+#: Copies of every card value in the deck, by the value.
+COPIES: Dict[int, int] = {value: 2 if value == 0 else 4 for value in HAND_VALUES}
+
+#: Number of cards in the deck.
+DECK_SIZE = sum(COPIES.values())
+
+#: Probabilities of the policy tables are stored in a byte, from 0 to this number.
+PROBABILITY_SCALE = 255
+
+#: First bytes of a policy table file, followed by the length of its header.
+TABLE_MAGIC = b"BLUFFCFR"
+
+#: Default path of the policy table.
+POLICY_TABLE_PATH = "cfr_policy.bin"
+
+#: Index of the check among the actions, the claim of index n is the action n + 1.
+CHECK_ACTION = 0
+
+Configuration = Tuple[int, ...]
+
+
+@lru_cache(maxsize=None)
+def value_hands(cards: int) -> Tuple[Tuple[int, ...], ...]:
+    """Get all hands of a number of cards, as sorted card values.
+
+    :param cards: Number of cards.
+    :return: The hands, the index is the hand's index in the policy tables.
+    """
+
+    return tuple(hand for hand in combinations_with_replacement(HAND_VALUES, cards)
+                 if all(hand.count(value) <= COPIES[value] for value in set(hand)))
+
+
+@lru_cache(maxsize=None)
+def hand_indices(cards: int) -> Dict[Tuple[int, ...], int]:
+    """Get the indices of the hands of a number of cards, see :func:`value_hands`.
+
+    :param cards: Number of cards.
+    :return: Dictionary with the sorted card values as key and the index as value.
+    """
+
+    return {hand: index for index, hand in enumerate(value_hands(cards))}
+
+
+def solved_claims(cards_in_play: int) -> List[int]:
+    """Get the claims which can be present with the cards in play.
+
+    Other claims are never present, so claiming them loses to a check, and
+    they are left out of the solved actions.
+
+    :param cards_in_play: Number of all players' cards, at most :data:`MAX_SOLVED_CARDS`.
+    :return: Ranks of the claims, from the lowest.
+    """
+
+    return [rank for rank, claim in enumerate(CLAIMS) if HAND_CARDS.get(claim[0], DECK_SIZE) <= cards_in_play]
+
+
+def check_configuration(counts: Configuration) -> None:
+    """Check if a configuration can be solved.
+
+    :param counts: Number of cards of every seat, the first seat starts the turn.
+    :raises ValueError: If the configuration cannot be solved.
+    """
+
+    if len(counts) < 2 or min(counts) < 1:
+        raise ValueError(f"A configuration needs two or more seats with cards, got {counts}")
+    if sum(counts) > MAX_SOLVED_CARDS:
+        raise ValueError(f"Configurations with more than {MAX_SOLVED_CARDS} cards cannot be solved, got {counts}")
+    if max(counts) + 1 >= BluffGame.max_cards:
+        raise ValueError(f"A seat of {counts} would be eliminated by the card, which is not scored")
+
+
+class CFRSolver:
+    """Solver of one turn of Bluff with counterfactual regret minimization (CFR+).
+
+    The turn is solved for a configuration, the number of cards of every
+    seat, from the first claim to the check. The seat which gets the card
+    scores -1 and the other seats share +1, so a policy minimizes the
+    chance of getting the card.
+
+    A player decides from the own hand and the last claim only, forgetting
+    the earlier claims, so the states of a turn are the deals, the last
+    claim and the seat on turn. The counterfactual reach of a state would
+    count every path of the player's own claims to it, so the regrets are
+    weighted by the probability of reaching the state instead. All deals are
+    updated at once with NumPy, a last claim and a seat at a time.
+
+    :param counts: Number of cards of every seat, the first seat starts the turn.
+    """
+
+    def __init__(self, counts: Configuration) -> None:
+        check_configuration(counts)
+
+        #: Number of cards of every seat, the first seat starts the turn.
+        self.counts: Configuration = tuple(counts)
+
+        #: Ranks of the claims which can be present, the claim of index n is the last claim n + 1.
+        self.claims: List[int] = solved_claims(sum(counts))
+
+        #: Number of last claims, the first is no claim, and of actions, the first is the check.
+        self.actions_num: int = len(self.claims) + 1
+
+        hands = [value_hands(cards) for cards in counts]
+
+        #: Number of hands of every seat, the deals are all combinations of the seats' hands.
+        self.hands_num: Tuple[int, ...] = tuple(len(seat_hands) for seat_hands in hands)
+
+        #: Probability of every deal, by the hand of every seat, 0 if the deck does not have the cards.
+        self.chance: np.ndarray = np.zeros(self.hands_num)
+
+        #: If the last claim is present in every deal, by the last claim, the first is no claim.
+        self.present: np.ndarray = np.zeros((self.actions_num,) + self.hands_num, dtype=bool)
+
+        present_by_cards: Dict[Tuple[int, ...], np.ndarray] = {}
+        for deal in np.ndindex(*self.hands_num):
+            deal_hands = [hands[seat][index] for seat, index in enumerate(deal)]
+            self.chance[deal] = deal_ways(deal_hands)
+            if not self.chance[deal]:
+                continue
+
+            cards = tuple(sorted(value for hand in deal_hands for value in hand))
+            if cards not in present_by_cards:
+                present = CardPool([Card.of(value) for value in cards]).claims_present()
+                present_by_cards[cards] = np.array([present >> rank & 1 for rank in self.claims], dtype=bool)
+            self.present[(slice(1, None),) + deal] = present_by_cards[cards]
+        self.chance /= self.chance.sum()
+
+        #: Legal actions after every last claim: the check after a claim, and the higher claims.
+        self.legal: np.ndarray = np.zeros((self.actions_num, self.actions_num), dtype=bool)
+        for last in range(self.actions_num):
+            self.legal[last, last + 1:] = True
+            self.legal[last, CHECK_ACTION] = last > 0
+
+        shape = [(hands_num, self.actions_num, self.actions_num) for hands_num in self.hands_num]
+
+        #: Cumulative regrets of every seat's actions, by the hand and the last claim.
+        self.regrets: List[np.ndarray] = [np.zeros(seat_shape) for seat_shape in shape]
+
+        #: Sums of every seat's strategies, weighted by the reach and the iteration.
+        self.strategy_sums: List[np.ndarray] = [np.zeros(seat_shape) for seat_shape in shape]
+
+        #: Number of iterations done.
+        self.iteration: int = 0
+
+    def current_strategy(self, seat: int) -> np.ndarray:
+        """Get the strategy of a seat by regret matching.
+
+        :param seat: The seat.
+        :return: Probabilities of the actions, by the hand and the last claim.
+        """
+
+        return self.normalize(np.maximum(self.regrets[seat], 0.0))
+
+    def average_strategy(self, seat: int) -> np.ndarray:
+        """Get the average strategy of a seat, which converges to the solution.
+
+        :param seat: The seat.
+        :return: Probabilities of the actions, by the hand and the last claim.
+        """
+
+        return self.normalize(self.strategy_sums[seat])
+
+    def normalize(self, weights: np.ndarray) -> np.ndarray:
+        """Turn the weights of the actions into probabilities, uniform over the legal actions if all are 0.
+
+        :param weights: Weights of the actions, by the hand and the last claim.
+        :return: Probabilities of the actions.
+        """
+
+        weights = weights * self.legal
+        totals = weights.sum(axis=2, keepdims=True)
+        uniform = self.legal / np.maximum(self.legal.sum(axis=1, keepdims=True), 1)
+        return np.where(totals > 0, weights / np.where(totals > 0, totals, 1.0), uniform)
+
+    def iterate(self, iterations: int = 1) -> None:
+        """Make iterations of CFR+, updating the regrets and the average strategies.
+
+        :param iterations: Number of iterations.
+        """
+
+        for _ in range(iterations):
+            self.iteration += 1
+            strategies = [self.current_strategy(seat) for seat in range(len(self.counts))]
+            reach = self.reach(strategies)
+            self.values(strategies, reach)
+            for regrets in self.regrets:
+                np.maximum(regrets, 0.0, out=regrets)
+
+    def by_deal(self, seat: int, hand_values: np.ndarray) -> np.ndarray:
+        """Reshape values of a seat's hands to combine them with the values of the deals.
+
+        :param seat: The seat.
+        :param hand_values: Values by anything and the seat's hand.
+        :return: The values, broadcasting over the other seats' hands.
+        """
+
+        shape = tuple(hands_num if other == seat else 1 for other, hands_num in enumerate(self.hands_num))
+        return hand_values.reshape(hand_values.shape[:-1] + shape)
+
+    def by_hand(self, seat: int, deal_values: np.ndarray) -> np.ndarray:
+        """Add up values of the deals by a seat's hand.
+
+        :param seat: The seat.
+        :param deal_values: Values by anything and the deal.
+        :return: The values by anything and the seat's hand.
+        """
+
+        first_axis = deal_values.ndim - len(self.hands_num)
+        axes = tuple(first_axis + other for other in range(len(self.hands_num)) if other != seat)
+        return deal_values.sum(axis=axes)
+
+    def reach(self, strategies: List[np.ndarray]) -> np.ndarray:
+        """Get the probability of reaching every state.
+
+        :param strategies: Strategies of the seats.
+        :return: Probabilities by the seat on turn, the last claim and the deal.
+        """
+
+        seats_num, actions_num = len(self.counts), self.actions_num
+        reach = np.zeros((seats_num, actions_num) + self.hands_num, dtype=np.float32)
+        reach[0, 0] = self.chance
+
+        for last in range(actions_num - 1):
+            for seat in range(seats_num):
+                claims = self.by_deal(seat, strategies[seat][:, last, last + 1:].T.astype(np.float32))
+                reach[(seat + 1) % seats_num, last + 1:] += reach[seat, last] * claims
+        return reach
+
+    def values(self, strategies: List[np.ndarray], reach: Union[None, np.ndarray] = None) -> np.ndarray:
+        """Get the expected scores of the turn, and update the regrets and the strategy sums if the reach is given.
+
+        :param strategies: Strategies of the seats.
+        :param reach: Probability of reaching every state, see :meth:`reach`.
+        :return: Expected score of every seat.
+        """
+
+        seats_num, actions_num = len(self.counts), self.actions_num
+        share = 1.0 / (seats_num - 1)
+        # Expected scores by the seat on turn, the scoring seat, the last claim and the deal.
+        scores = np.zeros((seats_num, seats_num, actions_num) + self.hands_num, dtype=np.float32)
+
+        for last in range(actions_num - 1, -1, -1):
+            for seat in range(seats_num):
+                next_seat, checked = (seat + 1) % seats_num, (seat - 1) % seats_num
+                strategy = self.by_deal(seat, strategies[seat][:, last].T.astype(np.float32))
+                check, claims = strategy[CHECK_ACTION], strategy[last + 1:]
+                claim_scores = scores[next_seat, :, last + 1:]
+
+                check_scores = np.zeros((seats_num,) + self.hands_num, dtype=np.float32)
+                if last > 0:
+                    loser = np.where(self.present[last], seat, checked)
+                    for scoring in range(seats_num):
+                        check_scores[scoring] = np.where(loser == scoring, -1.0, share)
+
+                state_scores = check * check_scores + (claims * claim_scores).sum(axis=1)
+                scores[seat, :, last] = state_scores
+
+                if reach is not None:
+                    weights = reach[seat, last]
+                    if last > 0:
+                        check_regrets = (check_scores[seat] - state_scores[seat]) * weights
+                        self.regrets[seat][:, last, CHECK_ACTION] += self.by_hand(seat, check_regrets)
+                    claim_regrets = (claim_scores[seat] - state_scores[seat]) * weights
+                    self.regrets[seat][:, last, last + 1:] += self.by_hand(seat, claim_regrets).T
+
+                    hand_reach = self.by_hand(seat, weights)
+                    self.strategy_sums[seat][:, last] += (self.iteration * hand_reach[:, None]
+                                                          * strategies[seat][:, last])
+
+        return (scores[0, :, 0] * self.chance).reshape(seats_num, -1).sum(axis=1)
+
+    def policy_table(self) -> List[np.ndarray]:
+        """Get the average strategies with the probabilities in bytes.
+
+        :return: Probabilities of the actions by the hand and the last claim, by the seat,
+            from 0 to :data:`PROBABILITY_SCALE`.
+        """
+
+        return [np.rint(self.average_strategy(seat) * PROBABILITY_SCALE).astype(np.uint8)
+                for seat in range(len(self.counts))]
+
+    def save_checkpoint(self, path: str) -> None:
+        """Save the progress of the solver, replacing the file at once.
+
+        :param path: Path of the checkpoint, a .npz file.
+        """
+
+        arrays = {"counts": np.array(self.counts), "iteration": np.array(self.iteration)}
+        for seat in range(len(self.counts)):
+            arrays[f"regrets{seat}"] = self.regrets[seat]
+            arrays[f"strategy_sums{seat}"] = self.strategy_sums[seat]
+
+        temporary_path = path + ".tmp.npz"
+        np.savez(temporary_path, **arrays)
+        os.replace(temporary_path, path)
+
+    def load_checkpoint(self, path: str) -> None:
+        """Continue from a saved progress of the same configuration.
+
+        :param path: Path of the checkpoint.
+        :raises ValueError: If the checkpoint is of another configuration.
+        """
+
+        with np.load(path) as arrays:
+            if tuple(arrays["counts"]) != self.counts:
+                raise ValueError(f"Checkpoint {path} is of configuration {tuple(arrays['counts'])}, not {self.counts}")
+            self.iteration = int(arrays["iteration"])
+            for seat in range(len(self.counts)):
+                self.regrets[seat] = arrays[f"regrets{seat}"]
+                self.strategy_sums[seat] = arrays[f"strategy_sums{seat}"]
+
+
+def deal_ways(hands: List[Tuple[int, ...]]) -> int:
+    """Count the ways to deal the hands from the deck.
+
+    :param hands: Card values of every seat's hand.
+    :return: Number of ways, 0 if the deck does not have the cards.
+    """
+
+    ways = 1
+    for value in set().union(*hands):
+        left = COPIES[value]
+        for hand in hands:
+            count = hand.count(value)
+            if count > left:
+                return 0
+            ways *= comb(left, count)
+            left -= count
+    return ways
+
+
+def solve_configuration(counts: Configuration, iterations: int, checkpoint_dir: Union[None, str] = None,
+                        checkpoint_every: int = 50) -> Tuple[Configuration, List[np.ndarray], Tuple[float, ...]]:
+    """Solve a configuration, e.g. in a worker process, continuing from its checkpoint if there is one.
+
+    :param counts: Number of cards of every seat, the first seat starts the turn.
+    :param iterations: Number of iterations in total, with those of the checkpoint.
+    :param checkpoint_dir: Directory of the checkpoints, none are saved if None.
+    :param checkpoint_every: Number of iterations between the checkpoints.
+    :return: The configuration, its policy table, see :meth:`CFRSolver.policy_table`,
+        and the expected score of every seat under the average strategies.
+    """
+
+    solver = CFRSolver(counts)
+    path = None
+    if checkpoint_dir is not None:
+        path = os.path.join(checkpoint_dir, "cfr_" + "_".join(map(str, counts)) + ".npz")
+        if os.path.exists(path):
+            solver.load_checkpoint(path)
+
+    while solver.iteration < iterations:
+        solver.iterate(min(checkpoint_every, iterations - solver.iteration))
+        if path is not None:
+            solver.save_checkpoint(path)
+
+    strategies = [solver.average_strategy(seat) for seat in range(len(counts))]
+    return solver.counts, solver.policy_table(), tuple(solver.values(strategies).tolist())
+
+
+def opening_configurations(max_players: int = 3, max_cards: int = OPENING_CARDS) -> List[Configuration]:
+    """Get all configurations of the opening turns with few players and cards.
+
+    :param max_players: Most players, from 2.
+    :param max_cards: Most cards in play, at most :data:`MAX_SOLVED_CARDS`.
+    :return: The configurations, the first seat starts the turn.
+    """
+
+    return [counts for players_num in range(2, max_players + 1)
+            for counts in product(range(1, max_cards + 1), repeat=players_num) if sum(counts) <= max_cards]
+
+
+def solve(configurations: List[Configuration], iterations: int, workers: Union[None, int] = None,
+          checkpoint_dir: Union[None, str] = None, checkpoint_every: int = 50,
+          on_progress: Union[None, Callable[[Configuration, Tuple[float, ...], float], None]] = None
+          ) -> Dict[Configuration, List[np.ndarray]]:
+    """Solve configurations in a pool of worker processes, one configuration per worker at a time.
+
+    :param configurations: The configurations.
+    :param iterations: Number of iterations of every configuration.
+    :param workers: Number of worker processes, the number of CPUs if None.
+    :param checkpoint_dir: Directory of the checkpoints, none are saved if None.
+    :param checkpoint_every: Number of iterations between the checkpoints.
+    :param on_progress: Function called with every solved configuration, the
+        expected scores of its seats and the seconds so far.
+    :return: Dictionary with the configuration as key and its policy table as value.
+    """
+
+    for counts in configurations:
+        check_configuration(counts)
+    if checkpoint_dir is not None:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    tables = {}
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(workers) as executor:
+        # The largest configurations first, so they do not finish last.
+        futures = [executor.submit(solve_configuration, counts, iterations, checkpoint_dir, checkpoint_every)
+                   for counts in sorted(configurations, key=lambda counts: (-sum(counts), -len(counts)))]
+        for future in as_completed(futures):
+            counts, table, scores = future.result()
+            tables[counts] = table
+            if on_progress is not None:
+                on_progress(counts, scores, time.perf_counter() - start_time)
+
+    return tables
+
+
+def write_policy_table(path: str, tables: Dict[Configuration, List[np.ndarray]]) -> None:
+    """Write the policy tables of the configurations to a file, which is memory mapped by :class:`PolicyTable`.
+
+    The file holds :data:`TABLE_MAGIC`, the length of a JSON header in four
+    bytes, the header, and the probabilities of all tables.
+
+    :param path: Path of the file.
+    :param tables: Dictionary with the configuration as key and its policy table as value.
+    """
+
+    configurations, offset = [], 0
+    for counts, table in sorted(tables.items()):
+        offsets = []
+        for seat_table in table:
+            offsets.append(offset)
+            offset += seat_table.size
+        configurations.append({"counts": list(counts), "claims": solved_claims(sum(counts)), "offsets": offsets})
+
+    header = json.dumps({"configurations": configurations}).encode()
+    with open(path, "wb") as file:
+        file.write(TABLE_MAGIC + struct.pack("<I", len(header)) + header)
+        for _, table in sorted(tables.items()):
+            for seat_table in table:
+                file.write(seat_table.tobytes())
+
+
+class PolicyTable:
+    """Policy tables of solved configurations, memory mapped from a file
+    written by :func:`write_policy_table`.
+
+    :param path: Path of the file.
+    """
+
+    def __init__(self, path: str = POLICY_TABLE_PATH) -> None:
+        with open(path, "rb") as file:
+            magic = file.read(len(TABLE_MAGIC))
+            if magic != TABLE_MAGIC:
+                raise ValueError(f"{path} is not a policy table")
+            header_size, = struct.unpack("<I", file.read(4))
+            header = json.loads(file.read(header_size))
+
+        #: Dictionary with the configuration as key, and the ranks of its
+        #: claims, the index of every last claim and the offset of every seat's table as value.
+        self.configurations: Dict[Configuration, Dict[str, Any]] = {}
+        for configuration in header["configurations"]:
+            claims = configuration["claims"]
+            self.configurations[tuple(configuration["counts"])] = {
+                "claims": claims,
+                "last_index": {rank: index + 1 for index, rank in enumerate(claims)},
+                "offsets": configuration["offsets"],
+            }
+
+        #: Probabilities of all tables, see :meth:`CFRSolver.policy_table`.
+        self.data: np.ndarray = np.memmap(path, dtype=np.uint8, mode="r",
+                                          offset=len(TABLE_MAGIC) + 4 + header_size)
+
+    def lookup(self, counts: Configuration, seat: int, hand: List[int],
+               last_claim: int) -> Union[None, Tuple[List[int], np.ndarray]]:
+        """Look up the probabilities of a player's actions.
+
+        :param counts: Number of cards of every seat, the first seat started the turn.
+        :param seat: The player's seat.
+        :param hand: Card values of the player's hand, 0 for a joker.
+        :param last_claim: Rank of the last claim in :data:`game.hands.CLAIMS`, -1 if there was no claim.
+        :return: The ranks of the claims of the configuration, where the claim
+            of index n is the action n + 1, and the probabilities of the actions
+            from 0 to :data:`PROBABILITY_SCALE`, with the check first. None if
+            the configuration was not solved, or the last claim can never be present.
+        """
+
+        configuration = self.configurations.get(tuple(counts))
+        if configuration is None:
+            return None
+
+        last = configuration["last_index"].get(last_claim, 0 if last_claim < 0 else None)
+        if last is None:
+            return None
+
+        claims = configuration["claims"]
+        actions_num = len(claims) + 1
+        hand_index = hand_indices(len(hand))[tuple(sorted(hand))]
+        start = configuration["offsets"][seat] + (hand_index * actions_num + last) * actions_num
+        return claims, self.data[start:start + actions_num]
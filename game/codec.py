@@ -0,0 +1,296 @@
+from typing import Dict, List, Any, Tuple, Union
+import struct
+from game.card import Card
+from game.game import READY_TEXT
+
+
+#: Version of the status format, sent as the first byte of every status.
+STATUS_FORMAT = 4
+
+#: First byte of the reply to a poll, when the game state did not change.
+UNCHANGED = 0
+
+#: The whole reply to a poll, when the game state did not change.
+UNCHANGED_STATUS = bytes((UNCHANGED,))
+
+#: Game state versions are sent modulo this number.
+VERSION_MODULO = 2 ** 32
+
+#: Label the server puts before the name of the player receiving the status.
+YOU_LABEL = "You: "
+
+#: Hand names with the number of their arguments, the index is the hand code.
+HANDS: List[Tuple[str, int]] = [
+    ("HighCard", 1), ("Pair", 1), ("TwoPairs", 2), ("SmallStraight", 0),
+    ("BigStraight", 0), ("ThreeOfKind", 1), ("Flush", 1), ("FullHouse", 2),
+    ("FourOfKind", 1), ("SmallPoker", 1), ("BigPoker", 1)]
+
+#: Card values and colors used as hand arguments, the index is the token code.
+ARGUMENTS: List[str] = ["Joker"] + [str(i) for i in range(2, 11)] + [
+    "Jack", "Queen", "King", "Ace", "Clubs", "Diamonds", "Hearts", "Spades"]
+
+#: Token code followed by raw text, for arguments not in :data:`ARGUMENTS`.
+RAW_ARGUMENT = 255
+
+#: Value written instead of a player index when there is no such player.
+NO_PLAYER = 255
+
+HAND_CODES = {hand: code for code, (hand, _) in enumerate(HANDS)}
+ARGUMENT_CODES = {argument.lower(): code for code, argument in enumerate(ARGUMENTS)}
+
+#: Cache of the claim encodings, filled by :func:`encode_claim`.
+CLAIM_CODES: Dict[Tuple[str, ...], List[int]] = {}
+
+# Flags of the shared part of the status and of the player's part of the status.
+START, LOST, IS_TURN, ELIMINATED, WIN = 1, 2, 4, 8, 16
+
+#: Format, version, room ID, flags and number of names, at the beginning of the shared part.
+SHARED_HEADER = struct.Struct(">BIIBB")
+
+#: Turn, winner, numbers of ready and of active players, and number of players, after the names.
+COUNTS = struct.Struct(">5B")
+
+#: Flags, the player's index and the number of cards, at the beginning of the player's part.
+PLAYER_HEADER = struct.Struct(">3B")
+
+
+def card_to_code(card: Card) -> int:
+    """Encode a card in one byte.
+
+    :param card: The card to encode.
+    :return: 0 for a joker, 1-52 for other cards.
+    """
+
+    if card.value == 0:
+        return 0
+    return (card.value - 2) * 4 + card.color
+
+
+def code_to_card(code: int) -> Card:
+    """Decode a card encoded by :func:`card_to_code`.
+
+    :param code: The card code.
+    :return: The decoded card.
+    """
+
+    return Card.interned[code]
+
+
+def encode_status(status: Dict[str, Any]) -> bytes:
+    """Encode a game status from :meth:`BluffGame.get_game_status`.
+
+    A whole status takes longer to encode than to pickle, the codec pays off
+    because the server encodes the shared part once per room version with
+    :func:`encode_shared_status`, and only :func:`encode_player_status` for
+    every player.
+
+    :param status: The game status.
+    :return: The encoded status.
+    """
+
+    you = None
+    players = status["players"]
+    for index, (name, cards) in enumerate(players):
+        if name.startswith(YOU_LABEL):
+            you = index
+            players = list(players)
+            players[index] = (name[len(YOU_LABEL):], cards)
+
+    shared_status = {**status, "players": players}
+    player_status = {"lost": status["lost"], "hand": status["hand"],
+                     "is_turn": status["is_turn"], "you": you}
+
+    return encode_shared_status(shared_status) + encode_player_status(player_status)
+
+
+def encode_shared_status(shared_status: Dict[str, Any]) -> bytes:
+    """Encode the part of the status shared by all players in the room.
+
+    The result is the beginning of every player's status, see
+    :meth:`BluffGame.get_shared_status`, optionally with the "room" ID of the
+    game. Player names are written once into a table and referenced by their
+    index everywhere else.
+
+    :param shared_status: The shared part of the game status.
+    :return: The encoded shared part of the status.
+    """
+
+    name_codes: Dict[str, int] = {}
+    code = name_codes.setdefault
+
+    players = []
+    for name, cards in shared_status["players"]:
+        players += code(name, len(name_codes)), cards
+
+    moves = []
+    for name, move in shared_status["moves"]:
+        moves.append(code(name, len(name_codes)))
+        claim = tuple(move)
+        if claim in CLAIM_CODES:
+            moves += CLAIM_CODES[claim]
+        else:
+            moves += encode_claim(move)
+
+    check_result = shared_status["check_result"]
+    checked_names = [code(name, len(name_codes)) for name in check_result[:3]]
+    turn = code(shared_status["turn"], len(name_codes))
+    win = code(shared_status["win"], len(name_codes)) if shared_status["win"] else NO_PLAYER
+
+    flags = (START * shared_status["start"] | ELIMINATED * bool(check_result[3])
+             | WIN * bool(shared_status["win"]))
+
+    data = bytearray(SHARED_HEADER.pack(STATUS_FORMAT, shared_status["version"] % VERSION_MODULO,
+                                        shared_status.get("room", 0), flags, len(name_codes)))
+    for name in name_codes:
+        data += encode_text(name)
+    data += COUNTS.pack(turn, win, shared_status["ready_players"], shared_status["active_players"],
+                        len(shared_status["players"]))
+    data += bytes(players)
+    data.append(len(shared_status["checked"]))
+    data += bytes([card_to_code(card) for card in shared_status["checked"]])
+    data += bytes(checked_names)
+    data += len(shared_status["moves"]).to_bytes(2, "big")
+    data += bytes(moves)
+
+    return bytes(data)
+
+
+def encode_player_status(player_status: Dict[str, Any]) -> bytes:
+    """Encode the part of the status specific to one player.
+
+    The result is appended to the encoded shared part of the status, see
+    :meth:`BluffGame.get_player_status`.
+
+    :param player_status: The player's part of the game status.
+    :return: The encoded player's part of the status.
+    """
+
+    flags = LOST * player_status["lost"] | IS_TURN * player_status["is_turn"]
+    you = NO_PLAYER if player_status["you"] is None else player_status["you"]
+
+    return PLAYER_HEADER.pack(flags, you, len(player_status["hand"])) + bytes(
+        [card_to_code(card) for card in player_status["hand"]])
+
+
+def encode_claim(move: List[str]) -> List[int]:
+    """Encode a claimed hand, e.g. ``["FullHouse", "2", "Ace"]``.
+
+    Encodings of claims written exactly as the client sends them are cached.
+
+    :param move: Name of the hand followed by its arguments.
+    :return: Hand code followed by the argument codes.
+    """
+
+    hand = HAND_CODES[move[0]]
+    codes = [hand]
+    canonical = len(move) == HANDS[hand][1] + 1
+    for argument in move[1:HANDS[hand][1] + 1]:
+        argument_code = ARGUMENT_CODES.get(argument.lower(), RAW_ARGUMENT)
+        codes.append(argument_code)
+        if argument_code == RAW_ARGUMENT:
+            codes += encode_text(argument)
+        canonical = canonical and argument in ARGUMENTS
+
+    if canonical:
+        CLAIM_CODES[tuple(move)] = codes
+    return codes
+
+
+def decode_status(data: bytes) -> Union[None, Dict[str, Any]]:
+    """Decode a game status encoded by :func:`encode_status`, or by
+    :func:`encode_shared_status` followed by :func:`encode_player_status`.
+
+    :param data: The encoded status.
+    :return: The game status, as returned by :meth:`BluffGame.get_game_status`,
+        None if the server replied that the game state did not change.
+    """
+
+    data = memoryview(data)
+    if data[0] == UNCHANGED:
+        return None
+    if data[0] != STATUS_FORMAT:
+        raise ValueError(f"Unsupported status format {data[0]}")
+
+    _, version, room, flags, names_num = SHARED_HEADER.unpack_from(data)
+    pos = SHARED_HEADER.size
+    names = []
+    for _ in range(names_num):
+        name, pos = decode_text(data, pos)
+        names.append(name)
+
+    turn, win, ready, active, players_num = COUNTS.unpack_from(data, pos)
+    pos += COUNTS.size
+    players = [(names[data[pos + 2 * index]], data[pos + 2 * index + 1])
+               for index in range(players_num)]
+    pos += 2 * players_num
+
+    checked = [code_to_card(code) for code in data[pos + 1:pos + 1 + data[pos]]]
+    pos += 1 + data[pos]
+
+    check_result = [names[code] for code in data[pos:pos + 3]]
+    check_result.append(bool(flags & ELIMINATED))
+    pos += 3
+
+    moves = []
+    moves_num = int.from_bytes(data[pos:pos + 2], "big")
+    pos += 2
+    for _ in range(moves_num):
+        name, hand_name = names[data[pos]], HANDS[data[pos + 1]][0]
+        pos += 2
+        move = [hand_name]
+        for _ in range(HANDS[data[pos - 1]][1]):
+            code = data[pos]
+            pos += 1
+            if code == RAW_ARGUMENT:
+                argument, pos = decode_text(data, pos)
+            else:
+                argument = ARGUMENTS[code]
+            move.append(argument)
+        moves.append((name, move))
+
+    player_flags, you = data[pos], data[pos + 1]
+    hand = [code_to_card(code) for code in data[pos + 3:pos + 3 + data[pos + 2]]]
+    if you != NO_PLAYER:
+        players[you] = (YOU_LABEL + players[you][0], players[you][1])
+
+    return {
+        "version": version,
+        "room": room,
+        "start": bool(flags & START),
+        "lost": bool(player_flags & LOST),
+        "hand": hand,
+        "win": names[win] if flags & WIN else False,
+        "moves": moves,
+        "check_result": check_result,
+        "checked": checked,
+        "ready": READY_TEXT.format(ready, active),
+        "ready_players": ready,
+        "active_players": active,
+        "players": players,
+        "is_turn": bool(player_flags & IS_TURN),
+        "turn": names[turn],
+    }
+
+
+def encode_text(text: str) -> bytes:
+    """Encode a string prefixed with its length.
+
+    :param text: The string to encode.
+    :return: The encoded string.
+    """
+
+    encoded = text.encode()
+    return len(encoded).to_bytes(2, "big") + encoded
+
+
+def decode_text(data: memoryview, pos: int) -> Tuple[str, int]:
+    """Decode a string encoded by :func:`encode_text`.
+
+    :param data: The data with the string.
+    :param pos: Position of the string in the data.
+    :return: The string and the position after it.
+    """
+
+    length = int.from_bytes(data[pos:pos + 2], "big")
+    end = pos + 2 + length
+    return str(data[pos + 2:end], "utf-8"), end
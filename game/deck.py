@@ -1,36 +1,53 @@
-from random import shuffle
-from typing import List
+from array import array
+from random import Random
+from typing import List, Tuple, Union
 from game.card import Card
 
 
 class Deck:
     """Represents a deck of playing cards.
+
+    :param rng: Random number generator shuffling the deck, e.g. the room's one.
     """
 
-    def __init__(self) -> None:
-        #: Represents full 54 cards deck, including 2 joker cards.
-        self.deck = self.create_deck()
+    #: Full 54 cards deck, including 2 joker cards.
+    cards: Tuple[Card, ...] = (Card.of(0), Card.of(0)) + tuple(
+        Card.of(value, color) for value in range(2, 15) for color in range(1, 5))
 
-    def create_deck(self) -> List[Card]:
-        """Creates a new deck of cards.
+    def __init__(self, rng: Union[None, Random] = None) -> None:
+        #: Random number generator shuffling the deck.
+        self.rng: Random = rng if rng is not None else Random()
 
-        :return: The list of cards in the deck.
-        """
-        deck = [Card(0, 0), Card(0, 0)]
+        #: Indices of the cards of :attr:`cards` left in the deck, the top card is the last.
+        self.deck: array = self.create_deck()
 
-        for value in range(2, 15):
-            for color in range(1, 5):
-                deck.append(Card(value, color))
+    def create_deck(self) -> array:
+        """Creates a new deck of cards.
 
-        return deck
+        :return: The array of indices of the cards in the deck.
+        """
+        return array("B", range(len(self.cards)))
 
     def pop_card(self) -> Card:
         """Removes and returns the top card from the deck.
 
         :return: The top card from the deck.
         """
-        return self.deck.pop()
+        return self.cards[self.deck.pop()]
+
+    def deal(self, count: int) -> List[Card]:
+        """Removes and returns the top cards from the deck, in the order
+        :meth:`pop_card` would return them.
+
+        :param count: Number of cards.
+        :return: The cards.
+        """
+
+        start = len(self.deck) - count
+        cards = [self.cards[index] for index in reversed(self.deck[start:])]
+        del self.deck[start:]
+        return cards
 
     def shuffle(self) -> None:
         """Shuffles the deck."""
-        shuffle(self.deck)
+        self.rng.shuffle(self.deck)
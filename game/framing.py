@@ -0,0 +1,137 @@
+import struct
+from typing import Any, Union
+
+
+#: Header of every frame: payload length as 4 bytes unsigned int, big endian.
+HEADER = struct.Struct("!I")
+
+#: Initial size of the receive buffer.
+DEFAULT_BUFFER_SIZE = 1024 * 16
+
+#: Least free space offered to a single receive.
+MIN_RECV_SIZE = 1024
+
+#: Longest payload accepted, longer frames are treated as a protocol error.
+MAX_FRAME_LENGTH = 1024 * 1024 * 4
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix the payload with its length.
+
+    :param payload: The message to send.
+    :return: The framed message.
+    """
+
+    return HEADER.pack(len(payload)) + payload
+
+
+class FrameBuffer:
+    """Reassembles length-prefixed frames received from a stream.
+
+    Data is received straight into one preallocated buffer, and frames are
+    returned as memoryview slices of it, so no bytes are copied per message.
+    A returned frame is valid only until the next call to the buffer.
+
+    :param size: Initial size of the buffer in bytes.
+    """
+
+    def __init__(self, size: int = DEFAULT_BUFFER_SIZE) -> None:
+        #: Buffer with the received data.
+        self.buffer: bytearray = bytearray(size)
+
+        #: Memoryview of the buffer used to avoid copying.
+        self.view: memoryview = memoryview(self.buffer)
+
+        #: Index of the first byte not parsed yet.
+        self.start: int = 0
+
+        #: Index after the last received byte.
+        self.end: int = 0
+
+    def reserve(self, nbytes: int) -> None:
+        """Make room for at least nbytes after the received data.
+
+        Unparsed data is moved to the beginning of the buffer, and the buffer
+        is enlarged only if a single frame does not fit into it.
+
+        :param nbytes: Number of bytes that must fit after the received data.
+        """
+
+        if len(self.buffer) - self.end >= nbytes:
+            return
+
+        pending = self.end - self.start
+
+        if pending + nbytes > len(self.buffer):
+            buffer = bytearray(max(pending + nbytes, len(self.buffer) * 2))
+            buffer[:pending] = self.view[self.start:self.end]
+            self.buffer = buffer
+            self.view = memoryview(self.buffer)
+        elif pending:
+            self.view[:pending] = self.view[self.start:self.end]
+
+        self.start, self.end = 0, pending
+
+    def get_buffer(self) -> memoryview:
+        """Get the free part of the buffer to receive data into.
+
+        :return: Writable memoryview of the free space.
+        """
+
+        if self.start == self.end:
+            self.start = self.end = 0
+        self.reserve(MIN_RECV_SIZE)
+        return self.view[self.end:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Mark bytes written into :meth:`get_buffer` as received.
+
+        :param nbytes: Number of received bytes.
+        """
+
+        self.end += nbytes
+
+    def recv_from(self, sock: Any) -> int:
+        """Receive available data from the socket into the buffer.
+
+        :param sock: The socket to receive from.
+        :return: Number of received bytes, 0 if the connection was closed.
+        """
+
+        nbytes = sock.recv_into(self.get_buffer())
+        self.buffer_updated(nbytes)
+        return nbytes
+
+    def feed(self, data: bytes) -> None:
+        """Append data received by other means, e.g. from asyncio streams.
+
+        :param data: The received data.
+        """
+
+        if self.start == self.end:
+            self.start = self.end = 0
+        self.reserve(len(data))
+        self.view[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def next_frame(self) -> Union[None, memoryview]:
+        """Get the next complete frame from the buffer.
+
+        :return: Payload of the frame, None if no complete frame was received.
+        """
+
+        pending = self.end - self.start
+        if pending < HEADER.size:
+            return None
+
+        length, = HEADER.unpack_from(self.buffer, self.start)
+        if length > MAX_FRAME_LENGTH:
+            raise ValueError(f"Frame of {length} bytes is too long")
+
+        if pending - HEADER.size < length:
+            self.reserve(HEADER.size + length - pending)
+            return None
+
+        payload_start = self.start + HEADER.size
+        self.start = payload_start + length
+        return self.view[payload_start:self.start]
@@ -1,27 +1,60 @@
 from typing import Dict, List, Any, Tuple, Union
-from random import randint
+from random import Random
 from game.player import Player
 from game.deck import Deck
 from game.card import Card
+from game.card_pool import CardPool
 from game.hands import *
 
+#: Text of the number of ready players and of active players.
+READY_TEXT = "Waiting for players {}/{}"
+
 
 class BluffGame:
     """ Representation of the Bluff Game
+
+    :param seed: Seed of the game's random number generator, a random one if None.
+        The same seed and the same player actions replay the same game.
     """
 
     min_players = 2
     max_players = 8
     max_cards = 6
+    use_card_pool = True
     Status = Union[str, Dict[str, Any]]
 
-    def __init__(self) -> None:
+    def __init__(self, seed: Union[None, int] = None) -> None:
+        #: Seed of the game's random number generator.
+        self.seed: int = seed if seed is not None else Random().getrandbits(32)
+
+        #: The game's random number generator, shuffling the decks and choosing the first turns.
+        self.rng: Random = Random(self.seed)
+
         #: The dictionary with ID as a key and corresponding Player object as value.
         self.players: Dict[int: Player] = {}
 
+        #: IDs of the players by their seat, which is their index in :attr:`players`.
+        self.seats: List[int] = []
+
+        #: The dictionary with ID as a key and the player's seat as value.
+        self.seat_of: Dict[int, int] = {}
+
+        #: Number of players who did not lose.
+        self.active_count: int = 0
+
+        #: Number of players who did not lose and are ready.
+        self.ready_count: int = 0
+
+        #: The dictionary with ID as a key and the index of the player in the
+        #: shared list of players who did not lose as value, built with the shared status.
+        self.active_indices: Dict[int, int] = {}
+
         #: The list of all players' cards in current turn.
         self.cards_in_use: List[Card] = []
 
+        #: All players' cards in current turn, for checking the claims.
+        self.card_pool: CardPool = CardPool([])
+
         #: Current turn
         self.turn: int = 0
 
@@ -32,17 +65,29 @@ class BluffGame:
         self.win: bool = False
 
         #: The deck of the cards.
-        self.deck: Deck = Deck()
+        self.deck: Deck = Deck(self.rng)
 
         #: List of done moves in current turn.
         self.moves: List[Tuple[str, List[str]]] = []
 
+        #: Ranks of the moves in :attr:`moves`, see :func:`claim_rank`.
+        self.move_ranks: List[int] = []
+
         #: Boolean value representing if any player has checked the last move.
         self.checked: bool = False
 
         #: Player who checked, who was checked, who gets the card, Eliminated?
         self.check_result: List[str, str, str, bool] = ["", "", "", False]
 
+        #: Version of the game state, increased on every change.
+        self.version: int = 0
+
+        #: Cached part of the game state shared by all players, see :meth:`get_shared_status`.
+        self.shared_status: Dict[str, Any] = {}
+
+        #: Version of the game state the shared status was built for.
+        self.shared_status_version: int = -1
+
     def is_full(self) -> bool:
         """Check if the game is full.
 
@@ -56,27 +101,33 @@ class BluffGame:
         self.has_started = True
         self.deck.shuffle()
         self.deal_cards()
+        self.version += 1
 
     def reset_turn(self) -> None:
         """Reset the game state in order to start a new turn.
         """
         self.cards_in_use = []
+        self.card_pool = CardPool([])
         self.has_started = False
-        self.deck = Deck()
+        self.deck = Deck(self.rng)
         self.moves = []
+        self.move_ranks = []
         self.checked = False
         self.win = False
         self.empty_hands()
         for player in self.players.values():
             player.ready = False
+        self.ready_count = 0
+        self.version += 1
 
     def reset_game(self) -> None:
         """Reset the game in order to start new game
         """
-        self.turn = randint(0, self.all_players_num() - 1)
+        self.turn = self.rng.randint(0, self.all_players_num() - 1)
         for player in self.players.values():
             player.lost = False
             player.cards = 1
+        self.active_count = len(self.players)
 
         self.reset_turn()
 
@@ -86,10 +137,11 @@ class BluffGame:
         for player in self.players.values():
 
             if player.cards != len(player.hand):
-                for cards in range(player.cards):
-                    card = self.deck.pop_card()
-                    self.cards_in_use.append(card)
-                    player.give_card(card)
+                cards = self.deck.deal(player.cards)
+                self.cards_in_use += cards
+                player.hand += cards
+
+        self.card_pool = CardPool(self.cards_in_use)
 
     def add_player(self, player_id: int) -> None:
         """Add a player to the game.
@@ -99,6 +151,10 @@ class BluffGame:
 
         player = Player(player_id)
         self.players[player_id] = player
+        self.seat_of[player_id] = len(self.seats)
+        self.seats.append(player_id)
+        self.active_count += 1
+        self.version += 1
 
     def remove_player(self, player_id: int) -> None:
         """Remove a player from the game.
@@ -106,7 +162,29 @@ class BluffGame:
         :param player_id: The unique ID of the player.
         """
 
-        del self.players[player_id]
+        index = self.seat_of.pop(player_id)
+        player = self.players.pop(player_id)
+        del self.seats[index]
+        for seat in range(index, len(self.seats)):
+            self.seat_of[self.seats[seat]] = seat
+
+        if not player.lost:
+            self.active_count -= 1
+            self.ready_count -= player.ready
+
+        if index < self.turn:
+            self.turn -= 1
+        if self.players:
+            self.turn %= len(self.players)
+            # The turn passes from the removed player to the next seat which has not lost.
+            while self.active_count and self.players[self.seats[self.turn]].lost:
+                self.turn = (self.turn + 1) % len(self.seats)
+        self.version += 1
+
+        if self.has_started and not self.win and self.active_count == 1:
+            self.win = next(player.name for player in self.players.values() if not player.lost)
+
+        self.start_if_ready()
 
     def empty_hands(self) -> None:
         """Empty the hands of all players.
@@ -121,13 +199,7 @@ class BluffGame:
         :return: Number of ready players
         """
 
-        ready = 0
-
-        for player in self.players.values():
-            if not player.lost and player.ready:
-                ready += 1
-
-        return ready
+        return self.ready_count
 
     def players_are_ready(self) -> bool:
         """Check if all the active players are ready.
@@ -136,6 +208,33 @@ class BluffGame:
         """
         return self.ready_players() == self.active_players_num() and self.ready_players() >= self.min_players
 
+    def set_ready(self, player: Player, ready: bool) -> None:
+        """Set if the player is ready to start the game or the next turn.
+
+        :param player: The player.
+        :param ready: True if the player is ready, False otherwise.
+        """
+
+        if player.ready != ready:
+            player.ready = ready
+            if not player.lost:
+                self.ready_count += 1 if ready else -1
+            self.version += 1
+
+    def start_if_ready(self) -> None:
+        """Start the game, or the next turn after a check, once all active players are ready.
+        """
+        if not self.players_are_ready():
+            return
+
+        if not self.has_started:
+            self.reset_game()
+            self.start()
+
+        elif self.checked and not self.win:
+            self.reset_turn()
+            self.start()
+
     def player_make_action(self, player_id: int, action: str) -> Status:
         """Handle the move/action from the player in the game.
 
@@ -144,6 +243,17 @@ class BluffGame:
         :return: Current game state after player action/move
         """
 
+        self.handle_action(player_id, action)
+        return self.get_game_status(self.players[player_id])
+
+    def handle_action(self, player_id: int, action: str) -> None:
+        """Handle the move/action from the player in the game, without building
+        the game state, e.g. for bots and simulations.
+
+        :param player_id: The unique ID of the player.
+        :param action: The action/move by the player.
+        """
+
         player_index: int = self.player_index_by_id(player_id)
         current_player: Player = self.players[player_id]
 
@@ -151,7 +261,7 @@ class BluffGame:
             if action == "Start":
                 self.reset_game()
 
-            return self.get_game_status(current_player)
+            return
 
         elif isinstance(action, str) and action.startswith("name"):
             name = action.split()[1]
@@ -161,44 +271,37 @@ class BluffGame:
             if duplicated_name > 0:
                 name += str(duplicated_name)
             current_player.name = action.split()[1]
+            self.version += 1
 
         elif not self.has_started:
-            if self.players_are_ready():
-                self.reset_game()
-                self.start()
-
-            else:
-                if action == "Start":
-                    current_player.ready = True
+            if action == "Start":
+                self.set_ready(current_player, True)
 
-                elif action == "Wait":
-                    current_player.ready = False
+            elif action == "Wait":
+                self.set_ready(current_player, False)
 
-            return self.get_game_status(current_player)
+            self.start_if_ready()
+            return
 
         elif current_player.lost:
             pass
 
         elif self.checked:
-            if self.players_are_ready():
-                if not self.win:
-                    self.reset_turn()
-                    self.start()
-
-            elif action == "Start":
-                current_player.ready = True
+            if action == "Start":
+                self.set_ready(current_player, True)
 
             elif action == "Wait":
-                current_player.ready = False
+                self.set_ready(current_player, False)
 
-            return self.get_game_status(current_player)
+            self.start_if_ready()
+            return
 
         elif action == "check":
             if len(self.moves) < 1:
                 pass
             else:
                 self.handle_check(current_player)
-                return self.get_game_status(current_player)
+                return
 
         elif player_index is not self.turn:
             pass
@@ -213,15 +316,15 @@ class BluffGame:
 
                 if self.can_be_played(move):
                     self.moves.append((current_player.name, move))
+                    self.move_ranks.append(claim_rank(move))
                     self.next_turn()
+                    self.version += 1
         except:
             pass
 
         else:
             pass
 
-        return self.get_game_status(current_player)
-
     def can_be_played(self, move: List[str]) -> bool:
         """Check if the move has higher hierarchy than last move in the game.
 
@@ -229,15 +332,15 @@ class BluffGame:
         :return: True if move can be played, False otherwise.
         """
 
-        if not self.moves:
-            return True
+        rank = claim_rank(move)
 
-        last_move = self.moves[-1][1]
-        last_move = self.parse_move(last_move)
+        if rank is None:
+            return False
 
-        current_move = self.parse_move(move)
+        if not self.move_ranks:
+            return True
 
-        return last_move < current_move
+        return self.move_ranks[-1] < rank
 
     def handle_check(self, checking_player: Player) -> None:
         """Handle check action in the game.
@@ -248,12 +351,9 @@ class BluffGame:
         i = 1
 
         while True:
-            player_being_checked = self.players[self.player_index_to_id(
-                (self.turn - i) % self.all_players_num())]
+            player_being_checked = self.players[self.seats[(self.turn - i) % len(self.seats)]]
 
             if not player_being_checked.lost:
-                player_being_checked = self.players[self.player_index_to_id(
-                    (self.turn - i) % self.all_players_num())]
                 break
             else:
                 i += 1
@@ -271,16 +371,17 @@ class BluffGame:
         self.check_result = [checking_player.name, player_being_checked.name,
                              who_gets_card.name, eliminated]
 
-        self.turn = self.player_index_by_player(who_gets_card)
+        self.turn = self.seat_of[who_gets_card.id]
         self.checked = True
+        self.version += 1
 
         if eliminated:
             who_gets_card.lost = True
             who_gets_card.cards = 0
+            self.active_count -= 1
+            self.ready_count -= who_gets_card.ready
             self.next_turn()
 
-        self.player_index_by_player(who_gets_card)
-
     def get_game_status(self, current_player: Player) -> Status:
         """Get current state of the game
 
@@ -288,29 +389,69 @@ class BluffGame:
         :return: The current state of the game.
         """
 
-        game_status = {}
-        game_status["start"] = self.has_started
-        game_status["lost"] = current_player.lost
-        game_status["hand"] = current_player.hand
-        game_status["win"] = self.win
-        game_status["moves"] = self.moves
-        game_status["check_result"] = self.check_result
-        game_status["checked"] = self.cards_in_use if self.checked else []
-        game_status[
-            "ready"] = f"Waiting for players {self.ready_players()}/{self.active_players_num()}"
-        game_status["players"] = [
-            (p.name, p.cards) if p is not current_player and not p.lost
-            else ("You: " + p.name, p.cards) for p in self.players.values() if
-            not p.lost]
-        game_status["is_turn"] = (
-                    self.turn == self.player_index_by_player(current_player)) \
-            if not current_player.lost else False
-        game_status["turn"] = [player.name for player in self.players.values()
-                               if self.player_index_by_player(
-                player) == self.turn][0]
+        player_status = self.get_player_status(current_player)
+        you = player_status.pop("you")
+
+        game_status = {**self.get_shared_status(), **player_status}
+        game_status["players"] = list(game_status["players"])
+        if you is not None:
+            name, cards = game_status["players"][you]
+            game_status["players"][you] = ("You: " + name, cards)
 
         return game_status
 
+    def get_shared_status(self) -> Dict[str, Any]:
+        """Get the part of the game state which is the same for every player.
+
+        It is built once per version of the game state, and must not be modified.
+
+        :return: The state of the game, without the players' own fields.
+        """
+
+        if self.shared_status_version == self.version:
+            return self.shared_status
+
+        shared_status = {}
+        shared_status["version"] = self.version
+        shared_status["start"] = self.has_started
+        shared_status["win"] = self.win
+        shared_status["moves"] = self.moves
+        shared_status["check_result"] = self.check_result
+        shared_status["checked"] = self.cards_in_use if self.checked else []
+        shared_status["ready_players"] = self.ready_players()
+        shared_status["active_players"] = self.active_players_num()
+        shared_status["ready"] = READY_TEXT.format(shared_status["ready_players"], shared_status["active_players"])
+        active_players = [p for p in self.players.values() if not p.lost]
+        shared_status["players"] = [(p.name, p.cards) for p in active_players]
+        shared_status["turn"] = self.players[self.seats[self.turn]].name
+
+        self.active_indices = {p.id: index for index, p in enumerate(active_players)}
+
+        self.shared_status = shared_status
+        self.shared_status_version = self.version
+        return shared_status
+
+    def get_player_status(self, current_player: Player) -> Dict[str, Any]:
+        """Get the part of the game state which is specific to the player.
+
+        :param current_player: The player who will receive the game state.
+        :return: The player's hand, if the player lost, if it is the player's
+            turn, and the player's index in the shared list of players
+            (None if the player lost).
+        """
+
+        self.get_shared_status()
+
+        player_status = {}
+        player_status["lost"] = current_player.lost
+        player_status["hand"] = current_player.hand
+        player_status["is_turn"] = (
+                    self.turn == self.seat_of[current_player.id]) \
+            if not current_player.lost else False
+        player_status["you"] = None if current_player.lost else self.active_indices[current_player.id]
+
+        return player_status
+
     def player_index_by_player(self, player: Player) -> int:
         """Get player's index by Player object.
 
@@ -318,9 +459,7 @@ class BluffGame:
         :return: The index of the player in list of players.
         """
 
-        for index, name in enumerate(self.players.values()):
-            if name is player:
-                return index
+        return self.seat_of.get(player.id)
 
     def player_index_by_id(self, player_id: int) -> int:
         """Get the player's index by the player's unique ID.
@@ -329,9 +468,7 @@ class BluffGame:
         :return: The index of the player in list of players.
         """
 
-        for index, id in enumerate(self.players.keys()):
-            if id == player_id:
-                return index
+        return self.seat_of.get(player_id)
 
     def player_index_to_id(self, index: int) -> int:
         """Get the player's unique ID by the index.
@@ -340,25 +477,21 @@ class BluffGame:
         :return: The unique ID of the player.
         """
 
-        for cur_index, player in enumerate(self.players.keys()):
-            if cur_index == index:
-                return player
+        if 0 <= index < len(self.seats):
+            return self.seats[index]
 
     def next_turn(self) -> None:
         """Increment the current turn and update game state.
         """
-        active_players = [player.name for player in self.players.values() if
-                          not player.lost]
-        if len(active_players) == 1:
-            self.win = active_players[0]
+        if self.active_count == 1:
+            self.win = next(player.name for player in self.players.values() if not player.lost)
 
             return
 
         while True:
-            self.turn = (self.turn + 1) % self.all_players_num()
-            current_player = self.player_index_to_id(self.turn)
+            self.turn = (self.turn + 1) % len(self.seats)
 
-            if not self.players[current_player].lost:
+            if not self.players[self.seats[self.turn]].lost:
                 break
 
     def all_players_num(self) -> int:
@@ -373,8 +506,7 @@ class BluffGame:
 
         :return: The number of active players in the game.
         """
-        return len(
-            [player.id for player in self.players.values() if not player.lost])
+        return self.active_count
 
     def check(self, mv: Hand) -> bool:
         """Check if the move is in the list of all players cards.
@@ -383,17 +515,20 @@ class BluffGame:
         :return: True if move is present in all player cards, False otherwise.
         """
 
+        if self.use_card_pool:
+            return self.card_pool.check(mv)
+
         mv_rank = mv.hierarchy_rank()
         cards = self.cards_in_use
 
         if mv_rank == 0:  # HighCard
-            res = Card.high_card(cards, Card(mv.value))
+            res = Card.high_card(cards, Card.of(mv.value))
 
         elif mv_rank == 1:  # Pair
-            res = Card.pair(cards, Card(mv.value))
+            res = Card.pair(cards, Card.of(mv.value))
 
         elif mv_rank == 2:  # TwoPairs
-            res = Card.two_pair(cards, Card(mv.value1), Card(mv.value2))
+            res = Card.two_pair(cards, Card.of(mv.value1), Card.of(mv.value2))
 
         elif mv_rank == 3:  # Straight
             if mv.small:  # Small Straight
@@ -402,7 +537,7 @@ class BluffGame:
                 res = Card.big_straight(cards)
 
         elif mv_rank == 4:  # ThreeOfKind
-            res = Card.three(cards, Card(mv.value))
+            res = Card.three(cards, Card.of(mv.value))
 
         elif mv_rank == 5:  # Flush
             res = Card.flush(cards, mv.color)
@@ -411,7 +546,7 @@ class BluffGame:
             res = Card.full(cards, mv.value_of_three, mv.value_of_two)
 
         elif mv_rank == 7:  # FourOfKind
-            res = Card.four(cards, Card(mv.value))
+            res = Card.four(cards, Card.of(mv.value))
 
         elif mv_rank == 8:  # Poker
             if mv.small:  # Small
@@ -1,6 +1,12 @@
+from typing import Dict, List, Tuple, Union
+from bisect import bisect_left, bisect_right
+
+
 class Hand:
     """Representation of the poker hand."""
 
+    __slots__ = ()
+
     value, value1, value2, color, value_of_two, value_of_three, small = 0, 0, 0, 0, 0, 0, 0
 
     @staticmethod
@@ -93,6 +99,8 @@ class HighCard(Hand):
     :param value: The value of the card.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         self.value = self.parse(value)
 
@@ -110,6 +118,8 @@ class Pair(Hand):
     :param value: The value of the card.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         self.value = self.parse(value)
 
@@ -128,6 +138,8 @@ class TwoPairs(Hand):
     :param value2: The value of the second pair.
     """
 
+    __slots__ = ("value1", "value2")
+
     def __init__(self, value1: str, value2: str) -> None:
         self.value1 = self.parse(value1)
         self.value2 = self.parse(value2)
@@ -146,6 +158,8 @@ class Straight(Hand):
     :param small: True if the straight is small, False if it's big.
     """
 
+    __slots__ = ("small",)
+
     def __init__(self, small: bool = True) -> None:
         self.small = small
 
@@ -163,6 +177,8 @@ class ThreeOfKind(Hand):
     :param value: The value of the card.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         self.value = self.parse(value)
 
@@ -180,6 +196,8 @@ class Flush(Hand):
     :param color: The color of the flush.
     """
 
+    __slots__ = ("color",)
+
     def __init__(self, color: str) -> None:
         self.color = color
 
@@ -198,6 +216,8 @@ class FullHouse(Hand):
     :param value_of_two: The value of the pair.
     """
 
+    __slots__ = ("value_of_three", "value_of_two")
+
     def __init__(self, value_of_three: str, value_of_two: str) -> None:
         self.value_of_three = self.parse(value_of_three)
         self.value_of_two = self.parse(value_of_two)
@@ -216,6 +236,8 @@ class FourOfKind(Hand):
     :param value: The value of the card.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         self.value = self.parse(value)
 
@@ -234,6 +256,8 @@ class Poker(Hand):
     :param small: True if the poker is small, False if it's big.
     """
 
+    __slots__ = ("color", "small")
+
     def __init__(self, color: str, small: bool = True) -> None:
         self.color = color
         self.small = small
@@ -244,3 +268,181 @@ class Poker(Hand):
         :return: The hierarchy rank.
         """
         return 8
+
+
+#: Card values which can be claimed, from the lowest.
+CLAIM_VALUES: List[str] = [str(i) for i in range(2, 11)] + ["Jack", "Queen", "King", "Ace"]
+
+#: Colors which can be claimed, from the lowest.
+CLAIM_COLORS: List[str] = ["Clubs", "Diamonds", "Hearts", "Spades"]
+
+
+def create_claims() -> List[Tuple[str, ...]]:
+    """Create the list of all legal claims, from the lowest to the highest.
+
+    Claims of the same hand are ordered like :meth:`Hand.__lt__` orders them.
+    Two pairs have no order there when their lower pairs are equal, so they
+    are ordered by the lower pair, then by the higher pair. Two pairs and full
+    houses must name two different values.
+
+    :return: List of claims, each as the hand name followed by its arguments.
+    """
+
+    values = CLAIM_VALUES
+    claims = [("HighCard", value) for value in values]
+    claims += [("Pair", value) for value in values]
+    claims += [("TwoPairs", low, high) for i, low in enumerate(values) for high in values[i + 1:]]
+    claims += [("SmallStraight",), ("BigStraight",)]
+    claims += [("ThreeOfKind", value) for value in values]
+    claims += [("Flush", color) for color in CLAIM_COLORS]
+    claims += [("FullHouse", three, two) for three in values for two in values if two != three]
+    claims += [("FourOfKind", value) for value in values]
+    claims += [("SmallPoker", color) for color in CLAIM_COLORS]
+    claims += [("BigPoker", color) for color in CLAIM_COLORS]
+    return claims
+
+
+#: All legal claims, the index is the claim's rank.
+CLAIMS: List[Tuple[str, ...]] = create_claims()
+
+#: Rank of every legal claim, two pairs under both orders of their values.
+CLAIM_RANKS: Dict[Tuple[str, ...], int] = {}
+for claim_index, claim_words in enumerate(CLAIMS):
+    CLAIM_RANKS[claim_words] = claim_index
+    if claim_words[0] == "TwoPairs":
+        CLAIM_RANKS[(claim_words[0], claim_words[2], claim_words[1])] = claim_index
+
+#: Claimed values by their lowercase names, values can be written in any case.
+CLAIM_VALUE_NAMES: Dict[str, str] = {value.lower(): value for value in CLAIM_VALUES}
+
+#: Number of arguments of the hands with other than one argument.
+CLAIM_ARGUMENTS: Dict[str, int] = {"TwoPairs": 2, "FullHouse": 2, "SmallStraight": 0, "BigStraight": 0}
+
+
+def claim_rank(move: List[str]) -> Union[None, int]:
+    """Get the rank of a claim in the order of all legal claims.
+
+    A claim is higher than another if its rank is greater.
+
+    :param move: move[0] represents the Hand, the rest are cards values/colors
+    :return: The rank, None if the move is not a legal claim.
+    """
+
+    rank = CLAIM_RANKS.get(tuple(move))
+    if rank is not None or not move:
+        return rank
+
+    # Values written in another case, or words after the arguments.
+    arguments_num = CLAIM_ARGUMENTS.get(move[0], 1)
+    claim = [move[0]] + [CLAIM_VALUE_NAMES.get(argument.lower(), argument)
+                         for argument in move[1:arguments_num + 1]]
+    return CLAIM_RANKS.get(tuple(claim))
+
+
+#: Names of the hands, from the lowest.
+HAND_NAMES: List[str] = list(dict.fromkeys(claim[0] for claim in CLAIMS))
+
+#: Index of every hand in :data:`HAND_NAMES`, by its name.
+HAND_INDICES: Dict[str, int] = {hand: index for index, hand in enumerate(HAND_NAMES)}
+
+#: Index of every claimed value in :data:`CLAIM_VALUES`, by its lowercase name.
+VALUE_INDICES: Dict[str, int] = {value.lower(): index for index, value in enumerate(CLAIM_VALUES)}
+
+#: Index of every color in :data:`CLAIM_COLORS`, by its lowercase name.
+COLOR_INDICES: Dict[str, int] = {color.lower(): index for index, color in enumerate(CLAIM_COLORS)}
+
+#: Hands claimed with a color instead of values.
+COLOR_HANDS = ("Flush", "SmallPoker", "BigPoker")
+
+
+def claim_key(move: List[str]) -> Union[None, Tuple[int, ...]]:
+    """Get the sort key of a claim, :data:`CLAIMS` is sorted by it.
+
+    The key is the index of the hand followed by the indices of its values or
+    color, the values of two pairs from the lower. Moves which are not legal
+    claims get a key too if their words are known, e.g. a full house of one value.
+
+    :param move: move[0] represents the Hand, the rest are cards values/colors
+    :return: The key, None if the move has an unknown hand or argument.
+    """
+
+    if not move or move[0] not in HAND_INDICES:
+        return None
+
+    arguments_num = CLAIM_ARGUMENTS.get(move[0], 1)
+    indices = COLOR_INDICES if move[0] in COLOR_HANDS else VALUE_INDICES
+    arguments = [indices.get(argument.lower()) for argument in move[1:arguments_num + 1]]
+    if len(arguments) < arguments_num or None in arguments:
+        return None
+
+    if move[0] == "TwoPairs":
+        arguments.sort()
+    return (HAND_INDICES[move[0]], *arguments)
+
+
+#: Sort keys of the claims in :data:`CLAIMS`, sorted like the claims.
+CLAIM_KEYS: List[Tuple[int, ...]] = [claim_key(list(claim)) for claim in CLAIMS]
+
+
+def legal_ranks(last_move: Union[None, List[str]] = None, hand: Union[None, str] = None) -> range:
+    """Get the ranks of the claims higher than the last move, found by
+    bisection of :data:`CLAIM_KEYS`.
+
+    :param last_move: The last move of the turn, None if there was no move.
+    :param hand: Name of the hand of the claims, any hand if None.
+    :return: The ranks, in the order of :data:`CLAIMS`.
+    :raises ValueError: If the last move is not a claim.
+    """
+
+    start = 0
+    if last_move:
+        key = claim_key(last_move)
+        if key is None:
+            raise ValueError(f"{' '.join(last_move)!r} is not a claim")
+        start = bisect_right(CLAIM_KEYS, key)
+
+    if hand is None:
+        return range(start, len(CLAIMS))
+
+    index = HAND_INDICES[hand]
+    return range(max(start, bisect_left(CLAIM_KEYS, (index,))), bisect_left(CLAIM_KEYS, (index + 1,)))
+
+
+def legal_claims(last_move: Union[None, List[str]] = None,
+                 hand: Union[None, str] = None) -> List[Tuple[str, ...]]:
+    """Get the claims higher than the last move, see :func:`legal_ranks`.
+
+    :param last_move: The last move of the turn, None if there was no move.
+    :param hand: Name of the hand of the claims, any hand if None.
+    :return: The claims, from the lowest.
+    """
+
+    ranks = legal_ranks(last_move, hand)
+    return CLAIMS[ranks.start:ranks.stop]
+
+
+def legal_hands(last_move: Union[None, List[str]] = None) -> List[str]:
+    """Get the hands with a claim higher than the last move.
+
+    :param last_move: The last move of the turn, None if there was no move.
+    :return: Names of the hands, from the lowest.
+    """
+
+    start = legal_ranks(last_move).start
+    if start == len(CLAIMS):
+        return []
+    return HAND_NAMES[HAND_INDICES[CLAIMS[start][0]]:]
+
+
+def legal_arguments(last_move: Union[None, List[str]], chosen: List[str]) -> List[str]:
+    """Get the choices of the next word of a claim higher than the last move.
+
+    :param last_move: The last move of the turn, None if there was no move.
+    :param chosen: The hand and the values or color chosen so far, the values of two pairs from the lower.
+    :return: The values or colors completing a higher claim, from the lowest.
+    """
+
+    position = len(chosen)
+    choices = [claim[position] for claim in legal_claims(last_move, chosen[0])
+               if len(claim) > position and list(claim[1:position]) == chosen[1:]]
+    return list(dict.fromkeys(choices))
@@ -0,0 +1,240 @@
+from typing import Dict, List, Tuple, Union
+from random import Random
+import math
+import time
+from game.card import Card
+from game.card_pool import CardPool
+from game.hands import CLAIMS
+from game.state import CHECK, GameState
+
+
+#: Number of the next claims above the last one searched, and of the claims
+#: present in the player's own cards searched above them.
+WIDTH = 5
+
+#: Exploration constant of the UCB selection.
+EXPLORATION = 0.7
+
+#: Probability of a raise in the rollouts, instead of an honest claim or a check.
+BLUFF = 0.2
+
+#: Highest raise of a bluff in the rollouts, in claims.
+MAX_BLUFF_RAISE = 3
+
+#: Probability of keeping a deal for each claim of another seat in the
+#: turn which is not present in it, the other seats rarely bluff.
+BLUFF_WEIGHT = 0.1
+
+#: Most deals tried for an iteration, the last one is kept.
+DEAL_ATTEMPTS = 20
+
+
+class Node:
+    """Node of the search tree, reached by an action from its parent.
+
+    The tree is shared by all determinizations, so a node is not always
+    reachable: :attr:`available` counts the iterations where it was.
+    """
+
+    __slots__ = ("children", "visits", "reward", "available")
+
+    def __init__(self) -> None:
+        #: Dictionary with action as key and the node it leads to as value.
+        self.children: Dict[int, Node] = {}
+
+        #: Number of iterations through the node.
+        self.visits: int = 0
+
+        #: Sum of the rewards of the player who made the action, over the iterations.
+        self.reward: float = 0.0
+
+        #: Number of iterations where the action was among the searched ones.
+        self.available: int = 0
+
+    def select(self, actions: List[int], exploration: float) -> int:
+        """Choose the action with the highest upper confidence bound.
+
+        :param actions: Searched actions, all with a child.
+        :param exploration: Exploration constant.
+        :return: The action.
+        """
+
+        best, best_bound = actions[0], -1.0
+        for action in actions:
+            child = self.children[action]
+            bound = child.reward / child.visits + exploration * math.sqrt(math.log(child.available) / child.visits)
+            if bound > best_bound:
+                best, best_bound = action, bound
+        return best
+
+
+def own_claims(state: GameState, seat: int) -> int:
+    """Evaluate every claim against a seat's own cards.
+
+    :param state: The state.
+    :param seat: The seat.
+    :return: Mask of the claims present, bit n is the claim of rank n.
+    """
+
+    return CardPool([Card.interned[code] for code in state.hand(seat)]).claims_present()
+
+
+def deal_unknown_cards(state: GameState, seat: int, rng: Random) -> GameState:
+    """Deal the cards the seat cannot see, likely to match the claims of the other seats.
+
+    Deals are drawn at random, and every claim of another seat in the turn
+    which is not present in the deal keeps it only with the probability
+    :data:`BLUFF_WEIGHT`.
+
+    :param state: The state the seat knows.
+    :param seat: The searching seat.
+    :param rng: Random number generator of the deals.
+    :return: A copy of the state with all hands dealt.
+    """
+
+    claimers, claimer = [], state.turn
+    for claim in reversed(state.claims):
+        claimer = state.previous_seat(claimer)
+        if claimer != seat:
+            claimers.append(claim)
+
+    for _ in range(DEAL_ATTEMPTS):
+        determinization = state.copy()
+        determinization.determinize(seat, rng)
+        present = determinization.claims_present()
+        weight = 1.0
+        for claim in claimers:
+            if not present >> claim & 1:
+                weight *= BLUFF_WEIGHT
+        if rng.random() < weight:
+            break
+    return determinization
+
+
+def searched_actions(state: GameState, own: int, width: int) -> List[int]:
+    """Get the actions of the player on turn the search considers.
+
+    They are the check, the next claims above the last one, and the lowest
+    claims above those present in the player's own cards.
+
+    :param state: The state.
+    :param own: Mask of the claims present in the cards of the player on turn.
+    :param width: Number of the next claims, and of the claims present in own cards.
+    :return: The actions.
+    """
+
+    last = state.claims[-1] if state.claims else -1
+    actions = [CHECK] if state.claims else []
+    next_claims = min(last + 1 + width, len(CLAIMS))
+    actions.extend(range(last + 1, next_claims))
+
+    higher = own >> next_claims
+    for _ in range(width):
+        if not higher:
+            break
+        lowest = higher & -higher
+        actions.append(next_claims + lowest.bit_length() - 1)
+        higher ^= lowest
+    return actions
+
+
+def rollout(state: GameState, owns: List[int], rng: Random, bluff: float = BLUFF) -> int:
+    """Play the turn to its check with a fast policy.
+
+    A player claims the lowest hand above the last claim present in own
+    cards, and checks when there is none, but raises at random instead with
+    the probability :data:`BLUFF`.
+
+    :param state: The state, changed by the actions.
+    :param owns: Masks of the claims present in the cards of every seat, see :func:`own_claims`.
+    :param rng: Random number generator of the actions.
+    :param bluff: Probability of a random raise.
+    :return: The seat which got a card.
+    """
+
+    while True:
+        last = state.claims[-1] if state.claims else -1
+        higher = owns[state.turn] >> (last + 1)
+
+        if last == len(CLAIMS) - 1:
+            action = CHECK
+        elif rng.random() < bluff or not (higher or state.claims):
+            action = min(last + 1 + rng.randrange(MAX_BLUFF_RAISE), len(CLAIMS) - 1)
+        elif higher:
+            action = last + (higher & -higher).bit_length()
+        else:
+            action = CHECK
+
+        loser = state.play(action)
+        if loser is not None:
+            return loser
+
+
+def search(state: GameState, seat: int, seconds: Union[None, float] = None,
+           iterations: Union[None, int] = None, seed: Union[None, int] = None, width: int = WIDTH,
+           exploration: float = EXPLORATION, bluff: float = BLUFF) -> Tuple[Dict[int, Tuple[int, float]], int]:
+    """Search the seat's action with information set Monte Carlo tree search, e.g. in a worker process.
+
+    Every iteration deals the cards the seat cannot see with
+    :func:`deal_unknown_cards`, descends
+    the tree shared by all deals, and plays the rest of the turn with
+    :func:`rollout`. A turn ends with a check, the seat which gets the card
+    scores 0 and every other seat scores 1.
+
+    :param state: The state the seat knows, see :meth:`GameState.from_status`, with the seat on turn.
+    :param seat: The searching seat.
+    :param seconds: Time budget of the search.
+    :param iterations: Number of iterations, unlimited if None. One of the budgets must be set.
+    :param seed: Seed of the search, a random one if None.
+    :param width: Breadth of the search, see :func:`searched_actions`.
+    :param exploration: Exploration constant of the UCB selection.
+    :param bluff: Probability of a random raise in the rollouts.
+    :return: Dictionary with the seat's action as key, and its visits and
+        mean reward as value, and the number of rollouts.
+    """
+
+    if seconds is None and iterations is None:
+        raise ValueError("The search needs a time budget or a number of iterations")
+
+    rng = Random(seed)
+    root = Node()
+    deadline = time.perf_counter() + seconds if seconds is not None else math.inf
+    rollouts = 0
+
+    while (iterations is None or rollouts < iterations) and (rollouts == 0 or time.perf_counter() < deadline):
+        determinization = deal_unknown_cards(state, seat, rng)
+        owns = [own_claims(determinization, other) for other in range(len(determinization.counts))]
+
+        node, path, loser = root, [], None
+        while loser is None:
+            mover = determinization.turn
+            actions = searched_actions(determinization, owns[mover], width)
+            untried = [action for action in actions if action not in node.children]
+            for action in actions:
+                if action in node.children:
+                    node.children[action].available += 1
+
+            if untried:
+                action = untried[rng.randrange(len(untried))]
+                child = node.children[action] = Node()
+                child.available = 1
+            else:
+                action = node.select(actions, exploration)
+                child = node.children[action]
+
+            path.append((child, mover))
+            loser = determinization.play(action)
+            node = child
+            if untried:
+                break
+
+        if loser is None:
+            loser = rollout(determinization, owns, rng, bluff)
+
+        for node, mover in path:
+            node.visits += 1
+            node.reward += mover != loser
+        rollouts += 1
+
+    return {action: (child.visits, child.reward / child.visits)
+            for action, child in root.children.items() if child.visits}, rollouts
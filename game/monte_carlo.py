@@ -0,0 +1,173 @@
+from typing import List, Tuple, Union
+import time
+import numpy as np
+from game.card import Card
+from game.card_pool import straight_jokers_needed
+from game.hands import CLAIMS
+from game.probability import known_codes, DECK_SIZE
+
+
+#: Codes of all the deck's cards, see :func:`game.codec.card_to_code`.
+DECK_CODES = [0, 0] + list(range(1, 53))
+
+#: Number of card codes, 0 for a joker, 1-52 for other cards.
+CODES_NUM = 53
+
+#: Number of completions sampled at once.
+BATCH_SIZE = 4096
+
+#: Normal quantile of the 95% confidence intervals.
+CONFIDENCE_Z = 1.96
+
+# Lower and higher values of the two pairs, in the claims order.
+TWO_PAIRS_LOW, TWO_PAIRS_HIGH = np.array([(low, high) for low in range(13) for high in range(low + 1, 13)]).T
+
+# Values of the three and the two of the full houses, in the claims order.
+FULL_HOUSES_THREE, FULL_HOUSES_TWO = np.array([(three, two) for three in range(13)
+                                               for two in range(13) if two != three]).T
+
+#: Jokers needed for a small straight by rank mask, built on the first use.
+straight_jokers_table: Union[None, np.ndarray] = None
+
+
+def estimate_claim_probabilities(hand: List[Card], cards_in_play: int, samples: int = 100000,
+                                 seconds: Union[None, float] = None, seed: Union[None, int] = None
+                                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Estimate the probability that each claim is present in the cards in play.
+
+    A Monte Carlo alternative to :func:`game.probability.claim_probabilities`.
+    On the tables of this game it takes about as long as the exact engine
+    with 1000 samples and longer with more, and the exact engine caches its
+    tables, so callers should use the exact engine. The estimator is
+    kept as an independent check of it, and as a fallback for tables outside
+    its model, since its cost does not grow with the number of cards and
+    jokers. Completions of the unknown cards are sampled in batches and every
+    claim is evaluated on the whole batch at once.
+
+    :param hand: The player's cards.
+    :param cards_in_play: Number of all players' cards.
+    :param samples: Number of completions to sample.
+    :param seconds: Time budget, sampling stops at the first batch past it if set.
+    :param seed: Seed of the random generator, a fresh one if None.
+    :return: The estimates and the lower and upper bounds of their 95% Wilson
+        confidence intervals, by the claim rank of :data:`game.hands.CLAIMS`.
+    """
+
+    known = known_codes(hand)
+    unknown = cards_in_play - len(known)
+    remaining = DECK_SIZE - len(known)
+    if not 0 <= unknown <= remaining:
+        raise ValueError(f"{unknown} unknown cards do not fit in the {remaining} remaining ones")
+
+    rest = list(DECK_CODES)
+    for code in known:
+        rest.remove(code)
+    rest = np.array(rest, dtype=np.intp)
+    known_histogram = np.bincount(np.array(known, dtype=np.intp), minlength=CODES_NUM)
+
+    rng = np.random.default_rng(seed)
+    deadline = None if seconds is None else time.perf_counter() + seconds
+    hits = np.zeros(len(CLAIMS), dtype=np.int64)
+    sampled = 0
+
+    while sampled < samples and (deadline is None or time.perf_counter() < deadline):
+        batch = min(BATCH_SIZE, samples - sampled)
+        # The first unknown of the randomly ordered remaining cards of every row are drawn.
+        keys = rng.random((batch, remaining), dtype=np.float32)
+        drawn = rest[np.argpartition(keys, unknown - 1, axis=1)[:, :unknown]] if unknown else rest[:0][None]
+        rows = np.arange(batch)[:, None] * CODES_NUM
+        histograms = np.bincount((drawn + rows).ravel(), minlength=batch * CODES_NUM).reshape(batch, CODES_NUM)
+        hits += np.count_nonzero(evaluate_claims(histograms + known_histogram), axis=0)
+        sampled += batch
+
+    return wilson_interval(hits, sampled)
+
+
+def evaluate_claims(histograms: np.ndarray) -> np.ndarray:
+    """Evaluate every claim against many card pools at once, like
+    :meth:`game.card_pool.CardPool.claims_present`.
+
+    :param histograms: Numbers of cards of each code, one pool per row.
+    :return: Boolean array, row n column m is True if claim of rank m is present in pool n.
+    """
+
+    histograms = histograms.astype(np.int8)
+    jokers = histograms[:, :1]
+    # Colors are the last axis, the sums over it are spelled out, numpy reduces short axes slowly.
+    cards = histograms[:, 1:].reshape(-1, 13, 4)
+    ranks = cards[:, :, 0] + cards[:, :, 1] + cards[:, :, 2] + cards[:, :, 3]
+    counts = ranks + jokers
+    colors = jokers + cards[:, 0]
+    for value in range(1, 13):
+        colors += cards[:, value]
+    rank_mask = rank_masks(ranks > 0, 1)
+    color_masks = rank_masks(cards > 0, 1)
+    pairs, threes = counts >= 2, counts >= 3
+
+    table = straight_jokers()
+    small_straight = table[rank_mask] <= jokers[:, 0]
+    big_straight = np.count_nonzero(ranks[:, 8:], axis=1) + jokers[:, 0] >= 5
+    big_pokers = (color_masks >> 8 & 1) + (color_masks >> 9 & 1) + (color_masks >> 10 & 1) \
+        + (color_masks >> 11 & 1) + (color_masks >> 12 & 1) + jokers >= 5
+
+    # The blocks follow the claims order of :data:`game.hands.CLAIMS`.
+    present = np.concatenate([
+        counts >= 1,
+        pairs,
+        pairs[:, TWO_PAIRS_LOW] & pairs[:, TWO_PAIRS_HIGH],
+        small_straight[:, None],
+        big_straight[:, None],
+        threes,
+        colors >= 5,
+        threes[:, FULL_HOUSES_THREE] & pairs[:, FULL_HOUSES_TWO],
+        counts >= 4,
+        table[color_masks] <= jokers,
+        big_pokers,
+    ], axis=1)
+    return present
+
+
+def rank_masks(present: np.ndarray, axis: int) -> np.ndarray:
+    """Pack the values present into rank masks.
+
+    :param present: Boolean array.
+    :param axis: The axis of the 13 values from 2 to Ace.
+    :return: The masks, bit 0 is 2, bit 12 is Ace, without the values axis.
+    """
+
+    low, high = np.moveaxis(np.packbits(present, axis=axis, bitorder="little"), axis, 0)
+    return low | high.astype(np.intp) << 8
+
+
+def straight_jokers() -> np.ndarray:
+    """Get the table of :func:`game.card_pool.straight_jokers_needed` for all rank masks.
+
+    :return: Jokers needed by rank mask.
+    """
+
+    global straight_jokers_table
+    if straight_jokers_table is None:
+        straight_jokers_table = np.array([straight_jokers_needed(mask) for mask in range(1 << 13)])
+    return straight_jokers_table
+
+
+def wilson_interval(hits: np.ndarray, samples: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the estimates with their 95% Wilson confidence intervals.
+
+    :param hits: Number of samples with each claim present.
+    :param samples: Number of samples.
+    :return: The estimates, the lower bounds and the upper bounds.
+    """
+
+    if samples == 0:
+        raise ValueError("No sample was drawn")
+
+    estimates = hits / samples
+    z2 = CONFIDENCE_Z ** 2
+    center = (estimates + z2 / (2 * samples)) / (1 + z2 / samples)
+    half_width = CONFIDENCE_Z * np.sqrt(estimates * (1 - estimates) / samples + z2 / (4 * samples ** 2)) \
+        / (1 + z2 / samples)
+    # The bounds are exactly 0 and 1 without hits or without misses, not off by a rounding error.
+    lower = np.where(hits == 0, 0.0, center - half_width)
+    upper = np.where(hits == samples, 1.0, center + half_width)
+    return estimates, lower, upper
@@ -8,6 +8,8 @@ class Player:
     :param id: The player's ID.
     """
 
+    __slots__ = ("id", "name", "cards", "hand", "lost", "ready")
+
     def __init__(self, id: int) -> None:
         #: The player's ID.
         self.id: int = id
@@ -0,0 +1,341 @@
+from typing import Dict, List, Tuple
+from functools import lru_cache
+from math import comb
+from game.card import Card
+from game.card_pool import straight_jokers_needed, HIGH_RANKS, COLOR_NUMBERS, LOWEST_VALUE
+from game.codec import card_to_code
+from game.hands import CLAIMS, CLAIM_VALUES
+
+
+#: Number of cards in the deck.
+DECK_SIZE = 54
+
+#: Number of jokers in the deck.
+JOKERS = 2
+
+#: Mask of all 13 card values, bit 0 is 2, bit 12 is Ace.
+ALL_RANKS = (1 << 13) - 1
+
+#: Card values of the claimed values, e.g. "Jack".
+VALUE_NUMBERS = {name: LOWEST_VALUE + number for number, name in enumerate(CLAIM_VALUES)}
+
+#: Hands of a color.
+COLOR_HANDS = ("Flush", "SmallPoker", "BigPoker")
+
+#: Number of cards of the value needed by the hands of one value.
+VALUE_HANDS_NEEDED: Dict[str, int] = {"HighCard": 1, "Pair": 2, "ThreeOfKind": 3, "FourOfKind": 4}
+
+#: Maximal number of results kept by every cache of the module.
+CACHE_SIZE = 1 << 16
+
+
+def claim_probabilities(hand: List[Card], cards_in_play: int) -> List[float]:
+    """Get the probability that each claim is present in the cards in play.
+
+    The cards of the other players are treated as drawn at random from the
+    rest of the deck. Jokers count as any card, as in :class:`CardPool`.
+
+    :param hand: The player's cards, e.g. "hand" of the game status.
+    :param cards_in_play: Number of all players' cards, e.g. the sum of the
+        players' card counts of the game status.
+    :return: The probabilities, by the claim rank of :data:`game.hands.CLAIMS`.
+    """
+
+    known = known_codes(hand)
+    return list(table_probabilities(known, cards_in_play - len(known)))
+
+
+def known_codes(hand: List[Card]) -> Tuple[int, ...]:
+    """Get the cache key of the known cards.
+
+    :param hand: The known cards.
+    :return: Sorted codes of the cards, see :func:`game.codec.card_to_code`.
+    """
+
+    return tuple(sorted(card_to_code(card) for card in hand))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def table_probabilities(known: Tuple[int, ...], unknown: int) -> Tuple[float, ...]:
+    """Get the probability that each claim is present in the cards in play.
+
+    :param known: Codes of the known cards, see :func:`known_codes`.
+    :param unknown: Number of the other cards in play, drawn from the rest of the deck.
+    :return: The probabilities, by the claim rank of :data:`game.hands.CLAIMS`.
+    """
+
+    draws = all_draws(known, unknown)
+    return tuple(claim_ways(rank, known, unknown) / draws for rank in range(len(CLAIMS)))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def claim_probability(rank: int, known: Tuple[int, ...], unknown: int) -> float:
+    """Get the probability that a claim is present in the cards in play.
+
+    :param rank: Rank of the claim in :data:`game.hands.CLAIMS`.
+    :param known: Codes of the known cards, see :func:`known_codes`.
+    :param unknown: Number of the other cards in play, drawn from the rest of the deck.
+    :return: The probability.
+    """
+
+    return claim_ways(rank, known, unknown) / all_draws(known, unknown)
+
+
+def all_draws(known: Tuple[int, ...], unknown: int) -> int:
+    """Count all draws of the unknown cards.
+
+    :param known: Codes of the known cards.
+    :param unknown: Number of the other cards in play.
+    :return: Number of the draws.
+    """
+
+    remaining = DECK_SIZE - len(known)
+    if not 0 <= unknown <= remaining:
+        raise ValueError(f"{unknown} unknown cards do not fit in the {remaining} remaining ones")
+    return comb(remaining, unknown)
+
+
+def parse_claim(claim: Tuple[str, ...]) -> Tuple[str, List[int], int]:
+    """Split a claim into its hand, card values and color.
+
+    :param claim: The claim, e.g. ("FullHouse", "Jack", "2").
+    :return: The hand, the card values and the color number, 0 if there is no color.
+    """
+
+    hand, *arguments = claim
+    if hand in COLOR_HANDS:
+        return hand, [], COLOR_NUMBERS[arguments[0].lower()]
+    return hand, [VALUE_NUMBERS[argument] for argument in arguments], 0
+
+
+#: Hand, card values and color number of every claim, by the claim rank, see :func:`parse_claim`.
+PARSED_CLAIMS: List[Tuple[str, List[int], int]] = [parse_claim(claim) for claim in CLAIMS]
+
+
+def claim_ways(rank: int, known: Tuple[int, ...], unknown: int) -> int:
+    """Count the draws of the unknown cards making the claim present.
+
+    The counts depend only on how many cards of the claim are known, so they
+    are cached by these numbers, and shared by all the values and colors
+    known as many times.
+
+    :param rank: Rank of the claim in :data:`game.hands.CLAIMS`.
+    :param known: Codes of the known cards.
+    :param unknown: Number of drawn cards.
+    :return: Number of such draws.
+    """
+
+    hand, values, color = PARSED_CLAIMS[rank]
+    jokers, ranks, colors, masks = known_counts(known)
+    remaining = DECK_SIZE - len(known)
+
+    if hand in VALUE_HANDS_NEEDED:
+        return value_ways(remaining, unknown, jokers, ranks[values[0]], VALUE_HANDS_NEEDED[hand])
+    elif hand == "TwoPairs":
+        return two_values_ways(remaining, unknown, jokers, ranks[values[0]], 2, ranks[values[1]], 2)
+    elif hand == "FullHouse":
+        return two_values_ways(remaining, unknown, jokers, ranks[values[0]], 3, ranks[values[1]], 2)
+    elif hand == "Flush":
+        return flush_ways(remaining, unknown, jokers, colors[color])
+    else:
+        small = hand in ("SmallStraight", "SmallPoker")
+        return straight_ways(remaining, unknown, jokers, masks[color], color != 0, small)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def known_counts(known: Tuple[int, ...]) -> Tuple[int, List[int], List[int], List[int]]:
+    """Count the known cards.
+
+    :param known: Codes of the known cards.
+    :return: Number of jokers, numbers of cards by value, numbers of cards by
+        color number, and masks of the values present by color number, where
+        color 0 stands for all colors.
+    """
+
+    jokers, ranks, colors, masks = 0, [0] * 15, [0] * 5, [0] * 5
+    for code in known:
+        if code == 0:
+            jokers += 1
+        else:
+            value, color = (code - 1) // 4 + LOWEST_VALUE, (code - 1) % 4 + 1
+            ranks[value] += 1
+            colors[color] += 1
+            masks[color] |= 1 << (value - LOWEST_VALUE)
+            masks[0] |= 1 << (value - LOWEST_VALUE)
+
+    return jokers, ranks, colors, masks
+
+
+def at_least_ways(good: int, needed: int, others: int, draws: int) -> int:
+    """Count the draws with at least the needed number of good cards.
+
+    :param good: Number of good cards left.
+    :param needed: Number of good cards needed.
+    :param others: Number of other cards left.
+    :param draws: Number of drawn cards.
+    :return: Number of such draws.
+    """
+
+    return sum(comb(good, drawn) * comb(others, draws - drawn)
+               for drawn in range(max(needed, 0), min(good, draws) + 1))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def value_ways(remaining: int, unknown: int, jokers: int, value_known: int, needed: int) -> int:
+    """Count the draws making the needed number of cards of a value, jokers included.
+
+    :param remaining: Number of cards left in the deck.
+    :param unknown: Number of drawn cards.
+    :param jokers: Number of known jokers.
+    :param value_known: Number of known cards of the value.
+    :param needed: Number of cards needed.
+    :return: Number of such draws.
+    """
+
+    good = 4 - value_known + JOKERS - jokers
+    return at_least_ways(good, needed - value_known - jokers, remaining - good, unknown)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def two_values_ways(remaining: int, unknown: int, jokers: int, first_known: int, first_needed: int,
+                    second_known: int, second_needed: int) -> int:
+    """Count the draws making the needed numbers of cards of two values,
+    jokers counting for both.
+
+    :param remaining: Number of cards left in the deck.
+    :param unknown: Number of drawn cards.
+    :param jokers: Number of known jokers.
+    :param first_known: Number of known cards of the first value.
+    :param first_needed: Number of cards of the first value needed.
+    :param second_known: Number of known cards of the second value.
+    :param second_needed: Number of cards of the second value needed.
+    :return: Number of such draws.
+    """
+
+    first_left, second_left, jokers_left = 4 - first_known, 4 - second_known, JOKERS - jokers
+    others = remaining - first_left - second_left - jokers_left
+
+    ways = 0
+    for drawn_jokers in range(min(jokers_left, unknown) + 1):
+        have_jokers = jokers + drawn_jokers
+        for first_drawn in range(max(first_needed - first_known - have_jokers, 0), first_left + 1):
+            for second_drawn in range(max(second_needed - second_known - have_jokers, 0), second_left + 1):
+                drawn = drawn_jokers + first_drawn + second_drawn
+                if drawn <= unknown:
+                    ways += (comb(jokers_left, drawn_jokers) * comb(first_left, first_drawn)
+                             * comb(second_left, second_drawn) * comb(others, unknown - drawn))
+    return ways
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def flush_ways(remaining: int, unknown: int, jokers: int, color_known: int) -> int:
+    """Count the draws making five cards of a color, jokers included.
+
+    :param remaining: Number of cards left in the deck.
+    :param unknown: Number of drawn cards.
+    :param jokers: Number of known jokers.
+    :param color_known: Number of known cards of the color.
+    :return: Number of such draws.
+    """
+
+    good = 13 - color_known + JOKERS - jokers
+    return at_least_ways(good, 5 - color_known - jokers, remaining - good, unknown)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def straight_ways(remaining: int, unknown: int, jokers: int, present: int, poker: bool, small: bool) -> int:
+    """Count the draws making a straight, or a poker of a color.
+
+    Only the set of values present decides a straight, and every value not
+    among the known cards has as many cards left, so the number of draws
+    hitting exactly a given set of new values depends only on its size. It
+    is found by inclusion-exclusion, and multiplied by the number of sets of
+    each size making the straight.
+
+    :param remaining: Number of cards left in the deck.
+    :param unknown: Number of drawn cards.
+    :param jokers: Number of known jokers.
+    :param present: Mask of the known values, of the color for a poker.
+    :param poker: True for a poker, False for a straight.
+    :param small: True for a small straight or poker, False for a big one.
+    :return: Number of such draws.
+    """
+
+    jokers_left = JOKERS - jokers
+    unit = 1 if poker else 4
+    others = remaining - jokers_left - unit * (13 - bin(present).count("1"))
+
+    if small:
+        counts_by_jokers = small_straight_set_counts(present)
+    else:
+        counts_by_jokers = big_straight_set_counts(present)
+
+    ways = 0
+    for drawn_jokers in range(min(jokers_left, unknown) + 1):
+        draws = unknown - drawn_jokers
+        for size, count in enumerate(counts_by_jokers[jokers + drawn_jokers]):
+            if count:
+                ways += comb(jokers_left, drawn_jokers) * count * exact_set_ways(size, unit, others, draws)
+    return ways
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def exact_set_ways(size: int, unit: int, others: int, draws: int) -> int:
+    """Count the draws hitting every one of a set of new values and no other
+    new value, by inclusion-exclusion.
+
+    :param size: Number of values in the set.
+    :param unit: Number of cards left of every new value.
+    :param others: Number of cards left which are not of a new value.
+    :param draws: Number of drawn cards.
+    :return: Number of such draws.
+    """
+
+    return sum((-1) ** (size - hit) * comb(size, hit) * comb(others + unit * hit, draws)
+               for hit in range(size + 1))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def small_straight_set_counts(present: int) -> List[List[int]]:
+    """Count the sets of new values making a small straight, by their size.
+
+    :param present: Mask of the values known to be present, the others may be drawn.
+    :return: Numbers of sets by the number of values in the set, for 0 to 2 jokers.
+    """
+
+    free = ALL_RANKS & ~present
+    counts = [[0] * (bin(free).count("1") + 1) for _ in range(JOKERS + 1)]
+    subset = free
+    while True:
+        needed = straight_jokers_needed(present | subset)
+        if needed <= JOKERS:
+            counts[needed][bin(subset).count("1")] += 1
+        if not subset:
+            break
+        subset = (subset - 1) & free
+
+    for jokers in range(1, JOKERS + 1):
+        counts[jokers] = [fewer + count for fewer, count in zip(counts[jokers - 1], counts[jokers])]
+    return counts
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def big_straight_set_counts(present: int) -> List[List[int]]:
+    """Count the sets of new values making a big straight, by their size.
+
+    :param present: Mask of the values known to be present, the others may be drawn.
+    :return: Numbers of sets by the number of values in the set, for 0 to 2 jokers.
+    """
+
+    high_present = bin(present & HIGH_RANKS).count("1")
+    high_free = 5 - high_present
+    low_free = 8 - bin(present & ~HIGH_RANKS).count("1")
+
+    counts = []
+    for jokers in range(JOKERS + 1):
+        by_size = [0] * (high_free + low_free + 1)
+        for high in range(max(5 - jokers - high_present, 0), high_free + 1):
+            for low in range(low_free + 1):
+                by_size[high + low] += comb(high_free, high) * comb(low_free, low)
+        counts.append(by_size)
+    return counts
@@ -0,0 +1,178 @@
+from typing import Callable, List, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from random import Random
+import time
+from game.game import BluffGame
+from game.bots import Policy
+
+
+class SimulationStats:
+    """Statistics aggregated over simulated games.
+
+    :param players_num: Number of players at the table.
+    """
+
+    def __init__(self, players_num: int) -> None:
+        #: Number of games played.
+        self.games: int = 0
+
+        #: Number of wins of each seat.
+        self.wins: List[int] = [0] * players_num
+
+        #: Number of wins by the seat's position after the player who started
+        #: the game, position 0 is the starting player.
+        self.wins_by_position: List[int] = [0] * players_num
+
+        #: Number of turns, each ending with a check.
+        self.turns: int = 0
+
+        #: Number of claims.
+        self.claims: int = 0
+
+        #: Number of checks where the claim was not present.
+        self.successful_checks: int = 0
+
+        #: Number of turns ending with a player reaching :attr:`BluffGame.max_cards` and losing.
+        self.eliminations: int = 0
+
+        #: Seconds the simulation has taken so far.
+        self.seconds: float = 0.0
+
+    def merge(self, other: "SimulationStats") -> None:
+        """Add the statistics of other games.
+
+        :param other: Statistics of the same table.
+        """
+
+        self.games += other.games
+        self.wins = [wins + other_wins for wins, other_wins in zip(self.wins, other.wins)]
+        self.wins_by_position = [wins + other_wins for wins, other_wins
+                                 in zip(self.wins_by_position, other.wins_by_position)]
+        self.turns += other.turns
+        self.claims += other.claims
+        self.successful_checks += other.successful_checks
+        self.eliminations += other.eliminations
+
+    def games_per_second(self) -> float:
+        """Get the simulation speed.
+
+        :return: Number of games played per second.
+        """
+
+        return self.games / self.seconds if self.seconds else 0.0
+
+    def report(self) -> str:
+        """Summarize the statistics.
+
+        :return: The summary.
+        """
+
+        games, turns = max(self.games, 1), max(self.turns, 1)
+        return "\n".join([
+            f"{self.games} games in {self.seconds:.1f} s, {self.games_per_second():.1f} games/s",
+            f"Wins by seat: " + ", ".join(f"{wins / games:.1%}" for wins in self.wins),
+            f"Wins by position after the starting player: "
+            + ", ".join(f"{wins / games:.1%}" for wins in self.wins_by_position),
+            f"Turns per game: {self.turns / games:.1f}, claims per turn: {self.claims / turns:.2f}",
+            f"Successful checks: {self.successful_checks / turns:.1%}, "
+            f"turns ending with an elimination: {self.eliminations / turns:.1%}",
+        ])
+
+
+def play_game(policies: List[Policy], seed: int, stats: SimulationStats) -> None:
+    """Play a game between bots, through :meth:`BluffGame.handle_action`.
+
+    The player on turn either claims a higher hand or checks the last claim.
+
+    :param policies: Policies of the players, by seat.
+    :param seed: Seed of the game and of the players' choices.
+    :param stats: Statistics the game is added to.
+    """
+
+    seeds = Random(seed)
+    game = BluffGame(seeds.getrandbits(32))
+    rng = Random(seeds.getrandbits(32))
+
+    for seat in range(len(policies)):
+        game.add_player(seat)
+        game.handle_action(seat, f"name Bot{seat}")
+    for seat in range(len(policies)):
+        game.handle_action(seat, "Start")
+    first_seat = game.turn
+
+    while not game.win:
+        if game.checked:
+            for seat, player in game.players.items():
+                if not player.lost:
+                    game.handle_action(seat, "Start")
+            continue
+
+        seat = game.seats[game.turn]
+        action = policies[seat].choose_action(game.get_game_status(game.players[seat]), rng)
+        version = game.version
+        game.handle_action(seat, action)
+        if game.version == version:
+            raise ValueError(f"Bot{seat} made an invalid action {action!r}")
+
+        if action == "check":
+            _, checked_name, card_name, eliminated = game.check_result
+            stats.turns += 1
+            stats.successful_checks += checked_name == card_name
+            stats.eliminations += eliminated
+        else:
+            stats.claims += 1
+
+    winner = int(game.win[len("Bot"):])
+    stats.games += 1
+    stats.wins[winner] += 1
+    stats.wins_by_position[(winner - first_seat) % len(policies)] += 1
+
+
+def play_games(policies: List[Policy], seed: int, games: int) -> SimulationStats:
+    """Play games between bots, e.g. in a worker process.
+
+    :param policies: Policies of the players, by seat.
+    :param seed: Seed of the games.
+    :param games: Number of games.
+    :return: Statistics of the games.
+    """
+
+    seeds = Random(seed)
+    stats = SimulationStats(len(policies))
+    for _ in range(games):
+        play_game(policies, seeds.getrandbits(32), stats)
+    return stats
+
+
+def simulate(policies: List[Policy], games: int, seed: int = 0, workers: Union[None, int] = None,
+             shard_size: int = 200,
+             on_progress: Union[None, Callable[[SimulationStats], None]] = None) -> SimulationStats:
+    """Play games between bots in a pool of worker processes.
+
+    The games are split into shards with their own seeds, so the statistics
+    depend only on the seed, not on the number of workers.
+
+    :param policies: Policies of the players, by seat.
+    :param games: Number of games.
+    :param seed: Seed of the simulation.
+    :param workers: Number of worker processes, the number of CPUs if None.
+    :param shard_size: Number of games played by a worker at once.
+    :param on_progress: Function called with the statistics so far, after every shard.
+    :return: Statistics of all games.
+    """
+
+    seeds = Random(seed)
+    shards = [(seeds.getrandbits(32), min(shard_size, games - start)) for start in range(0, games, shard_size)]
+    stats = SimulationStats(len(policies))
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(play_games, policies, shard_seed, shard_games)
+                   for shard_seed, shard_games in shards]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            stats.seconds = time.perf_counter() - start_time
+            if on_progress is not None:
+                on_progress(stats)
+
+    return stats
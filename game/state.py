@@ -0,0 +1,236 @@
+from typing import Dict, List, Any, Tuple, Union
+from array import array
+from random import Random
+from game.card import Card
+from game.card_pool import CardPool
+from game.codec import YOU_LABEL, card_to_code
+from game.game import BluffGame
+from game.hands import CLAIMS, claim_rank
+
+
+#: Action checking the last claim, claims are actions by their rank in :data:`game.hands.CLAIMS`.
+CHECK = -1
+
+#: A player getting this many cards loses, see :attr:`game.game.BluffGame.max_cards`.
+MAX_CARDS = BluffGame.max_cards
+
+#: Most cards a player can hold.
+HAND_SIZE = MAX_CARDS - 1
+
+#: Codes of the 54 cards of the deck, as encoded by :func:`game.codec.card_to_code`.
+DECK_CODES: bytes = bytes([0, 0] + list(range(1, 53)))
+
+
+class GameState:
+    """Compact state of a game in progress, cheap to copy, e.g. for search.
+
+    The state holds only flat arrays: the number of cards of every seat, the
+    hands as card codes, and the ranks of the claims of the current turn.
+    Seats which lost hold no cards. Copying a state copies three short
+    arrays, while copying a :class:`game.game.BluffGame` copies its players,
+    deck and moves.
+
+    :param counts: Number of cards of every seat, 0 if the seat lost.
+    :param turn: Seat on turn.
+    """
+
+    __slots__ = ("counts", "hands", "turn", "claims", "present_claims")
+
+    def __init__(self, counts: List[int], turn: int) -> None:
+        #: Number of cards of every seat, 0 if the seat lost.
+        self.counts: array = array("B", counts)
+
+        #: Card codes of the hands, the hand of seat s takes
+        #: :data:`HAND_SIZE` codes from s * :data:`HAND_SIZE`.
+        self.hands: array = array("B", bytes(HAND_SIZE * len(counts)))
+
+        #: Seat on turn.
+        self.turn: int = turn
+
+        #: Ranks of the claims of the current turn.
+        self.claims: array = array("H")
+
+        #: Mask of the claims present in all hands, cached by :meth:`claims_present`.
+        self.present_claims: Union[None, int] = None
+
+    @classmethod
+    def from_status(cls, status: Dict[str, Any]) -> Tuple["GameState", int]:
+        """Create the state a player knows from the player's game status.
+
+        Only the player's own hand is known, the other hands are empty until
+        :meth:`determinize` deals them.
+
+        :param status: The game status of a player who did not lose.
+        :return: The state, and the player's seat in it.
+        """
+
+        players = status["players"]
+        seat = next(index for index, (name, _) in enumerate(players) if name.startswith(YOU_LABEL))
+        turn = seat if status["is_turn"] else next(
+            (index for index, (name, _) in enumerate(players) if name == status["turn"]), seat)
+
+        state = cls([cards for _, cards in players], turn)
+        state.set_hand(seat, [card_to_code(card) for card in status["hand"]])
+        state.claims.extend(claim_rank(move) for _, move in status["moves"])
+        return state, seat
+
+    def copy(self) -> "GameState":
+        """Copy the state.
+
+        :return: The copy.
+        """
+
+        state = GameState.__new__(GameState)
+        state.counts = self.counts[:]
+        state.hands = self.hands[:]
+        state.turn = self.turn
+        state.claims = self.claims[:]
+        state.present_claims = self.present_claims
+        return state
+
+    def hand(self, seat: int) -> array:
+        """Get the card codes of a seat's hand.
+
+        :param seat: The seat.
+        :return: The codes.
+        """
+
+        start = seat * HAND_SIZE
+        return self.hands[start:start + self.counts[seat]]
+
+    def set_hand(self, seat: int, codes: List[int]) -> None:
+        """Set the cards of a seat's hand.
+
+        :param seat: The seat.
+        :param codes: Card codes, as many as the seat's cards.
+        """
+
+        start = seat * HAND_SIZE
+        self.hands[start:start + len(codes)] = array("B", codes)
+        self.present_claims = None
+
+    def deal(self, rng: Random) -> None:
+        """Deal new hands to all seats.
+
+        :param rng: Random number generator shuffling the deck.
+        """
+
+        codes = rng.sample(DECK_CODES, sum(self.counts))
+        self.deal_codes(range(len(self.counts)), codes)
+
+    def determinize(self, seat: int, rng: Random) -> None:
+        """Deal the cards the seat cannot see, from the cards not in its hand.
+
+        :param seat: The seat whose hand is kept.
+        :param rng: Random number generator choosing the cards.
+        """
+
+        unknown = bytearray(DECK_CODES)
+        for code in self.hand(seat):
+            del unknown[unknown.index(code)]
+
+        others = [other for other in range(len(self.counts)) if other != seat]
+        codes = rng.sample(unknown, sum(self.counts) - self.counts[seat])
+        self.deal_codes(others, codes)
+
+    def deal_codes(self, seats: Union[range, List[int]], codes: List[int]) -> None:
+        """Fill the hands of the seats, in order, with the card codes.
+
+        :param seats: The seats.
+        :param codes: Card codes, as many as the seats' cards.
+        """
+
+        start = 0
+        for seat in seats:
+            count = self.counts[seat]
+            self.hands[seat * HAND_SIZE:seat * HAND_SIZE + count] = array("B", codes[start:start + count])
+            start += count
+        self.present_claims = None
+
+    def claims_present(self) -> int:
+        """Evaluate every claim against all hands, see :meth:`CardPool.claims_present`.
+
+        :return: Mask of the claims present, bit n is the claim of rank n.
+        """
+
+        if self.present_claims is None:
+            cards = [Card.interned[code] for seat in range(len(self.counts)) for code in self.hand(seat)]
+            self.present_claims = CardPool(cards).claims_present()
+        return self.present_claims
+
+    def next_seat(self, seat: int) -> int:
+        """Get the next seat which did not lose.
+
+        :param seat: The seat to start after.
+        :return: The next seat, the seat itself if no other seat is left.
+        """
+
+        for step in range(1, len(self.counts) + 1):
+            other = (seat + step) % len(self.counts)
+            if self.counts[other]:
+                return other
+        return seat
+
+    def previous_seat(self, seat: int) -> int:
+        """Get the previous seat which did not lose.
+
+        :param seat: The seat to start before.
+        :return: The previous seat, the seat itself if no other seat is left.
+        """
+
+        for step in range(1, len(self.counts) + 1):
+            other = (seat - step) % len(self.counts)
+            if self.counts[other]:
+                return other
+        return seat
+
+    def winner(self) -> Union[None, int]:
+        """Get the seat which won the game.
+
+        :return: The only seat which did not lose, None if the game goes on.
+        """
+
+        seats = [seat for seat, count in enumerate(self.counts) if count]
+        return seats[0] if len(seats) == 1 else None
+
+    def is_legal(self, action: int) -> bool:
+        """Check if the player on turn can make the action.
+
+        :param action: :data:`CHECK` or the rank of a claim.
+        :return: True if the action is legal, False otherwise.
+        """
+
+        if action == CHECK:
+            return len(self.claims) > 0
+        return (not self.claims or self.claims[-1] < action) and action < len(CLAIMS)
+
+    def play(self, action: int) -> Union[None, int]:
+        """Make the action of the player on turn, like :meth:`BluffGame.handle_action`.
+
+        A check ends the turn: the checked seat gets a card if its claim is
+        not present, otherwise the checking seat gets it. A seat reaching
+        :data:`MAX_CARDS` loses. The hands are not dealt again, call
+        :meth:`deal` to start the next turn.
+
+        :param action: :data:`CHECK` or the rank of a claim, see :meth:`is_legal`.
+        :return: The seat which got a card if the action was a check, None otherwise.
+        """
+
+        if action != CHECK:
+            self.claims.append(action)
+            self.turn = self.next_seat(self.turn)
+            return None
+
+        checked = self.previous_seat(self.turn)
+        loser = self.turn if self.claims_present() >> self.claims[-1] & 1 else checked
+
+        self.counts[loser] += 1
+        if self.counts[loser] >= MAX_CARDS:
+            self.counts[loser] = 0
+            self.turn = self.next_seat(loser)
+        else:
+            self.turn = loser
+
+        del self.claims[:]
+        self.present_claims = None
+        return loser
@@ -0,0 +1,159 @@
+from typing import Dict, Any, Tuple, Union
+from random import Random
+from game import BluffGame
+from game.codec import encode_shared_status, encode_player_status
+
+
+class RoomManager:
+    """A class keeping many concurrent games (rooms) of a single server.
+
+    New players are seated in the open room, and a new room is created
+    whenever the open one is full or its game has started.
+
+    :param first_room_id: ID of the first created room.
+    :param room_id_step: Difference between IDs of consecutive rooms, so that
+        servers running in separate processes create disjoint room IDs.
+    :param seed: Seed of the generator of the rooms' seeds, a random one if None.
+    """
+
+    def __init__(self, first_room_id: int = 0, room_id_step: int = 1,
+                 seed: Union[None, int] = None) -> None:
+        #: Dictionary with room ID as key and the room's game as value.
+        self.rooms: Dict[int, BluffGame] = {}
+
+        #: Dictionary with client as key and the ID of its room as value.
+        self.client_rooms: Dict[Any, int] = {}
+
+        #: Dictionary with room ID as key and its clients with their IDs as value.
+        self.room_clients: Dict[int, Dict[Any, int]] = {}
+
+        #: Dictionary with room ID as key, and the game state version with the
+        #: encoded shared part of the status for this version as value.
+        self.shared_statuses: Dict[int, Tuple[int, bytes]] = {}
+
+        #: ID of the room accepting new players, None if there is no such room.
+        self.open_room: Union[None, int] = None
+
+        #: ID that will be given to the next created room.
+        self.next_room_id: int = first_room_id
+
+        #: Difference between IDs of consecutive rooms.
+        self.room_id_step: int = room_id_step
+
+        #: Random number generator giving the seeds of the created rooms.
+        self.seeds: Random = Random(seed)
+
+    def create_room(self) -> int:
+        """Create a new empty room.
+
+        :return: ID of the created room.
+        """
+
+        room_id = self.next_room_id
+        self.next_room_id += self.room_id_step
+        self.rooms[room_id] = BluffGame(self.seeds.getrandbits(32))
+        self.room_clients[room_id] = {}
+        print(f"~ Game {room_id} has been created with seed {self.rooms[room_id].seed}")
+        return room_id
+
+    def accepts_players(self, room_id: Union[None, int]) -> bool:
+        """Check if new players can be seated in the room.
+
+        :param room_id: ID of the room.
+        :return: True if the room exists, is not full and did not start.
+        """
+
+        if room_id is None or room_id not in self.rooms:
+            return False
+
+        game = self.rooms[room_id]
+        return not game.is_full() and not game.has_started
+
+    def join(self, client: Any, client_id: int, room_id: Union[None, int] = None) -> BluffGame:
+        """Seat a client in the given room, or in the open room creating one if needed.
+
+        :param client: The client socket.
+        :param client_id: The unique ID of the client.
+        :param room_id: ID of the room to join, None to join the open room.
+        :return: The game the client has joined.
+        """
+
+        if room_id is None:
+            if not self.accepts_players(self.open_room):
+                self.open_room = self.create_room()
+            room_id = self.open_room
+
+        game = self.rooms[room_id]
+        game.add_player(client_id)
+        self.client_rooms[client] = room_id
+        self.room_clients[room_id][client] = client_id
+        return game
+
+    def leave(self, client: Any, client_id: int) -> int:
+        """Remove a client from its room, closing the room if it is empty.
+
+        :param client: The client socket.
+        :param client_id: The unique ID of the client.
+        :return: ID of the room the client has left.
+        """
+
+        room_id = self.client_rooms.pop(client)
+        del self.room_clients[room_id][client]
+        self.rooms[room_id].remove_player(client_id)
+        self.close_empty_game(room_id)
+        return room_id
+
+    def game_of(self, client: Any) -> BluffGame:
+        """Get the game of a client.
+
+        :param client: The client socket.
+        :return: The game the client is playing.
+        """
+
+        return self.rooms[self.client_rooms[client]]
+
+    def members(self, room_id: int) -> Dict[Any, int]:
+        """Get the clients of a room.
+
+        :param room_id: ID of the room.
+        :return: Dictionary with clients as keys and their IDs as values,
+            empty if the room was closed.
+        """
+
+        return self.room_clients.get(room_id, {})
+
+    def encode_status(self, room_id: int, client_id: int) -> bytes:
+        """Encode the game status for a client of the room.
+
+        The part of the status shared by all players is encoded once per
+        version of the game state, so only the player's part is encoded per
+        client.
+
+        :param room_id: ID of the room.
+        :param client_id: The unique ID of the client.
+        :return: The encoded game status.
+        """
+
+        game = self.rooms[room_id]
+        version, shared_status = self.shared_statuses.get(room_id, (None, b""))
+
+        if version != game.version:
+            shared_status = encode_shared_status({**game.get_shared_status(), "room": room_id})
+            self.shared_statuses[room_id] = (game.version, shared_status)
+
+        player_status = game.get_player_status(game.players[client_id])
+        return shared_status + encode_player_status(player_status)
+
+    def close_empty_game(self, room_id: int) -> None:
+        """Close the room if there are no players.
+
+        :param room_id: ID of the room.
+        """
+
+        if self.rooms[room_id].all_players_num() == 0:
+            del self.rooms[room_id]
+            del self.room_clients[room_id]
+            self.shared_statuses.pop(room_id, None)
+            if self.open_room == room_id:
+                self.open_room = None
+            print(f"~ Game {room_id} has been closed")
@@ -1,13 +1,105 @@
-from typing import Dict, List, Any, Union
-import pickle
-import random
+from typing import Deque, Dict, List, Any, Set, Tuple, Union
+from collections import deque
+import asyncio
 import socket
 import select
-from game import BluffGame
+from game.codec import UNCHANGED_STATUS, VERSION_MODULO
+from game.framing import FrameBuffer, encode_frame
+from rooms import RoomManager
+from bot_seats import BotSeats
 
 
 MAX_MSG_LENGTH = 1024*4
-DISCONNECT_MESSAGE = ""
+DISCONNECT_MESSAGE = b""
+SUBSCRIBE_MESSAGE = "Subscribe"
+POLL_MESSAGE = "Get"
+ROOM_MESSAGE = "room"
+
+#: Bytes queued for a subscribed client above which stale statuses are dropped.
+HIGH_WATER_MARK = 1024*16
+
+
+class OutboundQueue:
+    """A class representing messages waiting to be sent to one client.
+
+    Every message is a complete game status, so for a subscribed client only
+    the newest one matters. When such a client does not keep up and its queue
+    grows above the high-water mark, the queued statuses that did not start
+    being sent are dropped in favour of the new one.
+    """
+
+    def __init__(self, high_water_mark: int = HIGH_WATER_MARK) -> None:
+        #: The messages waiting to be sent.
+        self.messages: Deque[bytes] = deque()
+
+        #: Number of bytes of the first message already sent.
+        self.offset: int = 0
+
+        #: Number of bytes waiting to be sent.
+        self.size: int = 0
+
+        #: Number of queued bytes above which stale statuses are dropped.
+        self.high_water_mark: int = high_water_mark
+
+        #: Boolean value representing if stale statuses may be dropped.
+        self.coalesce: bool = False
+
+    def push(self, message: bytes) -> None:
+        """Queue a message, dropping stale statuses if the queue is too long.
+
+        :param message: The framed message.
+        """
+
+        if self.coalesce and self.size + len(message) > self.high_water_mark:
+            self.drop_stale()
+
+        self.messages.append(message)
+        self.size += len(message)
+
+    def drop_stale(self) -> None:
+        """Drop all queued messages, except the one being sent."""
+        if self.offset:
+            head = self.messages.popleft()
+            self.messages.clear()
+            self.messages.append(head)
+            self.size = len(head) - self.offset
+        else:
+            self.messages.clear()
+            self.size = 0
+
+    def pop(self) -> bytes:
+        """Remove the first message from the queue.
+
+        :return: The remaining part of the first message.
+        """
+
+        message = self.messages.popleft()
+        if self.offset:
+            message = message[self.offset:]
+            self.offset = 0
+        self.size -= len(message)
+        return message
+
+    def flush(self, client_socket: Any) -> None:
+        """Send as many queued bytes as the non-blocking socket accepts.
+
+        :param client_socket: The client socket.
+        """
+
+        while self.messages:
+            message = self.messages[0]
+            try:
+                sent = client_socket.send(memoryview(message)[self.offset:])
+            except BlockingIOError:
+                return
+
+            self.offset += sent
+            self.size -= sent
+            if self.offset < len(message):
+                return
+
+            self.messages.popleft()
+            self.offset = 0
 
 
 class Server:
@@ -27,11 +119,32 @@ class Server:
         #: Dictionary with players as keys, and their unique ID as value.
         self.clients_ids: Dict[Any, int] = {}
 
-        #: List of clients waiting to receive data.
-        self.clients_to_respond: List[Any] = []
+        #: Dictionary with clients as keys, and their receive buffers as value.
+        self.frame_buffers: Dict[Any, FrameBuffer] = {}
 
-        #: Instance of Game class representing the server's game.
-        self.game: Union[None, BluffGame] = None
+        #: Set of clients receiving game status whenever their room changes.
+        self.subscribers: Set[Any] = set()
+
+        #: Dictionary with clients as keys, and their outbound queues as value.
+        self.outbound_queues: Dict[Any, OutboundQueue] = {}
+
+        #: Dictionary with stream writers as keys, and events waking up their sending coroutines as value.
+        self.send_events: Dict[Any, asyncio.Event] = {}
+
+        #: Set of tasks serving client sockets passed by the acceptor process.
+        self.passed_clients: Set[asyncio.Task] = set()
+
+        #: Rooms with the games hosted by the server.
+        self.rooms: RoomManager = RoomManager()
+
+        #: ID that will be given to the next connected client.
+        self.next_client_id: int = 1000
+
+        #: Bots filling the rooms, None if the server has no bots.
+        self.bot_seats: Union[None, BotSeats] = None
+
+        #: Task making the bots' actions on asyncio, None if it is not running.
+        self.bot_task: Union[None, asyncio.Task] = None
 
     def start_server(self) -> Any:
         """Start the server.
@@ -56,16 +169,16 @@ class Server:
 
         print(client_address, "Connection closed")
         self.connected_clients.remove(socket_to_remove)
-        self.game.remove_player(self.clients_ids[socket_to_remove])
+        room_id = self.rooms.leave(socket_to_remove, self.clients_ids[socket_to_remove])
         del self.clients_ids[socket_to_remove]
+        self.frame_buffers.pop(socket_to_remove, None)
+        self.subscribers.discard(socket_to_remove)
+        self.outbound_queues.pop(socket_to_remove, None)
+        self.send_events.pop(socket_to_remove, None)
         socket_to_remove.close()
-        self.close_empty_game()
 
-    def close_empty_game(self) -> None:
-        """Close the game if there are no players."""
-        if self.game.active_players_num() == 0:
-            self.game = None
-            print("~ Game has been closed")
+        self.update_bots(room_id)
+        self.send_messages(self.build_pushes(room_id))
 
     def create_client_id(self) -> int:
         """Create a unique client ID.
@@ -73,13 +186,12 @@ class Server:
         :return: New client ID.
         """
 
-        client_id = random.randint(1000, 9999)
-        while client_id in self.clients_ids.values():
-            client_id = random.randint(1000, 9999)
+        client_id = self.next_client_id
+        self.next_client_id += 1
         return client_id
 
     def handle_new_client(self, client_socket: Any, client_address: int) -> None:
-        """
+        """Seat a new client in the open room.
 
         :param client_socket: The client socket.
         :param client_address: The client address.
@@ -87,22 +199,17 @@ class Server:
 
         client_id = self.create_client_id()
 
-
-        if self.game is not None:
-            if not self.game.is_full() and not self.game.has_started:
-                self.connected_clients.append(client_socket)
-                self.clients_ids[client_socket] = client_id
-
-                self.game.add_player(client_id)
-                print("New client joined:", client_address)
-            return
         self.connected_clients.append(client_socket)
         self.clients_ids[client_socket] = client_id
+        self.frame_buffers[client_socket] = FrameBuffer()
+        self.outbound_queues[client_socket] = OutboundQueue()
 
-        self.game = BluffGame()
-        self.game.add_player(client_id)
+        self.rooms.join(client_socket, client_id)
         print("New client joined:", client_address)
 
+        room_id = self.rooms.client_rooms[client_socket]
+        self.send_messages(self.build_pushes(room_id))
+
     def handle_client_rec_data(self, current_socket: Any, client_address: int) -> None:
         """Handle a new client connection.
 
@@ -111,11 +218,15 @@ class Server:
         """
 
         try:
-            data = current_socket.recv(MAX_MSG_LENGTH).decode()
-            if data == DISCONNECT_MESSAGE:
+            frames = self.frame_buffers[current_socket]
+            if frames.recv_from(current_socket) == 0:
                 self.disconnect_client(current_socket, client_address)
-            else:
-                self.clients_to_respond.append((current_socket, data))
+                return
+
+            frame = frames.next_frame()
+            while frame is not None:
+                self.handle_player_action(current_socket, str(frame, "utf-8"))
+                frame = frames.next_frame()
         except:
             self.disconnect_client(current_socket, client_address)
 
@@ -126,35 +237,336 @@ class Server:
         :param rec_data: The client address.
         """
 
+        self.send_messages(self.build_responses(player_socket, rec_data))
+
+    def build_responses(self, player_socket: Any, rec_data: str) -> List[Tuple[Any, bytes]]:
+        """Apply the client action to the game and serialize the replies.
+
+        The player always gets the status back. "room <room ID>" moves the
+        player to the given room, if its game did not start and it is not full.
+        A poll carrying the version of
+        the last status seen by the client, e.g. "Get 17", gets a short
+        unchanged reply if the game state did not change since. If the action
+        changed the game state, the other subscribed clients in the room get
+        their updated status too.
+
+        :param player_socket: The socket (or stream writer) of the player.
+        :param rec_data: The action received from the player.
+        :return: List of clients with the framed, encoded status to send them.
+        """
+
+        if rec_data.startswith(ROOM_MESSAGE + " "):
+            self.change_room(player_socket, rec_data[len(ROOM_MESSAGE) + 1:])
+            rec_data = POLL_MESSAGE
+
+        client_id = self.clients_ids[player_socket]
+        room_id = self.rooms.client_rooms[player_socket]
+        game = self.rooms.rooms[room_id]
+
+        if rec_data == SUBSCRIBE_MESSAGE:
+            self.subscribers.add(player_socket)
+            self.outbound_queues[player_socket].coalesce = True
+            rec_data = POLL_MESSAGE
+
+        elif rec_data.startswith(POLL_MESSAGE + " "):
+            if rec_data[len(POLL_MESSAGE) + 1:] == str(game.version % VERSION_MODULO):
+                return [(player_socket, encode_frame(UNCHANGED_STATUS))]
+            rec_data = POLL_MESSAGE
+
+        version = game.version
+        game.player_make_action(client_id, rec_data)
+
+        if game.version != version:
+            self.update_bots(room_id)
+
+        responses = [(player_socket, encode_frame(self.rooms.encode_status(room_id, client_id)))]
+        if game.version != version:
+            responses += self.build_pushes(room_id, player_socket)
+
+        return responses
+
+    def change_room(self, player_socket: Any, room: str) -> None:
+        """Move the player to another room, if the player can be seated there.
+
+        A game in progress takes no new players, so a room whose game has
+        started is refused, as when the player joins the open room.
+
+        :param player_socket: The socket (or stream writer) of the player.
+        :param room: ID of the room.
+        """
+
+        if not room.isdigit() or not self.rooms.accepts_players(int(room)):
+            return
+
+        room_id = int(room)
+        if room_id == self.rooms.client_rooms[player_socket]:
+            return
+
         client_id = self.clients_ids[player_socket]
-        status = self.game.player_make_action(client_id, rec_data)
-        #print(status)
-        player_socket.send(pickle.dumps(status))
+        left_room_id = self.rooms.leave(player_socket, client_id)
+        self.rooms.join(player_socket, client_id, room_id)
+
+        self.update_bots(left_room_id)
+        self.send_messages(self.build_pushes(left_room_id))
+        self.send_messages(self.build_pushes(room_id, player_socket))
+
+    def update_bots(self, room_id: int) -> None:
+        """Let the bots react to a change of the room, see :class:`BotSeats`.
+
+        :param room_id: ID of the room.
+        """
+
+        if self.bot_seats is not None:
+            self.bot_seats.release_room(room_id)
+            self.bot_seats.update(room_id)
+
+    def play_bots(self) -> None:
+        """Make the bots' actions which are due, and push the changed statuses."""
+        for room_id in self.bot_seats.poll():
+            self.send_messages(self.build_pushes(room_id))
+
+    async def run_bots(self) -> None:
+        """Make the bots' actions whenever they are due or decided."""
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        self.bot_seats.on_wake = lambda: loop.call_soon_threadsafe(wake.set)
+
+        while True:
+            self.play_bots()
+            try:
+                await asyncio.wait_for(wake.wait(), self.bot_seats.next_timeout())
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+
+    async def stop_bots(self) -> None:
+        """Cancel the task making the bots' actions, and wait until it stops."""
+        if self.bot_task is None:
+            return
+
+        self.bot_task.cancel()
+        try:
+            await self.bot_task
+        except asyncio.CancelledError:
+            pass
+        self.bot_task = None
+
+    def build_pushes(self, room_id: int, sender: Any = None) -> List[Tuple[Any, bytes]]:
+        """Serialize the current game status for the subscribed clients in the room.
+
+        :param room_id: ID of the room.
+        :param sender: Client that already got the status, and is skipped.
+        :return: List of clients with the framed, encoded status to send them.
+        """
+
+        pushes = []
+
+        for client, client_id in self.rooms.members(room_id).items():
+            if client in self.subscribers and client is not sender:
+                status = self.rooms.encode_status(room_id, client_id)
+                pushes.append((client, encode_frame(status)))
+
+        return pushes
+
+    def send_messages(self, messages: List[Tuple[Any, bytes]]) -> None:
+        """Queue messages for the clients and start sending them.
+
+        Sockets are flushed right away as far as they accept data without
+        blocking. Stream writers are flushed by their sending coroutines.
+
+        :param messages: List of clients (sockets or stream writers) with the messages.
+        """
+
+        for client, message in messages:
+            self.outbound_queues[client].push(message)
+
+            if client in self.send_events:
+                self.send_events[client].set()
+            else:
+                self.flush_client(client)
+
+    def flush_client(self, client_socket: Any) -> None:
+        """Send queued messages to the client socket without blocking.
+
+        :param client_socket: The client socket.
+        """
+
+        try:
+            self.outbound_queues[client_socket].flush(client_socket)
+        except OSError:
+            pass
 
     def send_all_messages(self, ready_to_write: List) -> None:
-        """Send all messages to the clients.
+        """Send queued messages to the clients.
 
         :param ready_to_write: The list of sockets ready to write.
         """
 
-        for client, msg in self.clients_to_respond:
-            if client in ready_to_write:
-                self.handle_player_action(client, msg)
-                self.clients_to_respond.remove((client, msg))
+        for client in ready_to_write:
+            if client in self.outbound_queues:
+                self.flush_client(client)
 
     def main_loop(self) -> None:
         """The main loop of the server."""
         server_socket = self.start_server()
 
         while True:
+            waiting_to_write = [client for client, queue in self.outbound_queues.items()
+                                if queue.messages]
+            timeout = self.bot_seats.next_timeout() if self.bot_seats is not None else None
             ready_to_read, ready_to_write, in_error = select.select(
-                [server_socket] + self.connected_clients, self.connected_clients, [])
+                [server_socket] + self.connected_clients, waiting_to_write, [], timeout)
 
             for current_socket in ready_to_read:
                 if current_socket is server_socket:
                     client_socket, client_address = current_socket.accept()
+                    client_socket.setblocking(False)
                     self.handle_new_client(client_socket, client_address)
                 else:
                     self.handle_client_rec_data(current_socket, client_address)
 
             self.send_all_messages(ready_to_write)
+
+            if self.bot_seats is not None:
+                self.play_bots()
+
+    def serve_async(self) -> None:
+        """Run the server on asyncio, with one coroutine per connection."""
+        asyncio.run(self.async_main_loop())
+
+    async def async_main_loop(self) -> None:
+        """The main loop of the asyncio server."""
+        print(f"Starting server on {self.server_ip}")
+        server = await asyncio.start_server(
+            self.handle_connection, self.server_ip, self.server_port)
+        print("Listening for clients...")
+
+        if self.bot_seats is not None:
+            self.bot_task = asyncio.create_task(self.run_bots())
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop_bots()
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Serve a single client for the whole lifetime of its connection.
+
+        The stream writer takes the place of the client socket in
+        :attr:`connected_clients` and :attr:`clients_ids`, so the game
+        handling is shared with the select() loop.
+
+        :param reader: The stream to read client actions from.
+        :param writer: The stream to write game statuses to.
+        """
+
+        client_address = writer.get_extra_info("peername")
+        self.send_events[writer] = asyncio.Event()
+        self.handle_new_client(writer, client_address)
+        frames = self.frame_buffers[writer]
+        sending = asyncio.create_task(
+            self.send_queued(writer, self.outbound_queues[writer], self.send_events[writer]))
+
+        try:
+            while True:
+                data = await reader.read(MAX_MSG_LENGTH)
+                if data == DISCONNECT_MESSAGE:
+                    break
+
+                frames.feed(data)
+                frame = frames.next_frame()
+                while frame is not None:
+                    self.send_messages(self.build_responses(writer, str(frame, "utf-8")))
+                    frame = frames.next_frame()
+        except (ConnectionError, UnicodeDecodeError, ValueError):
+            pass
+        finally:
+            sending.cancel()
+            self.disconnect_client(writer, client_address)
+
+    @staticmethod
+    async def send_queued(writer: asyncio.StreamWriter, queue: OutboundQueue,
+                          event: asyncio.Event) -> None:
+        """Write queued messages to the stream, waiting for each to drain.
+
+        While a slow client drains, new statuses wait in its queue, where
+        stale ones can still be dropped.
+
+        :param writer: The stream to write to.
+        :param queue: The client's outbound queue.
+        :param event: Event set when messages are queued.
+        """
+
+        try:
+            while True:
+                await event.wait()
+                event.clear()
+
+                while queue.messages:
+                    writer.write(queue.pop())
+                    await writer.drain()
+        except ConnectionError:
+            pass
+
+    def serve_worker(self, channel: socket.socket) -> None:
+        """Run the asyncio server on client sockets passed through the channel.
+
+        Used by worker processes of :class:`workers.WorkerPool`, whose
+        acceptor accepts the connections.
+
+        :param channel: Unix socket receiving the client sockets.
+        """
+
+        asyncio.run(self.async_worker_loop(channel))
+
+    async def async_worker_loop(self, channel: socket.socket) -> None:
+        """The main loop of the worker process.
+
+        :param channel: Unix socket receiving the client sockets.
+        """
+
+        loop = asyncio.get_running_loop()
+        closed = loop.create_future()
+        channel.setblocking(False)
+        loop.add_reader(channel.fileno(), self.receive_passed_client, channel, closed)
+        print("Worker waiting for clients...")
+
+        if self.bot_seats is not None:
+            self.bot_task = asyncio.create_task(self.run_bots())
+
+        try:
+            await closed
+        finally:
+            await self.stop_bots()
+
+    def receive_passed_client(self, channel: socket.socket, closed: asyncio.Future) -> None:
+        """Start serving client sockets passed through the channel.
+
+        :param channel: Unix socket receiving the client sockets.
+        :param closed: Future finished when the acceptor closes the channel.
+        """
+
+        try:
+            data, fds, _, _ = socket.recv_fds(channel, 1, 1)
+        except BlockingIOError:
+            return
+
+        if not data and not closed.done():
+            asyncio.get_running_loop().remove_reader(channel.fileno())
+            closed.set_result(None)
+
+        for fd in fds:
+            task = asyncio.create_task(self.serve_passed_client(socket.socket(fileno=fd)))
+            self.passed_clients.add(task)
+            task.add_done_callback(self.passed_clients.discard)
+
+    async def serve_passed_client(self, client_socket: socket.socket) -> None:
+        """Serve a client socket passed by the acceptor.
+
+        :param client_socket: The client socket.
+        """
+
+        reader, writer = await asyncio.open_connection(sock=client_socket)
+        await self.handle_connection(reader, writer)
@@ -1,9 +1,34 @@
 from server import Server
+from workers import WorkerPool
+from bot_seats import BotSeats
 
 
 SERVER_IP = 'localhost'
 SERVER_PORT = 5556
 
+#: Serve clients from asyncio coroutines instead of the select() loop.
+USE_ASYNCIO = True
+
+#: Number of worker processes, each hosting its own rooms. With more than one
+#: worker an acceptor process passes the clients to the workers.
+WORKERS = 1
+
+#: Number of players the rooms are filled to with bots once all their
+#: players are ready, 0 for no bots. Bots are seated by a single server only.
+BOT_SEATS = 0
+
+#: Seconds a bot waits before making an action.
+BOT_THINK_TIME = 1.0
+
 if __name__ == '__main__':
-    game_server = Server(SERVER_IP, SERVER_PORT)
-    game_server.main_loop()
+    if WORKERS > 1:
+        WorkerPool(SERVER_IP, SERVER_PORT, WORKERS).main_loop()
+    else:
+        game_server = Server(SERVER_IP, SERVER_PORT)
+        if BOT_SEATS:
+            game_server.bot_seats = BotSeats(game_server.rooms, game_server.create_client_id,
+                                             BOT_SEATS, BOT_THINK_TIME)
+        if USE_ASYNCIO:
+            game_server.serve_async()
+        else:
+            game_server.main_loop()
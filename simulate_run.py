@@ -0,0 +1,27 @@
+import argparse
+from game.bots import POLICIES
+from game.simulator import SimulationStats, simulate
+
+
+def print_progress(stats: SimulationStats) -> None:
+    """Print the number of games played so far.
+
+    :param stats: Statistics so far.
+    """
+
+    print(f"{stats.games} games, {stats.games_per_second():.1f} games/s", flush=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Bluff games between bots and print statistics.")
+    parser.add_argument("--games", type=int, default=10000, help="number of games")
+    parser.add_argument("--players", default="probability,honest,random,random",
+                        help="comma separated policies of the seats, one of: " + ", ".join(POLICIES))
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes, all CPUs by default")
+    parser.add_argument("--shard-size", type=int, default=200, help="number of games played by a worker at once")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the simulation")
+    args = parser.parse_args()
+
+    policies = [POLICIES[name]() for name in args.players.split(",")]
+    stats = simulate(policies, args.games, args.seed, args.workers, args.shard_size, print_progress)
+    print(stats.report())
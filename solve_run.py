@@ -0,0 +1,35 @@
+import argparse
+from game.cfr import MAX_SOLVED_CARDS, OPENING_CARDS, POLICY_TABLE_PATH, Configuration, opening_configurations, \
+    solve, write_policy_table
+
+
+def print_progress(counts: Configuration, scores: tuple, seconds: float) -> None:
+    """Print a solved configuration.
+
+    :param counts: Number of cards of every seat, the first seat starts the turn.
+    :param scores: Expected score of every seat.
+    :param seconds: Seconds so far.
+    """
+
+    print(f"{counts} solved after {seconds:.1f} s, expected scores: "
+          + ", ".join(f"{score:+.3f}" for score in scores), flush=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Solve the Bluff opening turns and write the policy table.")
+    parser.add_argument("--max-players", type=int, default=3, help="most players of a configuration")
+    parser.add_argument("--max-cards", type=int, default=OPENING_CARDS,
+                        help=f"most cards in play of a configuration, at most {MAX_SOLVED_CARDS}")
+    parser.add_argument("--iterations", type=int, default=1000, help="number of CFR+ iterations per configuration")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes, all CPUs by default")
+    parser.add_argument("--checkpoints", default="cfr_checkpoints",
+                        help="directory of the checkpoints, the solver continues from them")
+    parser.add_argument("--checkpoint-every", type=int, default=50, help="number of iterations between checkpoints")
+    parser.add_argument("--output", default=POLICY_TABLE_PATH, help="path of the policy table")
+    args = parser.parse_args()
+
+    configurations = opening_configurations(args.max_players, args.max_cards)
+    tables = solve(configurations, args.iterations, args.workers, args.checkpoints, args.checkpoint_every,
+                   print_progress)
+    write_policy_table(args.output, tables)
+    print(f"Policy table of {len(tables)} configurations written to {args.output}")
@@ -0,0 +1,15 @@
+import pytest
+from game.bots import POLICIES, Policy
+
+
+def test_unfinished_policy_cannot_be_created():
+    class UnfinishedPolicy(Policy):
+        pass
+
+    with pytest.raises(TypeError):
+        UnfinishedPolicy()
+
+
+@pytest.mark.parametrize("name", sorted(POLICIES))
+def test_policies_can_be_created(name):
+    assert isinstance(POLICIES[name](), Policy)
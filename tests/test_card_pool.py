@@ -0,0 +1,48 @@
+from random import Random
+from typing import List
+import pytest
+from game import BluffGame, Deck
+from game.card import Card
+from game.card_pool import CardPool
+from game.hands import CLAIMS
+
+#: Number of random pools compared with the Card methods.
+POOLS_NUM = 300
+
+
+def random_pools(seed: int = 0) -> List[List[Card]]:
+    """Draw pools of 1 to 24 cards from the deck, two jokers included.
+
+    :param seed: Seed of the draws.
+    :return: The pools.
+    """
+
+    rng = Random(seed)
+    return [rng.sample(Deck.cards, rng.randint(1, 24)) for _ in range(POOLS_NUM)]
+
+
+def legacy_game(cards: List[Card]) -> BluffGame:
+    """Create a game checking claims with the Card methods, as before the card pool.
+
+    :param cards: The cards in use.
+    :return: The game.
+    """
+
+    game = BluffGame(0)
+    game.use_card_pool = False
+    game.cards_in_use = cards
+    return game
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_card_pool_matches_card_methods(seed):
+    for cards in random_pools(seed):
+        game = legacy_game(cards)
+        pool = CardPool(cards)
+        present = pool.claims_present()
+
+        for rank, claim in enumerate(CLAIMS):
+            move = BluffGame.parse_move(list(claim))
+            expected = game.check(move)
+            assert pool.check(move) == expected, (cards, claim)
+            assert bool(present >> rank & 1) == expected, (cards, claim)
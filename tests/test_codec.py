@@ -0,0 +1,118 @@
+import pytest
+from game import BluffGame
+from game.codec import UNCHANGED_STATUS, decode_status, encode_player_status, encode_shared_status, \
+    encode_status
+from tests.test_game import create_game, eliminate
+
+
+def card_codes(cards) -> list:
+    """Get the values and colors of cards, which are compared loosely by ``==``.
+
+    :param cards: The cards.
+    :return: List of the value and color of every card.
+    """
+
+    return [(card.value, card.color) for card in cards]
+
+
+def assert_round_trip(status: dict, decoded: dict, room: int = 0) -> None:
+    """Check that a decoded status is the status which was encoded.
+
+    :param status: The game status.
+    :param decoded: The decoded status.
+    :param room: ID of the room the status was encoded with.
+    """
+
+    assert decoded.keys() == status.keys() | {"room"}
+    assert decoded["room"] == room
+    for key in status:
+        if key in ("hand", "checked"):
+            assert card_codes(decoded[key]) == card_codes(status[key]), key
+        else:
+            assert decoded[key] == status[key], key
+
+
+def lobby_game() -> BluffGame:
+    """Create a game of three players waiting in the lobby, one of them ready.
+
+    :return: The game.
+    """
+
+    game = BluffGame(0)
+    for player_id in range(3):
+        game.add_player(player_id)
+        game.handle_action(player_id, f"name Player{player_id}")
+    game.handle_action(0, "Start")
+    return game
+
+
+def mid_turn_game() -> BluffGame:
+    """Create a started game of four players with three claims in the turn.
+
+    :return: The game.
+    """
+
+    game = create_game()
+    for claim in ("Pair 9", "TwoPairs 10 Jack", "FullHouse 2 Ace"):
+        game.handle_action(game.seats[game.turn], "move " + claim)
+    return game
+
+
+def checked_game() -> BluffGame:
+    """Create a game whose last claim was just checked.
+
+    :return: The game.
+    """
+
+    game = mid_turn_game()
+    game.handle_action(game.seats[game.turn], "check")
+    return game
+
+
+def won_game() -> BluffGame:
+    """Create a game of two players won by the player 0.
+
+    :return: The game.
+    """
+
+    game = create_game(players_num=2)
+    eliminate(game, 1)
+    return game
+
+
+@pytest.mark.parametrize("create", [lobby_game, mid_turn_game, checked_game, won_game])
+def test_status_round_trip(create):
+    game = create()
+
+    for player in game.players.values():
+        status = game.get_game_status(player)
+        assert_round_trip(status, decode_status(encode_status(status)))
+
+
+def test_states_are_covered():
+    assert not lobby_game().get_shared_status()["start"]
+    assert len(mid_turn_game().get_shared_status()["moves"]) == 3
+    assert checked_game().get_shared_status()["checked"]
+    assert won_game().get_shared_status()["win"] == "Player0"
+
+
+def test_shared_and_player_parts_round_trip():
+    game = checked_game()
+
+    shared_status = encode_shared_status({**game.get_shared_status(), "room": 7})
+    for player in game.players.values():
+        decoded = decode_status(shared_status + encode_player_status(game.get_player_status(player)))
+        assert_round_trip(game.get_game_status(player), decoded, room=7)
+
+
+def test_raw_argument_round_trip():
+    game = mid_turn_game()
+    player = game.players[0]
+    status = {**game.get_game_status(player), "moves": [("Player1", ["Pair", "Eleven"]),
+                                                        ("Player2", ["FullHouse", "Queen", "Ünknown"])]}
+
+    assert_round_trip(status, decode_status(encode_status(status)))
+
+
+def test_unchanged_reply():
+    assert decode_status(UNCHANGED_STATUS) is None
@@ -0,0 +1,83 @@
+import pytest
+from game.framing import HEADER, MAX_FRAME_LENGTH, FrameBuffer, encode_frame
+
+
+PAYLOADS = [b"first", b"", b"x" * 3000, bytes(range(256)) * 8]
+
+
+class ChunkSocket:
+    """Stands for a socket receiving the data in chunks of a fixed size.
+
+    :param data: All data sent by the other side.
+    :param chunk_size: Most bytes received at once.
+    """
+
+    def __init__(self, data: bytes, chunk_size: int) -> None:
+        #: Data not received yet.
+        self.data: bytes = data
+
+        #: Most bytes received at once.
+        self.chunk_size: int = chunk_size
+
+    def recv_into(self, buffer: memoryview) -> int:
+        nbytes = min(len(buffer), self.chunk_size, len(self.data))
+        buffer[:nbytes] = self.data[:nbytes]
+        self.data = self.data[nbytes:]
+        return nbytes
+
+
+def frames(frame_buffer: FrameBuffer) -> list:
+    """Get all complete frames received so far.
+
+    :param frame_buffer: The frame buffer.
+    :return: Payloads of the frames, copied out of the buffer.
+    """
+
+    payloads = []
+    frame = frame_buffer.next_frame()
+    while frame is not None:
+        payloads.append(bytes(frame))
+        frame = frame_buffer.next_frame()
+    return payloads
+
+
+def test_partial_frames():
+    frame_buffer = FrameBuffer(size=64)
+    received = []
+
+    for frame in map(encode_frame, PAYLOADS):
+        for byte in range(len(frame)):
+            frame_buffer.feed(frame[byte:byte + 1])
+            received += frames(frame_buffer)
+
+    assert received == PAYLOADS
+
+
+def test_several_frames_at_once():
+    frame_buffer = FrameBuffer(size=64)
+
+    frame_buffer.feed(b"".join(map(encode_frame, PAYLOADS)))
+
+    assert frames(frame_buffer) == PAYLOADS
+    assert frame_buffer.next_frame() is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000, 100000])
+def test_recv_from_splits_and_joins_frames(chunk_size):
+    frame_buffer = FrameBuffer(size=64)
+    sock = ChunkSocket(b"".join(map(encode_frame, PAYLOADS * 3)), chunk_size)
+    received = []
+
+    while frame_buffer.recv_from(sock):
+        received += frames(frame_buffer)
+
+    assert received == PAYLOADS * 3
+
+
+def test_too_long_frame():
+    frame_buffer = FrameBuffer()
+
+    frame_buffer.feed(HEADER.pack(MAX_FRAME_LENGTH + 1))
+
+    with pytest.raises(ValueError):
+        frame_buffer.next_frame()
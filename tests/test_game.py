@@ -0,0 +1,58 @@
+from game import BluffGame
+
+
+def create_game(players_num: int = 4, seed: int = 0) -> BluffGame:
+    """Create a started game with the players 0, 1, ... at the seats of the same index.
+
+    :param players_num: Number of players at the table.
+    :param seed: Seed of the game.
+    :return: The game.
+    """
+
+    game = BluffGame(seed)
+    for player_id in range(players_num):
+        game.add_player(player_id)
+        game.handle_action(player_id, f"name Player{player_id}")
+    for player_id in range(players_num):
+        game.handle_action(player_id, "Start")
+    return game
+
+
+def eliminate(game: BluffGame, player_id: int) -> None:
+    """Eliminate a player by a checked bluff with the last card allowed.
+
+    :param game: The started game.
+    :param player_id: The player's unique ID.
+    """
+
+    game.players[player_id].cards = game.max_cards - 1
+    game.turn = game.seat_of[player_id]
+    game.handle_action(player_id, "move BigPoker Spades")
+    checking_id = game.seats[game.turn]
+    game.handle_action(checking_id, "check")
+    assert game.players[player_id].lost
+
+
+def test_remove_player_on_turn_skips_lost_seats():
+    game = create_game()
+    eliminate(game, 1)
+    for player_id in game.players:
+        game.handle_action(player_id, "Start")
+    game.turn = game.seat_of[0]
+
+    game.remove_player(0)
+
+    turn_player = game.players[game.seats[game.turn]]
+    assert not turn_player.lost
+    statuses = [game.get_game_status(player) for player in game.players.values()]
+    assert sum(status["is_turn"] for status in statuses) == 1
+    assert all(status["turn"] == turn_player.name for status in statuses)
+
+
+def test_remove_player_before_turn_keeps_turn():
+    game = create_game()
+    game.turn = game.seat_of[2]
+
+    game.remove_player(0)
+
+    assert game.seats[game.turn] == 2
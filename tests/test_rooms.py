@@ -0,0 +1,55 @@
+from server import Server
+
+
+class FakeSocket:
+    """Stands for a client socket, the server only uses it as a key when nobody is subscribed."""
+
+
+def connect(server: Server, room_id: int = None) -> FakeSocket:
+    """Connect a client to the server, in the given room or in the open room.
+
+    :param server: The server.
+    :param room_id: ID of the room, None for the open room.
+    :return: The client socket.
+    """
+
+    client_socket = FakeSocket()
+    if room_id is None:
+        server.handle_new_client(client_socket, 0)
+    else:
+        client_id = server.create_client_id()
+        server.clients_ids[client_socket] = client_id
+        server.rooms.join(client_socket, client_id, room_id)
+    return client_socket
+
+
+def test_change_room_to_waiting_room():
+    server = Server()
+    client = connect(server)
+    left_room_id = server.rooms.client_rooms[client]
+    room_id = server.rooms.create_room()
+
+    server.build_responses(client, f"room {room_id}")
+
+    assert server.rooms.client_rooms[client] == room_id
+    assert server.clients_ids[client] in server.rooms.rooms[room_id].players
+    assert left_room_id not in server.rooms.rooms
+
+
+def test_change_room_to_started_room_is_refused():
+    server = Server()
+    players = [connect(server), connect(server)]
+    room_id = server.rooms.client_rooms[players[0]]
+    for player in players:
+        server.build_responses(player, "Start")
+    game = server.rooms.rooms[room_id]
+    assert game.has_started
+
+    other_room_id = server.rooms.create_room()
+    client = connect(server, other_room_id)
+    server.build_responses(client, f"room {room_id}")
+
+    assert server.rooms.client_rooms[client] == other_room_id
+    assert server.clients_ids[client] not in game.players
+    assert len(game.players) == 2
+    assert len(game.cards_in_use) == sum(player.cards for player in game.players.values())
@@ -0,0 +1,190 @@
+from typing import Dict, List, Union
+import multiprocessing
+import select
+import socket
+import time
+from game import BluffGame
+from game.framing import HEADER
+from rooms import RoomManager
+from server import Server, ROOM_MESSAGE
+
+
+#: Seconds the acceptor waits for the first message before routing a client.
+ROUTING_TIMEOUT = 0.5
+
+#: Seconds between checks if the worker processes are alive.
+SUPERVISION_INTERVAL = 1.0
+
+#: Number of bytes of the first message peeked to find the requested room.
+PEEK_LENGTH = 64
+
+
+def run_worker(server_ip: str, server_port: int, worker_index: int,
+               workers_num: int, channel: socket.socket) -> None:
+    """Run a worker process serving the clients passed by the acceptor.
+
+    The worker creates room IDs equal to its index modulo the number of
+    workers, so the acceptor can tell which worker holds a room.
+
+    :param server_ip: IP the server is hosted on.
+    :param server_port: Port the server is hosted on.
+    :param worker_index: Index of the worker.
+    :param workers_num: Number of all workers.
+    :param channel: Unix socket receiving the client sockets.
+    """
+
+    worker_server = Server(server_ip, server_port)
+    worker_server.rooms = RoomManager(worker_index, workers_num)
+    worker_server.serve_worker(channel)
+
+
+class WorkerPool:
+    """A class running the server in many processes, each with its own rooms.
+
+    A single acceptor process accepts connections and passes the client
+    sockets to the workers. A client whose first message is
+    "room <room ID>" goes to the worker holding that room. Other clients are
+    given to the workers in groups of :attr:`BluffGame.max_players`, so they
+    fill the same open room. Workers that crash are restarted, and workers
+    stop when the acceptor does. Workers are spawned rather than forked, so
+    they do not inherit the listening socket.
+
+    :param server_ip: IP to host server.
+    :param server_port: Port to host server.
+    :param workers_num: Number of worker processes.
+    """
+
+    def __init__(self, server_ip: str = "localhost", server_port: int = 5556,
+                 workers_num: int = 2) -> None:
+        #: IP to host server.
+        self.server_ip = server_ip
+
+        #: Port to host server.
+        self.server_port = server_port
+
+        #: Number of worker processes.
+        self.workers_num = workers_num
+
+        #: List of worker processes, by worker index.
+        self.workers: List[Union[None, multiprocessing.Process]] = [None] * workers_num
+
+        #: List of acceptor's ends of the channels passing sockets to the workers.
+        self.channels: List[Union[None, socket.socket]] = [None] * workers_num
+
+        #: Dictionary with accepted clients as keys, and the time they have to
+        #: send their first message until as value.
+        self.pending_clients: Dict[socket.socket, float] = {}
+
+        #: Number of clients routed without requesting a room.
+        self.routed_clients: int = 0
+
+    def start_worker(self, worker_index: int) -> None:
+        """Start the worker process, with a new channel.
+
+        :param worker_index: Index of the worker.
+        """
+
+        if self.channels[worker_index] is not None:
+            self.channels[worker_index].close()
+
+        channel, worker_channel = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        worker = multiprocessing.get_context("spawn").Process(
+            target=run_worker, daemon=True,
+            args=(self.server_ip, self.server_port, worker_index,
+                  self.workers_num, worker_channel))
+        worker.start()
+        worker_channel.close()
+
+        self.workers[worker_index] = worker
+        self.channels[worker_index] = channel
+        print(f"Worker {worker_index} started, pid {worker.pid}")
+
+    def restart_dead_workers(self) -> None:
+        """Restart the worker processes which have stopped."""
+        for worker_index, worker in enumerate(self.workers):
+            if not worker.is_alive():
+                print(f"Worker {worker_index} stopped with code {worker.exitcode}, restarting")
+                self.start_worker(worker_index)
+
+    @staticmethod
+    def requested_room(client_socket: socket.socket) -> Union[None, int]:
+        """Get the room requested in the client's first message, without receiving it.
+
+        :param client_socket: The client socket.
+        :return: ID of the requested room, None if the client did not request one.
+        """
+
+        try:
+            data = client_socket.recv(PEEK_LENGTH, socket.MSG_PEEK)
+        except OSError:
+            return None
+
+        if len(data) < HEADER.size:
+            return None
+
+        length, = HEADER.unpack_from(data)
+        payload = data[HEADER.size:HEADER.size + length].decode(errors="ignore")
+        prefix = ROOM_MESSAGE + " "
+
+        if len(data) - HEADER.size >= length and payload.startswith(prefix) \
+                and payload[len(prefix):].isdigit():
+            return int(payload[len(prefix):])
+        return None
+
+    def route(self, client_socket: socket.socket) -> None:
+        """Pass the client socket to its worker.
+
+        :param client_socket: The client socket.
+        """
+
+        del self.pending_clients[client_socket]
+        room_id = self.requested_room(client_socket)
+
+        if room_id is not None:
+            worker_index = room_id % self.workers_num
+        else:
+            worker_index = self.routed_clients // BluffGame.max_players % self.workers_num
+            self.routed_clients += 1
+
+        try:
+            socket.send_fds(self.channels[worker_index], [b"c"], [client_socket.fileno()])
+        except OSError:
+            print(f"Worker {worker_index} did not take the client")
+        client_socket.close()
+
+    def main_loop(self) -> None:
+        """The main loop of the acceptor."""
+        for worker_index in range(self.workers_num):
+            self.start_worker(worker_index)
+
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        print(f"Starting server on {self.server_ip}")
+        server_socket.bind((self.server_ip, self.server_port))
+        server_socket.listen()
+        print("Listening for clients...")
+
+        last_supervision = time.monotonic()
+
+        while True:
+            now = time.monotonic()
+            timeout = min([SUPERVISION_INTERVAL] + [
+                max(deadline - now, 0) for deadline in self.pending_clients.values()])
+
+            ready_to_read, _, _ = select.select(
+                [server_socket] + list(self.pending_clients), [], [], timeout)
+
+            for current_socket in ready_to_read:
+                if current_socket is server_socket:
+                    client_socket, _ = server_socket.accept()
+                    self.pending_clients[client_socket] = time.monotonic() + ROUTING_TIMEOUT
+                else:
+                    self.route(current_socket)
+
+            now = time.monotonic()
+            for client_socket, deadline in list(self.pending_clients.items()):
+                if deadline <= now:
+                    self.route(client_socket)
+
+            if now - last_supervision >= SUPERVISION_INTERVAL:
+                self.restart_dead_workers()
+                last_supervision = now